@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	examples/benchmark_transport.py: Compares transports of the ctypes bridge
+
+	Required to run on platform / side: [UNIX]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import sys
+import timeit
+
+import zugbruecke as ctypes
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+class Point(ctypes.Structure):
+	_fields_ = [('x', ctypes.c_int), ('y', ctypes.c_int)]
+
+
+def benchmark_transport(transport, number):
+
+	# Dedicated session per transport
+	session = ctypes.session({'transport': transport, 'log_level': 0})
+	dll = session.load_library('demo_dll.dll', 'windll')
+
+	# Two integers by value
+	gcd = dll.cookbook_gcd
+	gcd.argtypes = (ctypes.c_int, ctypes.c_int)
+	gcd.restype = ctypes.c_int
+
+	# Two structs by reference
+	distance = dll.cookbook_distance
+	distance.argtypes = (ctypes.POINTER(Point), ctypes.POINTER(Point))
+	distance.restype = ctypes.c_double
+	p1, p2 = Point(1, 2), Point(4, 6)
+
+	result_dict = {}
+	for name, call in (
+		('gcd', lambda: gcd(35, 42)),
+		('distance', lambda: distance(p1, p2))
+		):
+		# Run once, so everything is set up
+		call()
+		result_dict[name] = timeit.timeit(call, number = number) / number * 1e6
+
+	session.terminate()
+
+	return result_dict
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# RUN
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+if __name__ == '__main__':
+
+	number = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+	print('%-10s %16s %16s' % ('transport', 'gcd [us/call]', 'distance [us/call]'))
+	for transport in ('tcp', 'pipe'):
+		result_dict = benchmark_transport(transport, number)
+		print('%-10s %16.2f %16.2f' % (transport, result_dict['gcd'], result_dict['distance']))
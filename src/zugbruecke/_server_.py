@@ -34,6 +34,7 @@ specific language governing rights and limitations under the License.
 
 import argparse
 
+from core.session_daemon import session_daemon_class
 from core.session_server import session_server_class
 
 
@@ -54,6 +55,15 @@ if __name__ == '__main__':
 	parser.add_argument(
 		'--port_socket_wine', type = int, nargs = 1
 		)
+	parser.add_argument(
+		'--transport', type = str, nargs = 1
+		)
+	parser.add_argument(
+		'--rpc_workers', type = int, nargs = 1
+		)
+	parser.add_argument(
+		'--daemon_linger', type = float, nargs = 1, default = [None]
+		)
 	parser.add_argument(
 		'--log_level', type = int, nargs = 1
 		)
@@ -71,8 +81,16 @@ if __name__ == '__main__':
 		'log_write': bool(args.log_write[0]),
 		'log_level': args.log_level[0],
 		'port_socket_wine': args.port_socket_wine[0],
-		'port_socket_unix': args.port_socket_unix[0]
+		'port_socket_unix': args.port_socket_unix[0],
+		'transport': args.transport[0],
+		'rpc_workers': args.rpc_workers[0]
 		}
 
+	# Fire up daemon, which hosts sessions of many clients
+	if args.daemon_linger[0] is not None:
+		parameter['daemon_linger'] = args.daemon_linger[0]
+		session = session_daemon_class(parameter['id'], parameter)
+
 	# Fire up wine server session with parsed parameters
-	session = session_server_class(parameter['id'], parameter)
+	else:
+		session = session_server_class(parameter['id'], parameter)
@@ -65,16 +65,21 @@ class callback_translator_client_class:
 		# Store memsync definition
 		self.memsync_d = memsync_d
 
+		# Compile (un-) packing plans for this signature
+		self.__arg_list_pack__ = self.data.compile_arg_list_pack(self.argtypes_d)
+		self.__arg_list_unpack__ = self.data.compile_arg_list_unpack(self.argtypes_d)
+		self.__return_msg_pack__ = self.data.compile_return_msg_pack(self.restype_d)
+
 
 	def __call__(self, arg_message_list, arg_memory_list):
 
 		# Log status
-		self.log.out('[callback-client] Trying to call callback routine "%s" ...' % self.name)
+		self.log.out('[callback-client] Trying to call callback routine "%s" ...', self.name)
 
 		try:
 
 			# Unpack arguments
-			args_list = self.data.arg_list_unpack(arg_message_list, self.argtypes_d)
+			args_list = self.__arg_list_unpack__(arg_message_list)
 
 			# Unpack pointer data
 			self.data.server_unpack_memory_list(args_list, arg_memory_list, self.memsync_d)
@@ -118,10 +123,10 @@ class callback_translator_client_class:
 			self.data.server_pack_memory_list(args_list, return_value, arg_memory_list, self.memsync_d)
 
 			# Get new arg message list
-			arg_message_list = self.data.arg_list_pack(args_list, self.argtypes_d)
+			arg_message_list = self.__arg_list_pack__(args_list)
 
 			# Pack return value
-			return_message = self.data.return_msg_pack(return_value, self.restype_d)
+			return_message = self.__return_msg_pack__(return_value)
 
 			# Log status
 			self.log.out('[callback-client] ... done.')
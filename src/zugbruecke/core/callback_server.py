@@ -65,14 +65,20 @@ class callback_translator_server_class:
 		# Store memsync definition
 		self.memsync_d = memsync_d
 
+		# Compile (un-) packing plans for this signature
+		self.__arg_list_pack__ = self.data.compile_arg_list_pack(self.argtypes_d)
+		self.__arg_list_unpack__ = self.data.compile_arg_list_unpack(self.argtypes_d)
+		self.__arg_list_sync__ = self.data.compile_arg_list_sync(self.argtypes_d)
+		self.__return_msg_unpack__ = self.data.compile_return_msg_unpack(self.restype_d)
+
 
 	def __call__(self, *args):
 
 		# Log status
-		self.log.out('[callback-server] Trying to call callback routine "%s" ...' % self.name)
+		self.log.out('[callback-server] Trying to call callback routine "%s" ...', self.name)
 
 		# Log status
-		self.log.out('[callback-server] ... parameters are "%r". Packing and pushing to client ...' % (args,))
+		self.log.out('[callback-server] ... parameters are "%r". Packing and pushing to client ...', args)
 
 		try:
 
@@ -92,7 +98,7 @@ class callback_translator_server_class:
 		try:
 
 			# Pack arguments and call RPC callback function (packed arguments are shipped to Unix side)
-			return_dict = self.handler(self.data.arg_list_pack(args, self.argtypes_d), mem_package_list)
+			return_dict = self.handler(self.__arg_list_pack__(args), mem_package_list)
 
 		except Exception as e:
 
@@ -110,14 +116,10 @@ class callback_translator_server_class:
 			self.log.out('[callback-server] ... received feedback from client, unpacking ...')
 
 			# Unpack return dict (for pointers and structs)
-			self.data.arg_list_sync(
-				args,
-				self.data.arg_list_unpack(return_dict['args'], self.argtypes_d),
-				self.argtypes_d
-				)
+			self.__arg_list_sync__(args, self.__arg_list_unpack__(return_dict['args']))
 
 			# Unpack return value
-			return_value = self.data.return_msg_unpack(return_dict['return_value'], self.restype_d)
+			return_value = self.__return_msg_unpack__(return_dict['return_value'])
 
 			# Unpack memory (call may have failed partially only)
 			self.data.client_unpack_memory_list(args, return_value, return_dict['memory'], self.memsync_d)
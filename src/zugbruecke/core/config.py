@@ -74,6 +74,60 @@ def get_default_config():
 	# Default config directory
 	cfg['dir'] = __get_default_config_directory__()
 
+	# Cache of downloaded archives and unpacked Wine-Python, shared by config directories. Off by default.
+	cfg['cache_dir'] = None
+
+	# Add checksums of archives unknown to the cache to its SHA256SUMS file
+	cfg['cache_trust_on_first_use'] = False
+
+	# Clone Wine prefixes from a template in the cache directory instead of running wineboot
+	cfg['prefix_template'] = False
+
+	# Cloning of template prefix, 'auto' (reflink if supported, copy otherwise) or 'copy'
+	cfg['prefix_clone'] = 'auto'
+
+	# Wire format of routine calls, 'binary' with fallback to 'pickle'
+	cfg['wire'] = 'binary'
+
+	# Transport of ctypes bridge, 'pipe' (stdin & stdout of Wine-Python) or 'tcp'
+	cfg['transport'] = 'pipe'
+
+	# Number of threads handling calls on the Wine side, calls run in parallel if larger than 1
+	cfg['rpc_workers'] = 1
+
+	# Number of Wine-Python processes (workers) handling calls, each loads every DLL
+	cfg['workers'] = 1
+
+	# Dispatch of calls across workers, 'least_loaded' or 'round_robin'
+	cfg['workers_dispatch'] = 'least_loaded'
+
+	# File names of stateful DLLs, all calls into them go to one worker
+	cfg['workers_pinned'] = []
+
+	# Attach to a long-lived Wine-Python process (daemon) shared by all processes on this machine
+	cfg['daemon'] = False
+
+	# Name of daemon to attach to, sessions with different IDs do not share a daemon
+	cfg['daemon_id'] = 'default'
+
+	# Seconds a daemon waits for another session to attach once the last one has detached
+	cfg['daemon_linger'] = 60
+
+	# Start Wine-Python in the background when the session is created, not on first use
+	cfg['prewarm'] = False
+
+	# Size of shared memory arena for memsync payloads in bytes, 0 disables the arena (default)
+	cfg['shm_size'] = 0
+
+	# Minimum size of memsync payloads in bytes, which go through the arena
+	cfg['shm_threshold'] = 64 * 1024
+
+	# Keep definitions of routines in a file, configure them at session start: False, True (file in dir) or path
+	cfg['signature_cache'] = False
+
+	# Register routines along with their first call instead of on attribute access
+	cfg['lazy_routines'] = False
+
 	return cfg
 
 
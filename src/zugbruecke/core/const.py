@@ -37,6 +37,47 @@ GROUP_FUNDAMENTAL = 2
 GROUP_STRUCT = 4
 GROUP_FUNCTION = 8
 
+# Fundamental types of identical size on Unix and Wine side, arrays of them are sent as one blob
+GROUP_FUNDAMENTAL_FIXED_SIZE = (
+	'c_bool', 'c_char', 'c_byte', 'c_ubyte', 'c_short', 'c_ushort', 'c_int', 'c_uint',
+	'c_longlong', 'c_ulonglong', 'c_float', 'c_double'
+	)
+
+# Fundamental types by kind and item size of numpy dtypes
+NUMPY_DTYPE_TYPES = {
+	('b', 1): 'c_bool',
+	('i', 1): 'c_byte',
+	('u', 1): 'c_ubyte',
+	('i', 2): 'c_short',
+	('u', 2): 'c_ushort',
+	('i', 4): 'c_int',
+	('u', 4): 'c_uint',
+	('i', 8): 'c_longlong',
+	('u', 8): 'c_ulonglong',
+	('f', 4): 'c_float',
+	('f', 8): 'c_double'
+	}
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# DIRECTIONS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+DIR_IN = 'in' # Read by routine, not sent back
+DIR_OUT = 'out' # Written by routine, not sent to it
+DIR_INOUT = 'inout'
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# MEMORY
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+# Memory segments of at least this many bytes only send changed blocks back, by default
+DIFF_THRESHOLD = 1024 * 1024
+
+# Size of blocks compared for changes in bytes
+DIFF_BLOCK_SIZE = 4096
+
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # CTYPES FLAGS
@@ -35,6 +35,7 @@ from ctypes import _FUNCFLAG_CDECL
 
 from .arg_contents import arguments_contents_class
 from .arg_definition import arguments_definition_class
+from .arg_plan import arguments_plan_class
 from .mem_contents import memory_contents_class
 from .mem_definition import memory_definition_class
 
@@ -48,6 +49,7 @@ from ..const import _FUNCFLAG_STDCALL
 class data_class(
 	arguments_contents_class,
 	arguments_definition_class,
+	arguments_plan_class,
 	memory_contents_class,
 	memory_definition_class
 	):
@@ -70,3 +72,6 @@ class data_class(
 
 		self.callback_client = callback_client
 		self.callback_server = callback_server
+
+		# Shared memory arena for memsync payloads, attached by session if enabled
+		self.arena = None
@@ -37,11 +37,16 @@ from ctypes import _FUNCFLAG_CDECL
 
 from ..const import (
 	_FUNCFLAG_STDCALL,
+	DIR_IN,
+	DIR_OUT,
+	DIR_INOUT,
 	FLAG_POINTER,
 	GROUP_VOID,
 	GROUP_FUNDAMENTAL,
 	GROUP_STRUCT,
-	GROUP_FUNCTION
+	GROUP_FUNCTION,
+	GROUP_FUNDAMENTAL_FIXED_SIZE,
+	NUMPY_DTYPE_TYPES
 	)
 
 
@@ -81,6 +86,50 @@ class arguments_definition_class():
 			return FunctionType
 
 
+	def pack_definition_argdirs(self, argdirs, argtypes_d):
+		"""
+		Returns direction per argument. Without explicit directions, arguments passed
+		by value are input only, pointers to and arrays of fundamental types and
+		structs are input and output. Only those can be declared as output.
+		Strings (c_char_p and c_wchar_p) are input and output as well, their
+		contents must always be sent, so they can not be declared as output.
+		"""
+
+		# Is the argument a string, which the routine might write into?
+		is_string_list = [
+			len(arg_d['f']) == 0 and arg_d['g'] == GROUP_FUNDAMENTAL and arg_d['t'] in ('c_char_p', 'c_wchar_p')
+			for arg_d in argtypes_d
+			]
+
+		# Can the routine write into the argument?
+		is_writable_list = [
+			len(arg_d['f']) > 0 and arg_d['g'] in (GROUP_FUNDAMENTAL, GROUP_STRUCT)
+			for arg_d in argtypes_d
+			]
+
+		# Infer directions
+		if argdirs is None:
+			return [
+				DIR_INOUT if is_writable or is_string else DIR_IN
+				for is_writable, is_string in zip(is_writable_list, is_string_list)
+				]
+
+		if len(argdirs) != len(argtypes_d):
+			raise ValueError('%d argument directions for %d arguments' % (len(argdirs), len(argtypes_d)))
+
+		for index, (argdir, is_writable, is_string) in enumerate(zip(argdirs, is_writable_list, is_string_list)):
+			if argdir not in (DIR_IN, DIR_OUT, DIR_INOUT):
+				raise ValueError('unknown direction "%s" of argument %d' % (argdir, index))
+			if argdir == DIR_INOUT and is_string:
+				continue
+			if argdir != DIR_IN and not is_writable:
+				raise ValueError('argument %d is not a pointer or array, it can only be "%s"%s' % (
+					index, DIR_IN, ' or "%s"' % DIR_INOUT if is_string else ''
+					))
+
+		return list(argdirs)
+
+
 	def pack_definition_argtypes(self, argtypes):
 
 		return [self.__pack_definition_dict__(arg) for arg in argtypes]
@@ -164,6 +213,10 @@ class arguments_definition_class():
 
 	def __pack_definition_dict__(self, datatype, field_name = None):
 
+		# Translate numpy.ctypeslib.ndpointer types into ctypes types
+		if hasattr(datatype, '_dtype_') and hasattr(datatype, '_shape_'):
+			datatype = self.__translate_ndpointer__(datatype)
+
 		# Not all datatypes have a name, let's handle that
 		type_name = None
 		# Get name of datatype, such as c_int, if there is one
@@ -235,6 +288,10 @@ class arguments_definition_class():
 
 			# TODO: For speed, cache packed struct definitions for known structs
 
+			fields_d_list = [
+				self.__pack_definition_dict__(field[1], field[0]) for field in datatype._fields_
+				]
+
 			return {
 				'f': flag_list,
 				's': flag_scalar,
@@ -243,9 +300,8 @@ class arguments_definition_class():
 				'n': field_name, # kw
 				't': type_name, # Type name, such as 'c_int'
 				'g': GROUP_STRUCT,
-				'_fields_': [
-					self.__pack_definition_dict__(field[1], field[0]) for field in datatype._fields_
-					]
+				'b': self.__is_struct_blob__(datatype, fields_d_list), # Sent as raw memory
+				'_fields_': fields_d_list
 				}
 
 		# Function pointers
@@ -281,6 +337,51 @@ class arguments_definition_class():
 				}
 
 
+	def __is_struct_blob__(self, datatype, fields_d_list):
+		"""
+		Structs can be sent as raw memory if their layout is identical on both sides
+		"""
+
+		# Custom packing and bit fields are not re-created on the Wine side
+		if hasattr(datatype, '_pack_') or any(len(field) > 2 for field in datatype._fields_):
+			return False
+
+		for field_d in fields_d_list:
+
+			# Pointers and callbacks must be translated
+			if field_d['p'] or field_d['g'] == GROUP_FUNCTION:
+				return False
+
+			# Fields of fundamental types of identical size or nested structs of the same kind
+			if not (
+				(field_d['g'] == GROUP_FUNDAMENTAL and field_d['t'] in GROUP_FUNDAMENTAL_FIXED_SIZE) or
+				(field_d['g'] == GROUP_STRUCT and field_d['b'])
+				):
+				return False
+
+		return True
+
+
+	def __translate_ndpointer__(self, datatype):
+
+		# Any dtype, bytes
+		if datatype._dtype_ is None:
+			return ctypes.POINTER(ctypes.c_ubyte)
+
+		# Get fundamental type with identical size on both sides
+		type_name = NUMPY_DTYPE_TYPES.get((datatype._dtype_.kind, datatype._dtype_.itemsize), None)
+		if type_name is None or datatype._dtype_.byteorder not in ('=', '<', '|'):
+			raise TypeError('unsupported dtype of ndpointer: %s' % datatype._dtype_.str)
+		translated_type = getattr(ctypes, type_name)
+
+		# Without shape, memory must be handled by memsync
+		if datatype._shape_ is not None:
+			for dimension in reversed(datatype._shape_):
+				translated_type = translated_type * dimension
+
+		return ctypes.POINTER(translated_type)
+
+
 	def __unpack_definition_dict__(self, datatype_d_dict):
 
 		# Handle fundamental C datatypes (PyCSimpleType)
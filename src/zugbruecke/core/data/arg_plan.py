@@ -0,0 +1,558 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	src/zugbruecke/core/data/arg_plan.py: Compiled (un-) packing plans for argument contents
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import ctypes
+from functools import partial
+
+from ..const import (
+	DIR_IN,
+	DIR_OUT,
+	DIR_INOUT,
+	FLAG_POINTER,
+	GROUP_VOID,
+	GROUP_FUNDAMENTAL,
+	GROUP_FUNDAMENTAL_FIXED_SIZE,
+	GROUP_STRUCT,
+	GROUP_FUNCTION
+	)
+from .memory import (
+	get_address_of_array,
+	is_null_pointer
+	)
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS: Compiled content packing and unpacking plans
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+class arguments_plan_class():
+	"""
+	Walks definition dicts once (at configuration time) and returns closures,
+	which behave like the generic routines in arguments_contents_class but
+	do not branch on groups and flags on every call.
+	"""
+
+
+	def compile_arg_list_pack(self, argtypes_list, argdirs_list = None, skip_dir = None):
+		"""
+		Arguments with direction skip_dir are packed as None, i.e. their contents are not sent
+		"""
+
+		# Per-argument packing routines and argument names
+		item_list = [
+			(d['n'], self.__compile_pack_item__(d) if argdir != skip_dir else lambda arg_in: None)
+			for d, argdir in zip(argtypes_list, self.__get_argdirs__(argtypes_list, argdirs_list))
+			]
+		argtypes_len = len(argtypes_list)
+
+		def arg_list_pack(args_tuple):
+
+			# Everything is normal
+			if len(args_tuple) == argtypes_len:
+				return [(n, p(a)) for (n, p), a in zip(item_list, args_tuple)]
+
+			# Function has likely not been configured but there are arguments
+			elif len(args_tuple) > 0 and argtypes_len == 0:
+				return list(args_tuple) # let's try ... TODO catch pickling errors
+
+			# Number of arguments is just wrong
+			else:
+				raise TypeError
+
+		return arg_list_pack
+
+
+	def compile_arg_list_unpack(self, argtypes_list, argdirs_list = None, skip_dir = None):
+		"""
+		Arguments with direction skip_dir are not unpacked. Skipped output arguments
+		are allocated (zero-initialized) instead, skipped input arguments are None.
+		"""
+
+		# Per-argument unpacking routines
+		item_list = []
+		for d, argdir in zip(argtypes_list, self.__get_argdirs__(argtypes_list, argdirs_list)):
+			if argdir != skip_dir:
+				item_list.append(self.__compile_unpack_item__(d))
+			elif argdir == DIR_OUT:
+				item_list.append(self.__compile_alloc_item__(d))
+			else:
+				item_list.append(lambda arg_raw: None)
+		argtypes_len = len(argtypes_list)
+
+		def arg_list_unpack(args_package_list):
+
+			# Everything is normal
+			if len(args_package_list) == argtypes_len:
+				return [u(a[1]) for u, a in zip(item_list, args_package_list)]
+
+			# Function has likely not been configured but there are arguments
+			elif len(args_package_list) > 0 and argtypes_len == 0:
+				return args_package_list
+
+			# Number of arguments is just wrong
+			else:
+				raise TypeError
+
+		return arg_list_unpack
+
+
+	def compile_arg_list_sync(self, argtypes_list, argdirs_list = None):
+
+		# Only keep arguments, which actually require syncing - input arguments do not
+		item_list = [
+			(index, sync) for index, sync in (
+				(index, self.__compile_sync_item__(d))
+				for index, (d, argdir) in enumerate(zip(
+					argtypes_list, self.__get_argdirs__(argtypes_list, argdirs_list)
+					))
+				if argdir != DIR_IN
+				) if sync is not None
+			]
+
+		def arg_list_sync(old_arguments_list, new_arguments_list):
+
+			# Step through arguments
+			for index, sync in item_list:
+				sync(old_arguments_list[index], new_arguments_list[index])
+
+		return arg_list_sync
+
+
+	def compile_return_msg_pack(self, returntype_dict):
+
+		pack_item = self.__compile_pack_item__(returntype_dict)
+
+		def return_msg_pack(return_value):
+
+			if return_value is None:
+				return None
+
+			return pack_item(return_value)
+
+		return return_msg_pack
+
+
+	def compile_return_msg_unpack(self, returntype_dict):
+
+		unpack_item = self.__compile_unpack_item__(returntype_dict)
+
+		# If this is not a fundamental datatype or if there is a pointer involved, just unpack
+		if not returntype_dict['g'] == GROUP_FUNDAMENTAL or FLAG_POINTER in returntype_dict['f']:
+
+			def return_msg_unpack(return_msg):
+
+				if return_msg is None:
+					return None
+
+				return unpack_item(return_msg)
+
+		# Fundamental (non-pointer, non-struct) return values are stripped like ctypes does
+		else:
+
+			value_strip = self.__item_value_strip__
+
+			def return_msg_unpack(return_msg):
+
+				if return_msg is None:
+					return None
+
+				return value_strip(unpack_item(return_msg))
+
+		return return_msg_unpack
+
+
+	def __compile_alloc_item__(self, arg_def_dict):
+
+		# Datatype at the bottom
+		if arg_def_dict['g'] == GROUP_FUNDAMENTAL:
+			datatype = getattr(ctypes, arg_def_dict['t'])
+		else:
+			datatype = self.cache_dict['struct_type'][arg_def_dict['t']]
+
+		# Re-create pointers and arrays, innermost first
+		for flag in reversed(arg_def_dict['f']):
+			if flag == FLAG_POINTER:
+				datatype = ctypes.POINTER(datatype)
+			else:
+				datatype = datatype * flag
+
+		def alloc_value(datatype):
+
+			# Pointers point to new, zero-initialized memory
+			if issubclass(datatype, ctypes._Pointer):
+				return ctypes.pointer(alloc_value(datatype._type_))
+
+			return datatype()
+
+		return lambda arg_raw: alloc_value(datatype)
+
+
+	def __compile_pack_item__(self, arg_def_dict):
+
+		# The non-trivial case, involving arrays - use generic routine unless they can be sent as one blob
+		if not arg_def_dict['s']:
+			if self.__get_blob_type__(arg_def_dict) is not None:
+				return self.__compile_pack_blob__(arg_def_dict)
+			return partial(self.__pack_item_array__, arg_def_dict = arg_def_dict)
+
+		# Handle fundamental types
+		if arg_def_dict['g'] == GROUP_FUNDAMENTAL:
+			pack_value = self.__item_value_strip__
+		# Handle structs
+		elif arg_def_dict['g'] == GROUP_STRUCT:
+			pack_value = self.__compile_pack_struct__(arg_def_dict)
+		# Handle functions
+		elif arg_def_dict['g'] == GROUP_FUNCTION:
+			pack_value = partial(self.__pack_item_function__, func_def_dict = arg_def_dict)
+		# Handle everything else ... likely pointers handled by memsync
+		else:
+			return lambda arg_in: None
+
+		# Number of pointers to strip away (all flags are pointers in this case)
+		pointer_count = len(arg_def_dict['f'])
+
+		# Nothing to strip
+		if pointer_count == 0:
+			return pack_value
+
+		pointer_strip = self.__item_pointer_strip__
+
+		def pack_item(arg_in):
+
+			# Strip away the pointers ...
+			for _ in range(pointer_count):
+				if is_null_pointer(arg_in):
+					# Just return None - will (hopefully) be overwritten by memsync
+					return None
+				arg_in = pointer_strip(arg_in)
+
+			return pack_value(arg_in)
+
+		return pack_item
+
+
+	def __compile_pack_blob__(self, arg_def_dict):
+
+		blob_size = ctypes.sizeof(self.__get_blob_type__(arg_def_dict))
+		pointer_count = arg_def_dict['f'].count(FLAG_POINTER)
+		pointer_strip = self.__item_pointer_strip__
+
+		def pack_blob(arg_in):
+
+			arg_blob = arg_in
+
+			# Strip away the pointers ...
+			for _ in range(pointer_count):
+				if is_null_pointer(arg_blob):
+					return None
+				arg_blob = pointer_strip(arg_blob)
+
+			# ctypes arrays, numpy arrays or anything else exposing a buffer: one copy, no elements
+			try:
+				blob = memoryview(arg_blob).tobytes()
+			# Likely lists, use generic routine
+			except TypeError:
+				return self.__pack_item_array__(arg_in, arg_def_dict)
+
+			if len(blob) != blob_size:
+				raise ValueError('expected array of %d bytes, got %d bytes' % (blob_size, len(blob)))
+
+			return blob
+
+		return pack_blob
+
+
+	def __compile_pack_struct__(self, struct_def_dict):
+
+		# Raw memory, no fields
+		if struct_def_dict.get('b', False):
+			return bytes
+
+		field_list = [
+			(field_def_dict['n'], self.__compile_pack_item__(field_def_dict))
+			for field_def_dict in struct_def_dict['_fields_']
+			]
+
+		def pack_struct(struct_raw):
+
+			# Return parameter message list - MUST WORK WITH PICKLE
+			return [(n, p(getattr(struct_raw, n))) for n, p in field_list]
+
+		return pack_struct
+
+
+	def __compile_sync_item__(self, arg_def_dict):
+
+		# The non-trivial case, arrays - use generic routine unless they can be copied as one blob
+		if not arg_def_dict['s']:
+			if self.__get_blob_type__(arg_def_dict) is not None:
+				return self.__compile_sync_blob__(arg_def_dict)
+			return partial(self.__sync_item_array__, arg_def_dict = arg_def_dict)
+
+		# Handle fundamental types
+		if arg_def_dict['g'] == GROUP_FUNDAMENTAL:
+			sync_value = self.__sync_value__
+		# Handle structs
+		elif arg_def_dict['g'] == GROUP_STRUCT:
+			sync_value = self.__compile_sync_struct__(arg_def_dict)
+		# Do not do this for void pointers (likely handled by memsync) and functions
+		else:
+			return None
+
+		# Number of pointers to strip away (all flags are pointers in this case)
+		pointer_count = len(arg_def_dict['f'])
+
+		# Nothing to strip
+		if pointer_count == 0:
+			return sync_value
+
+		pointer_strip = self.__item_pointer_strip__
+
+		def sync_item(old_arg, new_arg):
+
+			# Strip away the pointers ...
+			for _ in range(pointer_count):
+				old_arg = pointer_strip(old_arg)
+				new_arg = pointer_strip(new_arg)
+
+			sync_value(old_arg, new_arg)
+
+		return sync_item
+
+
+	def __compile_sync_blob__(self, arg_def_dict):
+
+		blob_size = ctypes.sizeof(self.__get_blob_type__(arg_def_dict))
+		pointer_count = arg_def_dict['f'].count(FLAG_POINTER)
+		pointer_strip = self.__item_pointer_strip__
+
+		def sync_blob(old_arg, new_arg):
+
+			old_blob, new_blob = old_arg, new_arg
+
+			# Strip away the pointers ...
+			for _ in range(pointer_count):
+				old_blob = pointer_strip(old_blob)
+				new_blob = pointer_strip(new_blob)
+
+			# ctypes arrays
+			if isinstance(old_blob, ctypes.Array):
+				ctypes.memmove(old_blob, new_blob, blob_size)
+			# numpy arrays
+			elif hasattr(old_blob, '__array_interface__'):
+				ctypes.memmove(get_address_of_array(old_blob), new_blob, blob_size)
+			# Anything else exposing a writable buffer
+			else:
+				try:
+					old_view = (ctypes.c_ubyte * blob_size).from_buffer(old_blob)
+				# Likely lists, use generic routine
+				except TypeError:
+					self.__sync_item_array__(old_arg, new_arg, arg_def_dict)
+					return
+				ctypes.memmove(old_view, new_blob, blob_size)
+
+		return sync_blob
+
+
+	def __compile_sync_struct__(self, struct_def_dict):
+
+		# Raw memory, no fields
+		if struct_def_dict.get('b', False):
+			return lambda old_struct, new_struct: ctypes.memmove(
+				ctypes.addressof(old_struct), ctypes.addressof(new_struct), ctypes.sizeof(new_struct)
+				)
+
+		field_list = [
+			(n, s) for n, s in (
+				(field_def_dict['n'], self.__compile_sync_item__(field_def_dict))
+				for field_def_dict in struct_def_dict['_fields_']
+				) if s is not None
+			]
+
+		def sync_struct(old_struct, new_struct):
+
+			# Step through fields
+			for n, s in field_list:
+				s(getattr(old_struct, n), getattr(new_struct, n))
+
+		return sync_struct
+
+
+	def __compile_unpack_item__(self, arg_def_dict):
+
+		# And now arrays ... - use generic routine unless they were sent as one blob
+		if not arg_def_dict['s']:
+			if self.__get_blob_type__(arg_def_dict) is not None:
+				return self.__compile_unpack_blob__(arg_def_dict)
+			return lambda arg_raw: self.__unpack_item_array__(arg_raw, arg_def_dict)[1]
+
+		# Handle fundamental types
+		if arg_def_dict['g'] == GROUP_FUNDAMENTAL:
+			unpack_value = getattr(ctypes, arg_def_dict['t'], None)
+			# Not a ctypes member, leave it to the generic routine
+			if unpack_value is None:
+				return partial(self.__unpack_item__, arg_def_dict = arg_def_dict)
+		# Handle structs
+		elif arg_def_dict['g'] == GROUP_STRUCT:
+			unpack_value = self.__compile_unpack_struct__(arg_def_dict)
+		# Handle functions
+		elif arg_def_dict['g'] == GROUP_FUNCTION:
+			unpack_value = partial(self.__unpack_item_function__, func_def_dict = arg_def_dict)
+		# Handle voids (likely mensync stuff) - return a placeholder
+		elif arg_def_dict['g'] == GROUP_VOID:
+			return lambda arg_raw: None
+		# Handle everything else ...
+		else:
+			return partial(self.__unpack_item__, arg_def_dict = arg_def_dict)
+
+		# Number of pointers to re-create (all flags are pointers in this case)
+		pointer_count = len(arg_def_dict['f'])
+
+		# Nothing to re-create
+		if pointer_count == 0:
+			return unpack_value
+
+		def unpack_item(arg_raw):
+
+			arg_rebuilt = unpack_value(arg_raw)
+
+			for _ in range(pointer_count):
+				arg_rebuilt = ctypes.pointer(arg_rebuilt)
+
+			return arg_rebuilt
+
+		return unpack_item
+
+
+	def __compile_unpack_blob__(self, arg_def_dict):
+
+		blob_type = self.__get_blob_type__(arg_def_dict)
+		pointer_count = arg_def_dict['f'].count(FLAG_POINTER)
+
+		def unpack_blob(arg_raw):
+
+			# NULL pointer
+			if arg_raw is None:
+				return None
+
+			# Packed by generic routine
+			if not isinstance(arg_raw, bytes):
+				return self.__unpack_item_array__(arg_raw, arg_def_dict)[1]
+
+			arg_rebuilt = blob_type.from_buffer_copy(arg_raw)
+
+			for _ in range(pointer_count):
+				arg_rebuilt = ctypes.pointer(arg_rebuilt)
+
+			return arg_rebuilt
+
+		return unpack_blob
+
+
+	def __compile_unpack_struct__(self, struct_def_dict):
+
+		struct_type_name = struct_def_dict['t']
+		struct_type_dict = self.cache_dict['struct_type']
+
+		# Raw memory, no fields
+		if struct_def_dict.get('b', False):
+			return lambda arg_raw: struct_type_dict[struct_type_name].from_buffer_copy(arg_raw)
+
+		field_list = [
+			self.__compile_unpack_item__(field_def_dict)
+			for field_def_dict in struct_def_dict['_fields_']
+			]
+
+		def unpack_struct(args_list):
+
+			# Generate new instance of struct datatype
+			struct_inst = struct_type_dict[struct_type_name]()
+
+			# Step through arguments
+			for field_unpack, field_arg in zip(field_list, args_list):
+
+				# HACK is field_arg[1] is None, it's likely a function pointer sent back from Wine side - skip
+				if field_arg[1] is None:
+					continue
+
+				field_value = field_unpack(field_arg[1])
+
+				try:
+					setattr(struct_inst, field_arg[0], field_value)
+				except TypeError: # TODO HACK relevant for structs & callbacks & memsync together
+					setattr(struct_inst, field_arg[0], ctypes.cast(field_value, ctypes.c_void_p))
+
+			return struct_inst
+
+		return unpack_struct
+
+
+	def __get_blob_type__(self, arg_def_dict):
+		"""
+		Returns the array type of pointers to (multi-dimensional) arrays of fundamental types,
+		which are of identical size on both sides, or of structs sent as raw memory - otherwise None
+		"""
+
+		if arg_def_dict['g'] == GROUP_FUNDAMENTAL and arg_def_dict['t'] in GROUP_FUNDAMENTAL_FIXED_SIZE:
+			blob_type = getattr(ctypes, arg_def_dict['t'])
+		elif arg_def_dict['g'] == GROUP_STRUCT and arg_def_dict.get('b', False):
+			blob_type = self.cache_dict['struct_type'][arg_def_dict['t']]
+		else:
+			return None
+
+		# Pointers first, then array dimensions only
+		array_flag_list = arg_def_dict['f'][arg_def_dict['f'].count(FLAG_POINTER):]
+		if len(array_flag_list) == 0 or any(flag <= 0 for flag in array_flag_list):
+			return None
+
+		for flag in reversed(array_flag_list):
+			blob_type = blob_type * flag
+
+		return blob_type
+
+
+	def __get_argdirs__(self, argtypes_list, argdirs_list):
+
+		# Without directions, everything is sent in both directions
+		if argdirs_list is None:
+			return [DIR_INOUT] * len(argtypes_list)
+
+		return argdirs_list
+
+
+	def __sync_value__(self, old_arg, new_arg):
+
+		if hasattr(old_arg, 'value'):
+			old_arg.value = new_arg.value
+		else:
+			pass # only relevant within structs or for actual pointers to scalars
@@ -35,13 +35,24 @@ import ctypes
 from pprint import pformat as pf
 #import traceback
 
-from ..const import GROUP_VOID
+from ..const import (
+	DIFF_BLOCK_SIZE,
+	DIR_IN,
+	DIR_INOUT,
+	DIR_OUT,
+	GROUP_VOID
+	)
 from .memory import (
+	generate_patch_from_bytes,
 	generate_pointer_from_bytes,
+	generate_pointer_from_length,
+	get_address_of_array,
 	is_null_pointer,
 	overwrite_pointer_with_bytes,
+	overwrite_pointer_with_patch,
 	serialize_pointer_into_bytes
 	)
+from ..remote_buffer import remote_buffer_class
 
 WCHAR_BYTES = ctypes.sizeof(ctypes.c_wchar)
 
@@ -66,10 +77,21 @@ class memory_contents_class():
 			arg_type['t'] = None # no type string
 
 
+	def client_free_memory_list(self, mem_package_list):
+
+		# Release blocks in shared memory arena (if any)
+		for memory_d in mem_package_list:
+			if 'o' in memory_d:
+				self.arena.free(memory_d['o'])
+
+
 	def client_pack_memory_list(self, args_tuple, memsync_d_list):
 
-		# Pack data for every pointer, append data to package
-		return [self.__pack_memory_item__(memsync_d, args_tuple) for memsync_d in memsync_d_list]
+		# Pack data for every pointer, append data to package - outputs only need their length
+		return [
+			self.__pack_memory_item__(memsync_d, args_tuple, arena = self.arena, request = True)
+			for memsync_d in memsync_d_list
+			]
 
 
 	def client_unpack_memory_list(self, args_list, return_value, mem_package_list, memsync_d_list):
@@ -77,12 +99,22 @@ class memory_contents_class():
 		# Iterate over memory package dicts
 		for memory_d, memsync_d in zip(mem_package_list, memsync_d_list):
 
+			# If pointer pointed to a remote buffer, data stays on the remote side
+			if memory_d.get('r', False):
+
+				continue
+
 			# If memory for pointer has been allocated by remote side
-			if memory_d['_a'] is None:
+			elif memory_d['_a'] is None:
 
 				# Unpack one memory section / item
 				self.__unpack_memory_item_data__(memory_d, memsync_d, args_list, return_value)
 
+			# If pointer pointed to data, which is an input only, nothing has been sent back
+			elif memsync_d['d'] == DIR_IN:
+
+				continue
+
 			# If pointer pointed to data
 			else:
 
@@ -95,18 +127,45 @@ class memory_contents_class():
 		# Iterate through pointers and serialize them
 		for memory_d, memsync_d in zip(mem_package_list, memsync_d_list):
 
+			# If pointer pointed to a remote buffer, it stays here
+			if memory_d.get('r', False):
+
+				memory_d['d'] = b''
+
 			# If memory for pointer was allocated here on server side
-			if memory_d['a'] is None:
+			elif memory_d['a'] is None:
 
 				memory_d.update(self.__pack_memory_item__(memsync_d, args_list, return_value))
 
+			# If pointer pointed to data in shared memory, it is already in place
+			elif 'o' in memory_d:
+
+				continue
+
+			# If pointer pointed to data, which is an input only, do not send it back
+			elif memsync_d['d'] == DIR_IN:
+
+				memory_d['d'] = b''
+
 			# If pointer pointed to data on client side
 			else:
 
-				# Overwrite old data in package with new data from memory
-				memory_d['d'] = serialize_pointer_into_bytes(
-					ctypes.c_void_p(memory_d['a']), memory_d['l']
-					)
+				# Get new data from memory
+				new_data = serialize_pointer_into_bytes(ctypes.c_void_p(memory_d['a']), memory_d['l'])
+
+				# Large memory, send changed ranges only (compared to old data in package)
+				if (
+					memsync_d['c'] is not None and memory_d['l'] >= memsync_d['c']
+					and memsync_d['d'] == DIR_INOUT and not memsync_d['w']
+					):
+					patch = generate_patch_from_bytes(memory_d['d'], new_data, DIFF_BLOCK_SIZE)
+					if patch is not None:
+						memory_d['d'] = patch
+						memory_d['p'] = True
+						continue
+
+				# Overwrite old data in package with new data
+				memory_d['d'] = new_data
 
 
 	def server_unpack_memory_list(self, args_tuple, arg_memory_list, memsync_d_list):
@@ -115,7 +174,7 @@ class memory_contents_class():
 		for memory_d, memsync_d in zip(arg_memory_list, memsync_d_list):
 
 			# Is this a null pointer?
-			if memory_d['a'] is None:
+			if memory_d['a'] is None and not memory_d.get('r', False):
 
 				# Insert new NULL pointer
 				self.__unpack_memory_item_null__(memory_d, memsync_d, args_tuple)
@@ -134,6 +193,12 @@ class memory_contents_class():
 		if old_len == new_len:
 			return
 
+		# No contents (output only), just adjust length
+		if len(memory_d['d']) == 0:
+			memory_d['l'] = memory_d['l'] * new_len // old_len
+			memory_d['w'] = WCHAR_BYTES
+			return
+
 		tmp = bytearray(memory_d['l'] * new_len // old_len)
 
 		for index in range(old_len if new_len > old_len else new_len):
@@ -242,14 +307,28 @@ class memory_contents_class():
 			))
 
 
-	def __pack_memory_item__(self, memsync_d, args_tuple, return_value = None):
+	def __pack_memory_item__(self, memsync_d, args_tuple, return_value = None, arena = None, request = False):
 
 		# Search for pointer
 		pointer = self.__get_argument_by_memsync_path__(memsync_d['p'], args_tuple, return_value)
 
+		# Remote buffer, only its address on the remote side is sent
+		if isinstance(pointer, remote_buffer_class):
+			return {
+				'd': b'',
+				'l': pointer.size,
+				'a': None,
+				'_a': pointer.address,
+				'w': None,
+				'r': True # remote buffer
+				}
+
 		# Convert argument into ctypes datatype TODO more checks needed!
 		if '_c' in memsync_d.keys():
 			pointer = ctypes.pointer(memsync_d['_c'].from_param(pointer))
+		# numpy arrays, memory is read from and written to in place
+		elif hasattr(pointer, '__array_interface__'):
+			pointer = ctypes.c_void_p(get_address_of_array(pointer))
 
 		# Unicode char size if relevant
 		w = WCHAR_BYTES if memsync_d['w'] else None
@@ -271,8 +350,25 @@ class memory_contents_class():
 			# Compute actual length
 			length = self.__get_number_of_elements__(memsync_d, args_tuple, return_value) * memsync_d['s']
 
+		# Large segments go through shared memory (if there is an arena), Unicode needs conversion
+		if arena is not None and w is None and length >= arena.threshold:
+			offset = arena.allocate(length)
+			if offset is not None:
+				# Outputs are not initialized
+				if not (request and memsync_d['d'] == DIR_OUT):
+					ctypes.memmove(arena.get_pointer(offset), pointer, length)
+				return {
+					'd': b'', # data is in shared memory
+					'l': length,
+					'a': ctypes.cast(pointer, ctypes.c_void_p).value,
+					'_a': None,
+					'w': w,
+					'o': offset # offset of data in shared memory arena
+					}
+
 		return {
-			'd': serialize_pointer_into_bytes(pointer, length), # serialized data, '' if NULL pointer
+			# serialized data, '' if NULL pointer or output only
+			'd': b'' if request and memsync_d['d'] == DIR_OUT else serialize_pointer_into_bytes(pointer, length),
 			'l': length, # length of serialized data
 			'a': ctypes.cast(pointer, ctypes.c_void_p).value, # local pointer address as integer
 			'_a': None, # remote pointer has not been initialized
@@ -297,11 +393,21 @@ class memory_contents_class():
 		pointer_arg = self.__get_argument_by_memsync_path__(memsync_d['p'][:-1], args_tuple, return_value)
 
 		# Adjust Unicode wchar length
-		if memsync_d['w']:
+		if memsync_d['w'] and not memory_d.get('r', False):
 			self.__adjust_wchar_length__(memory_d)
 
-		# Generate pointer to passed data
-		pointer = generate_pointer_from_bytes(memory_d['d'])
+		# Generate pointer to passed data, or point into shared memory or remote buffer
+		if memory_d.get('r', False):
+			pointer = ctypes.c_void_p(memory_d['a'])
+		elif 'o' in memory_d:
+			pointer = self.arena.get_pointer(memory_d['o'])
+		# Output only, allocate memory (with room for a terminating null character)
+		elif len(memory_d['d']) == 0 and memory_d['l'] > 0:
+			pointer = generate_pointer_from_length(
+				memory_d['l'] + ((memory_d['w'] or 1) if memsync_d['n'] else 0)
+				)
+		else:
+			pointer = generate_pointer_from_bytes(memory_d['d'])
 
 		# Is this an already existing pointer, which has to be given a new value?
 		if hasattr(pointer_arg, 'contents'):
@@ -377,6 +483,20 @@ class memory_contents_class():
 		if memsync_d['w']:
 			self.__adjust_wchar_length__(memory_d)
 
+		# Copy new data from shared memory
+		if 'o' in memory_d:
+			ctypes.memmove(
+				ctypes.c_void_p(memory_d['a']),
+				self.arena.get_pointer(memory_d['o']),
+				memory_d['l']
+				)
+			return
+
+		# Only changed ranges have been sent, patch them into place
+		if memory_d.get('p', False):
+			overwrite_pointer_with_patch(memory_d['a'], memory_d['d'])
+			return
+
 		# Overwrite the local pointers with new data
 		overwrite_pointer_with_bytes(
 			ctypes.c_void_p(memory_d['a']),
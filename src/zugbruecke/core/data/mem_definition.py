@@ -35,6 +35,13 @@ import ctypes
 from pprint import pformat as pf
 #import traceback
 
+from ..const import (
+	DIFF_THRESHOLD,
+	DIR_IN,
+	DIR_OUT,
+	DIR_INOUT
+	)
+
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # CLASS: Memory content packing and unpacking
@@ -61,6 +68,9 @@ class memory_definition_class():
 
 	def __unpack_memsync_definition_dict__(self, memsync_d):
 
+		# Leave original definition untouched, it might be shipped to the other side later
+		memsync_d = memsync_d.copy()
+
 		# Null-terminated string - off by default
 		if 'n' not in memsync_d.keys():
 			memsync_d['n'] = False
@@ -85,4 +95,14 @@ class memory_definition_class():
 		if 'w' not in memsync_d.keys():
 			memsync_d['w'] = False
 
+		# Direction of memory, synced both ways by default
+		if 'd' not in memsync_d.keys():
+			memsync_d['d'] = DIR_INOUT
+		elif memsync_d['d'] not in (DIR_IN, DIR_OUT, DIR_INOUT):
+			raise ValueError('unknown direction "%s" of memory' % memsync_d['d'])
+
+		# Minimum length in bytes for sending only changed ranges back, None disables it
+		if 'c' not in memsync_d.keys():
+			memsync_d['c'] = DIFF_THRESHOLD
+
 		return memsync_d
@@ -31,17 +31,88 @@ specific language governing rights and limitations under the License.
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 import ctypes
+import struct
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+# Offset and length of a changed range in a patch
+PATCH_RANGE = struct.Struct('<QQ')
 
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # ROUTINES
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+def generate_patch_from_bytes(old_bytes, new_bytes, block_size):
+	"""
+	Returns changed ranges of blocks as a patch, or None if the patch is not smaller
+	than the new bytes. A patch is a sequence of offset, length and data.
+	"""
+
+	# Nothing has changed
+	if old_bytes == new_bytes:
+		return b''
+
+	# Step through blocks, merge adjacent changed blocks into ranges
+	range_list = []
+	start = None
+	for offset in range(0, len(new_bytes), block_size):
+		if old_bytes[offset:offset + block_size] != new_bytes[offset:offset + block_size]:
+			if start is None:
+				start = offset
+		elif start is not None:
+			range_list.append((start, offset))
+			start = None
+	if start is not None:
+		range_list.append((start, len(new_bytes)))
+
+	# Changes all over the place, send everything
+	if sum(end - start for start, end in range_list) + len(range_list) * PATCH_RANGE.size >= len(new_bytes):
+		return None
+
+	return b''.join(
+		PATCH_RANGE.pack(start, end - start) + new_bytes[start:end] for start, end in range_list
+		)
+
+
+def get_address_of_array(in_array):
+	"""
+	Returns the address of an object exposing the numpy array interface
+	"""
+
+	interface = in_array.__array_interface__
+
+	# Strides are only specified for arrays, which are not C-contiguous
+	if interface.get('strides', None) is not None:
+		raise ValueError('array is not C-contiguous')
+
+	return interface['data'][0]
+
+
 def generate_pointer_from_bytes(in_bytes):
 
 	return ctypes.cast(ctypes.pointer((ctypes.c_ubyte * len(in_bytes)).from_buffer_copy(in_bytes)), ctypes.c_void_p)
 
 
+def generate_pointer_from_length(length):
+
+	return ctypes.cast(ctypes.pointer((ctypes.c_ubyte * length)()), ctypes.c_void_p)
+
+
+def overwrite_pointer_with_patch(address, patch):
+
+	# Step through ranges and copy their data into place
+	offset = 0
+	while offset < len(patch):
+		start, length = PATCH_RANGE.unpack_from(patch, offset)
+		offset += PATCH_RANGE.size
+		ctypes.memmove(address + start, patch[offset:offset + length], length)
+		offset += length
+
+
 def overwrite_pointer_with_bytes(ctypes_pointer, in_bytes):
 
 	ctypes.memmove(ctypes_pointer, ctypes.pointer((ctypes.c_ubyte * len(in_bytes)).from_buffer_copy(in_bytes)), len(in_bytes))
@@ -31,6 +31,10 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+import os
+from threading import Lock
+
+from .pe_exports import get_pe_exports
 from .routine_client import routine_client_class
 
 
@@ -41,17 +45,18 @@ from .routine_client import routine_client_class
 class dll_client_class(): # Representing one idividual dll to be called into, returned by LoadLibrary
 
 
-	def __init__(self, parent_session, dll_name, dll_type, hash_id):
+	def __init__(self, parent_session, dll_name, dll_type, dll_param, hash_id, rpc_client):
 
 		# Store dll parameters name, path and type
 		self.name = dll_name
 		self.calling_convention = dll_type
+		self.param = dll_param
 
 		# Store pointer to zugbruecke session
 		self.session = parent_session
 
-		# For convenience ...
-		self.rpc_client = self.session.rpc_client
+		# Client for this DLL, might be pinned to one worker
+		self.rpc_client = rpc_client
 
 		# Get handle on log
 		self.log = self.session.log
@@ -62,17 +67,47 @@ class dll_client_class(): # Representing one idividual dll to be called into, re
 		# Start dict for dll routines
 		self.routines = {}
 
+		# Routines are attached by one thread at a time
+		self.__lock__ = Lock()
+
 		# Expose routine registration
-		self.__register_routine_on_server__ = getattr(self.rpc_client, self.hash_id + '_register_routine')
+		self.__register_routine_on_server__ = self.rpc_client.get_function_broadcast(self.hash_id + '_register_routine')
+
+		# Expose registration and configuration of many routines at once
+		self.__configure_routines_on_server__ = self.rpc_client.get_function_broadcast(self.hash_id + '_configure_routines')
+
+		# Expose registration, configuration and call of a routine in one round trip
+		self.__call_cold_on_server__ = self.rpc_client.get_function(self.hash_id + '_call_cold')
+
+		# Several workers must register and configure routines in the same order, one round trip per step
+		self.merge_cold_calls = self.session.p['workers'] == 1
 
 		# Expose string reprentation of dll object
-		self.__get_repr__ = getattr(self.rpc_client, self.hash_id + '_repr')
+		self.__get_repr__ = self.rpc_client.get_function(self.hash_id + '_repr')
+
+		# Expose location of DLL file
+		self.__get_unix_path__ = self.rpc_client.get_function(self.hash_id + '_unix_path')
+
+		# Export table of DLL file, read on first use, None if unknown
+		self.__exports__ = None
+		self.__exports_read__ = False
 
 
 	def __attach_to_routine__(self, name):
 
+		with self.__lock__:
+
+			# Another thread might have attached to routine in the meantime
+			if name in self.routines.keys():
+				return self.routines[name]
+
+			return self.__attach_to_new_routine__(name)
+
+
+	def __attach_to_new_routine__(self, name):
+
 		# Status log
-		self.log.out('[dll-client] Trying to attach to routine "%s" in DLL file "%s" ...' % (str(name), self.name))
+		self.log.out('[dll-client] Trying to attach to routine "%s" in DLL file "%s" ...', str(name), self.name)
 
 		# Log status
 		self.log.out('[dll-client] ... unknown, registering  ...')
@@ -84,10 +119,25 @@ class dll_client_class(): # Representing one idividual dll to be called into, re
 			if name.startswith('__') and name.endswith('__'):
 				raise AttributeError(name)
 
+		# Routine might have been registered at session start
+		preloaded = self.session.signature_cache.get_routine(self.name, name) if self.session.signature_cache is not None else None
+
+		# Check name against export table if available, exports are registered on first call
+		exports = self.__get_exports__() if preloaded is None else None
+		if exports is not None and not self.__is_exported__(exports, name):
+			# Wine might still find it, e.g. through forwarders or decorations unknown here
+			self.log.out('[dll-client] ... not exported, checking name on the Wine side ...')
+			exports = None
+
 		try:
 
-			# Register routine in wine
-			self.__register_routine_on_server__(name)
+			# Register routine in wine, get handles - or do so along with its first call
+			if preloaded is not None:
+				handles = preloaded['handles']
+			elif exports is not None or (self.session.p['lazy_routines'] and self.merge_cold_calls):
+				handles = None
+			else:
+				handles = self.__register_routine_on_server__(name)
 
 		except AttributeError as e:
 
@@ -97,7 +147,7 @@ class dll_client_class(): # Representing one idividual dll to be called into, re
 			raise e
 
 		# Create new instance of routine_client
-		self.routines[name] = routine_client_class(self, name)
+		self.routines[name] = routine_client_class(self, name, handles, preloaded)
 
 		# Log status
 		self.log.out('[dll-client] ... registered (unconfigured) ...')
@@ -115,6 +165,151 @@ class dll_client_class(): # Representing one idividual dll to be called into, re
 		return self.routines[name]
 
 
+	def __bind_signatures__(self, manifest_dict):
+		"""
+		Attaches to and configures routines from a manifest (see signature_manifest),
+		all in one round trip. Raises AttributeError for missing routines.
+		"""
+
+		# Log status
+		self.log.out('[dll-client] Binding %d routines in DLL file "%s" ...', len(manifest_dict), self.name)
+
+		with self.__lock__:
+
+			routine_list = []
+
+			for name, signature_d in manifest_dict.items():
+
+				# Routine might have been registered at session start
+				preloaded = self.session.signature_cache.get_routine(self.name, name) if self.session.signature_cache is not None else None
+
+				# Set definitions like users do
+				routine = routine_client_class(self, name, preloaded['handles'] if preloaded is not None else None, preloaded)
+				for key, value in signature_d.items():
+					setattr(routine, key, value)
+
+				# Parse definitions and compile plans locally
+				memsync_d_packed, definition_hash = routine.__configure_definitions__()
+
+				routine_list.append((routine, memsync_d_packed, definition_hash))
+
+			# Routines with definitions, which do not match those configured at session start
+			pending_list = [
+				(routine, memsync_d_packed, definition_hash)
+				for routine, memsync_d_packed, definition_hash in routine_list
+				if not routine.__is_preloaded__(definition_hash)
+				]
+
+			# Register and configure in one go
+			if len(pending_list) > 0:
+				result_list = self.__configure_routines_on_server__([{
+					'name': routine.name,
+					'argtypes': routine.argtypes_d,
+					'restype': routine.restype_d,
+					'memsync': memsync_d_packed,
+					'argdirs': routine.argdirs_d
+					} for routine, memsync_d_packed, _ in pending_list])
+			else:
+				result_list = []
+			result_dict = {routine.name: result for (routine, _, _), result in zip(pending_list, result_list)}
+
+			missing_list = []
+
+			for routine, memsync_d_packed, definition_hash in routine_list:
+
+				if routine.name not in result_dict.keys():
+					routine.__set_wire_id__(routine.preloaded['wire_id'])
+				elif result_dict[routine.name] is None:
+					missing_list.append(str(routine.name))
+					continue
+				else:
+					handles, wire_id = result_dict[routine.name]
+					if routine.handles is None:
+						routine.__set_handles__(handles)
+					routine.__set_wire_id__(wire_id)
+					routine.__remember_definitions__(memsync_d_packed, definition_hash)
+
+				# Routine is configured, first call goes straight to the routine
+				routine.called = True
+
+				self.routines[routine.name] = routine
+				if isinstance(routine.name, str):
+					setattr(self, routine.name, routine)
+
+		if len(missing_list) > 0:
+			raise AttributeError('routines %s can not be found or configured in DLL file "%s"' % (
+				', '.join(missing_list), self.name
+				))
+
+		# Log status
+		self.log.out('[dll-client] ... bound.')
+
+
+	def __dir__(self):
+
+		name_list = list(super().__dir__())
+
+		# Offer exported routines for tab-completion
+		exports = self.__get_exports__()
+		if exports is not None:
+			name_list.extend(name for name in exports.names if name.isidentifier())
+
+		return sorted(set(name_list))
+
+
+	def __get_exports__(self):
+
+		# Read export table only once
+		if self.__exports_read__:
+			return self.__exports__
+
+		# Log status
+		self.log.out('[dll-client] Reading export table of DLL file "%s" ...', self.name)
+
+		# Relative paths (not names) point to the same file on both sides
+		path = None
+		if '/' in self.name:
+			for candidate in (self.name, self.name + '.dll'):
+				if os.path.isfile(candidate):
+					path = candidate
+					break
+
+		# Ask Wine where it found the DLL
+		if path is None:
+			path = self.__get_unix_path__()
+
+		try:
+			if path is None:
+				raise ValueError('DLL file not found')
+			exports = get_pe_exports(path)
+			exports.names # parse
+		except (OSError, ValueError) as e:
+			self.log.out('[dll-client] ... failed (%s), checking names on the Wine side.', str(e))
+			exports = None
+		else:
+			self.log.out('[dll-client] ... %d names found.', len(exports.names))
+
+		self.__exports__ = exports
+		self.__exports_read__ = True
+
+		return exports
+
+
+	def __is_exported__(self, exports, name):
+
+		if name in exports:
+			return True
+
+		# ctypes also looks for names of stdcall routines decorated like "_name@<bytes of arguments>"
+		if isinstance(name, str) and self.calling_convention in ('windll', 'oledll'):
+			prefix = '_%s@' % name
+			return any(
+				export.startswith(prefix) and export[len(prefix):].isdigit() for export in exports.names
+				)
+
+		return False
+
+
 	def __getattr__(self, name):
 
 		if name in ['__objclass__']:
@@ -31,6 +31,8 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+import ctypes
+import os
 import traceback
 
 from .lib import get_hash_of_string
@@ -74,6 +76,110 @@ class dll_server_class(): # Representing one idividual dll to be called into
 			self.__register_routine__,
 			self.hash_id + '_register_routine'
 			)
+		self.session.rpc_server.register_function(
+			self.get_fingerprint,
+			self.hash_id + '_fingerprint'
+			)
+		self.session.rpc_server.register_function(
+			self.get_unix_path,
+			self.hash_id + '_unix_path'
+			)
+		self.session.rpc_server.register_function(
+			self.__call_cold__,
+			self.hash_id + '_call_cold'
+			)
+		self.session.rpc_server.register_function(
+			self.__configure_routines__,
+			self.hash_id + '_configure_routines'
+			)
+
+
+	def __call_cold__(self, routine_name, argtypes_d, restype_d, memsync_d, argdirs_d, arg_message_list, arg_memory_list):
+		"""
+		Exposed interface - registers, configures and calls routine in one round trip
+		"""
+
+		# Attach to routine (if not done before), raises AttributeError if it does not exist
+		handles = self.__register_routine__(routine_name)
+
+		# Apply definitions, get id of binary frames (if possible)
+		wire_id = self.routines[routine_name].__configure__(argtypes_d, restype_d, memsync_d, argdirs_d)
+
+		# Actual call
+		return handles, wire_id, self.routines[routine_name](arg_message_list, arg_memory_list)
+
+
+	def get_fingerprint(self):
+		"""
+		Exposed interface - size and modification time of DLL file, None if unknown
+		"""
+
+		# Path of DLL file as found by Windows, name as given otherwise
+		path = self.get_path()
+		if path is None:
+			path = self.name
+
+		try:
+			stat = os.stat(path)
+		except OSError:
+			return None
+
+		return '%d:%d' % (stat.st_size, stat.st_mtime_ns)
+
+
+	def get_path(self):
+		"""
+		Returns path of DLL file as found by Windows, None if unknown
+		"""
+
+		path_buffer = ctypes.create_unicode_buffer(32768)
+		if ctypes.windll.kernel32.GetModuleFileNameW(
+			ctypes.c_void_p(self.handler._handle), path_buffer, len(path_buffer)
+			) > 0:
+			return path_buffer.value
+
+		return None
+
+
+	def get_unix_path(self):
+		"""
+		Exposed interface - Unix path of DLL file, None if unknown
+		"""
+
+		path = self.get_path()
+		if path is None:
+			return None
+
+		try:
+			return self.session.path_wine_to_unix(path)
+		except Exception:
+			return None
+
+
+	def __configure_routines__(self, routine_list):
+		"""
+		Exposed interface - registers and configures many routines at once, returns
+		handles and wire id per routine or None if it is missing or can not be configured
+		"""
+
+		result_list = []
+
+		for routine_d in routine_list:
+
+			# Routine might be gone
+			try:
+				handles = self.__register_routine__(routine_d['name'])
+				wire_id = self.routines[routine_d['name']].__configure__(
+					routine_d['argtypes'], routine_d['restype'], routine_d['memsync'], routine_d['argdirs']
+					)
+			except Exception:
+				self.log.out('[dll-server] Configuring routine "%s" failed.', str(routine_d['name']))
+				result_list.append(None)
+				continue
+
+			result_list.append((handles, wire_id))
+
+		return result_list
 
 
 	def __get_repr__(self):
@@ -88,10 +194,10 @@ class dll_server_class(): # Representing one idividual dll to be called into
 
 		# Just in case this routine is already known
 		if routine_name in self.routines.keys():
-			return True # Success
+			return self.routines[routine_name].handles
 
 		# Log status
-		self.log.out('[dll-server] Trying to access "%s" in DLL file "%s" ...' % (str(routine_name), self.name))
+		self.log.out('[dll-server] Trying to access "%s" in DLL file "%s" ...', str(routine_name), self.name)
 
 		# Try to attach to routine with ctypes
 		try:
@@ -127,15 +233,29 @@ class dll_server_class(): # Representing one idividual dll to be called into
 		# Generate new instance of routine class
 		self.routines[routine_name] = routine_server_class(self, routine_name, routine_handler)
 
-		# Export call and configration directly
-		self.session.rpc_server.register_function(
-			self.routines[routine_name],
-			self.hash_id + '_' + str(routine_name) + '_handle_call'
-			)
-		self.session.rpc_server.register_function(
-			self.routines[routine_name].__configure__,
-			self.hash_id + '_' + str(routine_name) + '_configure'
+		# Export call and configration directly, remember handles
+		self.routines[routine_name].handles = {
+			'handle_call': self.session.rpc_server.register_function(
+				self.routines[routine_name],
+				self.hash_id + '_' + str(routine_name) + '_handle_call'
+				),
+			'handle_call_many': self.session.rpc_server.register_function(
+				self.routines[routine_name].call_many,
+				self.hash_id + '_' + str(routine_name) + '_handle_call_many'
+				),
+			'configure': self.session.rpc_server.register_function(
+				self.routines[routine_name].__configure__,
+				self.hash_id + '_' + str(routine_name) + '_configure'
+				)
+			}
+
+		# Export call via binary frames
+		self.routines[routine_name].wire_id = self.session.rpc_server.register_raw_function(
+			self.routines[routine_name].__handle_frame__
 			)
 
 		# Log status
 		self.log.out('[dll-server] ... done.')
+
+		# Return handles for subsequent calls
+		return self.routines[routine_name].handles
@@ -45,13 +45,16 @@ class interpreter_session_class():
 
 
 	# session init
-	def __init__(self, session_id, parameter, session_log):
+	def __init__(self, session_id, parameter, session_log, detach = False):
 
 		# Set ID, parameters and pointer to log
 		self.id = session_id
 		self.p = parameter
 		self.log = session_log
 
+		# Detached interpreters (daemons) outlive this session
+		self.detach = detach
+
 		# Log status
 		self.log.out('[interpreter] STARTING ...')
 
@@ -68,7 +71,7 @@ class interpreter_session_class():
 	# session destructor
 	def terminate(self):
 
-		if self.up:
+		if self.up and not self.detach:
 
 			# Log status
 			self.log.out('[interpreter] TERMINATING ...')
@@ -112,6 +115,21 @@ class interpreter_session_class():
 		# Log status
 		self.log.out('[interpreter] Command: ' + ' '.join(command_list))
 
+		# Daemon must survive this process, its standard output only signals readiness
+		if self.detach:
+			self.proc_winepython = subprocess.Popen(
+				command_list,
+				stdin = subprocess.DEVNULL,
+				stdout = subprocess.PIPE,
+				stderr = subprocess.DEVNULL,
+				shell = False,
+				preexec_fn = os.setsid,
+				close_fds = True
+				)
+			self.thread_list = []
+			self.log.out('[interpreter] Started detached with PID %d.', self.proc_winepython.pid)
+			return
+
 		# Fire up Wine-Python process
 		self.proc_winepython = subprocess.Popen(
 			command_list,
@@ -125,7 +143,7 @@ class interpreter_session_class():
 			)
 
 		# Status log
-		self.log.out('[interpreter] Started with PID %d.' % self.proc_winepython.pid)
+		self.log.out('[interpreter] Started with PID %d.', self.proc_winepython.pid)
 
 		# Prepare threads for stdout and stderr capturing of Wine
 		# BUG does not capture stdout from windows binaries (running with Wine) most of the time
@@ -140,8 +158,14 @@ class interpreter_session_class():
 			name = 'err'
 			)
 
+		# If stdout carries the ctypes bridge, it must not be captured
+		if self.p['transport'] == 'pipe':
+			self.thread_list = [self.thread_winepython_err]
+		else:
+			self.thread_list = [self.thread_winepython_out, self.thread_winepython_err]
+
 		# Start threads
-		for t in (self.thread_winepython_out, self.thread_winepython_err):
+		for t in self.thread_list:
 			t.daemon = True
 			t.start()
 
@@ -154,8 +178,8 @@ class interpreter_session_class():
 		# Terminate Wine-Python
 		os.killpg(os.getpgid(self.proc_winepython.pid), signal.SIGINT)
 
-		for t_index, t in enumerate([self.thread_winepython_out, self.thread_winepython_err]):
-			self.log.out('[interpreter] Joining logging thread "%s" ...' % t.name)
+		for t_index, t in enumerate(self.thread_list):
+			self.log.out('[interpreter] Joining logging thread "%s" ...', t.name)
 			t.join(timeout = 1) # seconds
 
 		# Log status
@@ -32,6 +32,7 @@ specific language governing rights and limitations under the License.
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 import json
+from pprint import pformat
 import sys
 import time
 
@@ -56,6 +57,27 @@ c = {
 	}
 
 
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# LAZY FORMATTING
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+class pformat_lazy:
+	"""
+	Pretty-prints its object only if it is converted into a string,
+	i.e. only if the log message it is passed with is actually logged
+	"""
+
+
+	def __init__(self, obj):
+
+		self.obj = obj
+
+
+	def __str__(self):
+
+		return pformat(self.obj)
+
+
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # LOG CLASS
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -188,7 +210,11 @@ class log_class:
 
 	def __push_message_to_server__(self, message):
 
-		self.client.transfer_message(json.dumps(message))
+		# Other side might be gone, e.g. a session client which crashed
+		try:
+			self.client.transfer_message(json.dumps(message))
+		except (EOFError, OSError):
+			pass
 
 
 	def __receive_message_from_client__(self, message):
@@ -203,13 +229,15 @@ class log_class:
 		f.close()
 
 
-	def out(self, message, level = 1):
+	def out(self, message, *args, level = 1):
 
+		# Format only if message is actually logged
 		if level <= self.p['log_level']:
-			self.__process_message__(message, 'out', level)
+			self.__process_message__(message % args if len(args) > 0 else message, 'out', level)
 
 
-	def err(self, message, level = 1):
+	def err(self, message, *args, level = 1):
 
+		# Format only if message is actually logged
 		if level <= self.p['log_level']:
-			self.__process_message__(message, 'err', level)
+			self.__process_message__(message % args if len(args) > 0 else message, 'err', level)
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	src/zugbruecke/core/pe_exports.py: Reads export tables of DLL files
+
+	Required to run on platform / side: [UNIX]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import mmap
+import os
+import struct
+from threading import Lock
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+# Offset of PE header, in DOS header
+PE_OFFSET = struct.Struct('<I')
+PE_OFFSET_AT = 0x3c
+
+PE_SIGNATURE = b'PE\0\0'
+
+# Machine, number of sections, time stamp, symbol table, number of symbols, size of optional header, characteristics
+COFF_HEADER = struct.Struct('<HHIIIHH')
+
+OPTIONAL_MAGIC = struct.Struct('<H')
+OPTIONAL_MAGIC_PE32 = 0x10b
+OPTIONAL_MAGIC_PE32_PLUS = 0x20b
+
+# Offset of number of data directories in optional header, directories follow
+OPTIONAL_DIRECTORY_COUNT_AT = {
+	OPTIONAL_MAGIC_PE32: 92,
+	OPTIONAL_MAGIC_PE32_PLUS: 108
+	}
+
+# Address and size
+DATA_DIRECTORY = struct.Struct('<II')
+DATA_DIRECTORY_EXPORT = 0
+
+# Name, virtual size, virtual address, size of raw data, pointer to raw data, (ignored)
+SECTION_HEADER = struct.Struct('<8sIIII16x')
+
+# Characteristics, time stamp, version, name, ordinal base, number of functions, number of names,
+# addresses of functions, names and ordinals of names
+EXPORT_DIRECTORY = struct.Struct('<IIHHIIIIIII')
+
+RVA = struct.Struct('<I')
+ORDINAL = struct.Struct('<H')
+
+# Wine places files without actual exports into prefixes for DLLs it implements itself
+WINE_PLACEHOLDER = b'Wine placeholder DLL'
+WINE_PLACEHOLDER_AT = 0x40
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+__pe_exports_dict__ = {}
+__pe_exports_lock__ = Lock()
+
+
+def get_pe_exports(path):
+	"""
+	Returns (cached) export table of DLL file, re-read if the file has been modified
+	"""
+
+	path = os.path.realpath(path)
+	key = (path, os.stat(path).st_mtime_ns)
+
+	with __pe_exports_lock__:
+		if key not in __pe_exports_dict__.keys():
+			__pe_exports_dict__[key] = pe_exports_class(path)
+		return __pe_exports_dict__[key]
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS: Export table
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+class pe_exports_class:
+	"""
+	Names and ordinals of routines exported by a PE/COFF file (DLL), parsed on first
+	access. Raises ValueError on access if the file is not a DLL with an export table.
+	"""
+
+
+	def __init__(self, path):
+
+		self.path = path
+
+		# Parsed on first access
+		self.__names__ = None
+		self.__ordinals__ = None
+		self.__lock__ = Lock()
+
+
+	def __contains__(self, name_or_ordinal):
+
+		if isinstance(name_or_ordinal, int):
+			return name_or_ordinal in self.ordinals
+		return name_or_ordinal in self.names
+
+
+	@property
+	def names(self):
+
+		self.__parse_once__()
+		return self.__names__
+
+
+	@property
+	def ordinals(self):
+
+		self.__parse_once__()
+		return self.__ordinals__
+
+
+	def __parse_once__(self):
+
+		with self.__lock__:
+			if self.__names__ is not None:
+				return
+			with open(self.path, 'rb') as f:
+				with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as data:
+					self.__names__, self.__ordinals__ = self.__parse__(data)
+
+
+	def __parse__(self, data):
+
+		try:
+
+			# DOS header
+			if data[:2] != b'MZ':
+				raise ValueError('no DOS header')
+			if data[WINE_PLACEHOLDER_AT:WINE_PLACEHOLDER_AT + len(WINE_PLACEHOLDER)] == WINE_PLACEHOLDER:
+				raise ValueError('Wine placeholder without exports')
+			pe_offset = PE_OFFSET.unpack_from(data, PE_OFFSET_AT)[0]
+
+			# PE signature and COFF header
+			if data[pe_offset:pe_offset + len(PE_SIGNATURE)] != PE_SIGNATURE:
+				raise ValueError('no PE signature')
+			coff_offset = pe_offset + len(PE_SIGNATURE)
+			_, section_count, _, _, _, optional_size, _ = COFF_HEADER.unpack_from(data, coff_offset)
+			optional_offset = coff_offset + COFF_HEADER.size
+
+			# Optional header, 32 or 64 bit
+			magic = OPTIONAL_MAGIC.unpack_from(data, optional_offset)[0]
+			if magic not in OPTIONAL_DIRECTORY_COUNT_AT.keys():
+				raise ValueError('unknown optional header 0x%x' % magic)
+			directory_count_offset = optional_offset + OPTIONAL_DIRECTORY_COUNT_AT[magic]
+			if RVA.unpack_from(data, directory_count_offset)[0] <= DATA_DIRECTORY_EXPORT:
+				raise ValueError('no export directory')
+			export_rva, export_size = DATA_DIRECTORY.unpack_from(
+				data, directory_count_offset + RVA.size + DATA_DIRECTORY.size * DATA_DIRECTORY_EXPORT
+				)
+			if export_rva == 0 or export_size == 0:
+				raise ValueError('no export table')
+
+			# Sections, for mapping relative virtual addresses to file offsets
+			section_offset = optional_offset + optional_size
+			section_list = [
+				SECTION_HEADER.unpack_from(data, section_offset + index * SECTION_HEADER.size)[1:]
+				for index in range(section_count)
+				]
+
+			def get_offset(rva):
+				for virtual_size, virtual_address, raw_size, raw_pointer in section_list:
+					if virtual_address <= rva < virtual_address + max(virtual_size, raw_size):
+						return rva - virtual_address + raw_pointer
+				raise ValueError('address 0x%x outside of sections' % rva)
+
+			# Export directory
+			(
+				_, _, _, _, _, ordinal_base, function_count, name_count,
+				functions_rva, names_rva, _
+				) = EXPORT_DIRECTORY.unpack_from(data, get_offset(export_rva))
+
+			# Ordinals of actual entries in address table
+			functions_offset = get_offset(functions_rva) if function_count > 0 else 0
+			ordinal_set = {
+				ordinal_base + index for index in range(function_count)
+				if RVA.unpack_from(data, functions_offset + index * RVA.size)[0] != 0
+				}
+
+			# Null-terminated names
+			names_offset = get_offset(names_rva) if name_count > 0 else 0
+			name_set = set()
+			for index in range(name_count):
+				name_offset = get_offset(RVA.unpack_from(data, names_offset + index * RVA.size)[0])
+				name_end = data.find(b'\0', name_offset)
+				if name_end < 0:
+					raise ValueError('unterminated name')
+				name_set.add(data[name_offset:name_end].decode('latin-1'))
+
+		except struct.error:
+
+			raise ValueError('truncated file')
+
+		# Nothing to validate against, e.g. stubs
+		if len(ordinal_set) == 0:
+			raise ValueError('empty export table')
+
+		return frozenset(name_set), frozenset(ordinal_set)
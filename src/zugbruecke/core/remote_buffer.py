@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	src/zugbruecke/core/remote_buffer.py: Memory on the Wine side, which persists across calls
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import ctypes
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS: Remote buffer
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+class remote_buffer_class:
+	"""
+	Memory allocated once on the Wine side, mirrored by a local ctypes object.
+	It can be passed to routines in place of pointers handled by memsync, without
+	any transfer. Data only moves between both sides on push and pull.
+	"""
+
+
+	def __init__(self, session, local):
+
+		if not isinstance(local, (ctypes.Array, ctypes.Structure, ctypes.Union, ctypes._SimpleCData)):
+			raise TypeError('remote buffers mirror ctypes arrays, structures, unions or scalars')
+
+		# Store handle on session and local mirror
+		self.session = session
+		self.local = local
+		self.size = ctypes.sizeof(local)
+
+		# Get handles on server-side buffer routines
+		self.__read_on_server__ = self.session.rpc_client.get_function('read_buffer')
+		self.__write_on_server__ = self.session.rpc_client.get_function('write_buffer')
+		self.__free_on_server__ = self.session.rpc_client.get_function('free_buffer')
+
+		# Address of memory on Wine side
+		self.address = self.session.rpc_client.get_function('allocate_buffer')(self.size)
+
+
+	def __enter__(self):
+
+		return self
+
+
+	def __exit__(self, exc_type, exc_value, traceback):
+
+		self.free()
+
+
+	def __repr__(self):
+
+		return '<remote_buffer %d bytes at 0x%x>' % (self.size, self.address or 0)
+
+
+	def free(self):
+
+		# Free only once
+		if self.address is None:
+			return
+
+		self.__free_on_server__(self.address)
+		self.address = None
+
+
+	def pull(self, offset = 0, length = None):
+		"""
+		Copies memory (or a range of it) from the Wine side into the local mirror
+		"""
+
+		length = self.__check_range__(offset, length)
+
+		ctypes.memmove(
+			ctypes.addressof(self.local) + offset, self.__read_on_server__(self.address, offset, length), length
+			)
+
+
+	def push(self, offset = 0, length = None):
+		"""
+		Copies the local mirror (or a range of it) into memory on the Wine side
+		"""
+
+		length = self.__check_range__(offset, length)
+
+		self.__write_on_server__(
+			self.address, offset, ctypes.string_at(ctypes.addressof(self.local) + offset, length)
+			)
+
+
+	def __check_range__(self, offset, length):
+
+		if self.address is None:
+			raise ValueError('remote buffer has been freed')
+
+		# Up to the end by default
+		if length is None:
+			length = self.size - offset
+
+		if offset < 0 or length < 0 or offset + length > self.size:
+			raise ValueError('range %d:%d out of bounds of remote buffer of %d bytes' % (
+				offset, offset + length, self.size
+				))
+
+		return length
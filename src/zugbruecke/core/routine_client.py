@@ -31,9 +31,19 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+import asyncio
+from concurrent.futures import Future
 import ctypes
 from functools import partial
-from pprint import pformat as pf
+from threading import Lock
+
+from .const import (
+	DIR_IN,
+	DIR_OUT
+	)
+from .log import pformat_lazy
+from .signature_cache import get_definition_hash
+from .wire import get_wire_codec
 
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -43,7 +53,7 @@ from pprint import pformat as pf
 class routine_client_class():
 
 
-	def __init__(self, parent_dll, routine_name):
+	def __init__(self, parent_dll, routine_name, handles, preloaded = None):
 
 		# Store handle on parent dll
 		self.dll = parent_dll
@@ -66,75 +76,221 @@ class routine_client_class():
 		# Set call status
 		self.called = False
 
+		# Routine is configured by one thread only
+		self.__configure_lock__ = Lock()
+
 		# By default, there is no memory to sync
 		self.__memsync__ = []
 
 		# By default, assume no arguments
 		self.__argtypes__ = []
 
+		# By default, infer directions of arguments from their types
+		self.__argdirs__ = None
+
 		# By default, assume c_int return value like ctypes expects
 		self.__restype__ = ctypes.c_int
 
-		# Get handle on server-side configure
-		self.__configure_on_server__ = getattr(
-			self.rpc_client, self.dll.hash_id + '_' + str(self.name) + '_configure'
-			)
+		# Binary frames can not be used until routine is configured
+		self.wire_id = None
+		self.wire_codec = None
 
-		# Get handle on server-side handle_call
-		self.__handle_call_on_server__ = getattr(
-			self.rpc_client, self.dll.hash_id + '_' + str(self.name) + '_handle_call'
-			)
+		# Wire id and hash of definitions, if routine was configured at session start
+		self.preloaded = preloaded
+
+		# Routine might be registered along with its first call
+		self.handles = None
+		if handles is not None:
+			self.__set_handles__(handles)
 
 
 	def __call__(self, *args):
+
+		# Log status
+		self.log.out('[routine-client] Trying to call routine "%s" in DLL file "%s" ...', self.name, self.dll.name)
+
+		# Configure routine along with its first call if possible
+		if not self.called and self.dll.merge_cold_calls:
+			with self.__configure_lock__:
+				if not self.called:
+					return self.__call_cold__(args)
+
+		# Configure routine on its first call
+		self.__configure_on_first_call__()
+
+		# Log status
+		self.log.out('[routine-client] ... parameters are "%r". Packing and pushing to server ...', args)
+
+		# Handle memory
+		mem_package_list = self.data.client_pack_memory_list(args, self.memsync_d)
+
+		try:
+			return self.__call_on_server__(args, mem_package_list)
+		finally:
+			# Release shared memory (if used)
+			self.data.client_free_memory_list(mem_package_list)
+
+
+	def acall(self, *args):
 		"""
-		TODO Optimize for speed!
+		Awaitable flavour of call_async for use within an asyncio event loop
+		"""
+
+		return asyncio.wrap_future(self.call_async(*args))
+
+
+	def call_async(self, *args):
+		"""
+		Sends call to server and returns a concurrent.futures.Future of the return value
+		without waiting for the server. Arguments and memory are synced once the
+		response arrives, i.e. they must not be touched before the future is done.
 		"""
 
 		# Log status
-		self.log.out('[routine-client] Trying to call routine "%s" in DLL file "%s" ...' % (self.name, self.dll.name))
+		self.log.out('[routine-client] Trying to call routine "%s" in DLL file "%s" asynchronously ...', self.name, self.dll.name)
 
-		# Has this routine ever been called?
-		if not self.called:
+		# Configure routine on its first call
+		self.__configure_on_first_call__()
 
-			# Log status
-			self.log.out('[routine-client] ... has not been called before. Configuring ...')
+		# Log status
+		self.log.out('[routine-client] ... parameters are "%r". Packing and pushing to server ...', args)
 
-			# Tell wine-python about types
-			self.__configure__()
+		# Handle memory
+		mem_package_list = self.data.client_pack_memory_list(args, self.memsync_d)
 
-			# Change status of routine - it has been called once and is therefore configured
-			self.called = True
+		try:
 
-			# Log status
-			self.log.out('[routine-client] ... configured. Proceeding ...')
+			# Try to encode call as binary frame if signature allows it
+			frame = None
+			if self.wire_codec is not None:
+				frame = self.wire_codec.encode_request(self.wire_id, args, mem_package_list)
+
+			# Send call to server
+			if frame is not None:
+				rpc_future = self.rpc_client.call_raw_async(frame)
+			else:
+				rpc_future = self.__handle_call_on_server_async__(
+					self.__arg_list_pack__(args), mem_package_list
+					)
+
+		except:
+
+			# Release shared memory (if used)
+			self.data.client_free_memory_list(mem_package_list)
+			raise
+
+		# Future of return value, resolved once the response has been unpacked
+		future = Future()
+
+		def unpack_response(rpc_future):
+
+			try:
+				response = rpc_future.result()
+				if isinstance(response, bytes):
+					return_value = self.__unpack_frame__(args, response)
+				else:
+					return_value = self.__unpack_return_dict__(args, response)
+			except Exception as e:
+				future.set_exception(e)
+			else:
+				future.set_result(return_value)
+			finally:
+				# Release shared memory (if used)
+				self.data.client_free_memory_list(mem_package_list)
+
+		rpc_future.add_done_callback(unpack_response)
+
+		return future
+
+
+	def __call_cold__(self, args):
+
+		# Log status
+		self.log.out('[routine-client] ... has not been called before. Configuring along with call ...')
+
+		# Parse definitions and compile plans locally
+		memsync_d_packed, definition_hash = self.__configure_definitions__()
+
+		# Routine was configured at session start, there is nothing to merge
+		if self.__is_preloaded__(definition_hash):
+			self.__set_wire_id__(self.preloaded['wire_id'])
+			self.called = True
+			return self(*args)
 
 		# Log status
-		self.log.out('[routine-client] ... parameters are "%r". Packing and pushing to server ...' % (args,))
+		self.log.out('[routine-client] ... parameters are "%r". Packing and pushing to server ...', args)
 
 		# Handle memory
 		mem_package_list = self.data.client_pack_memory_list(args, self.memsync_d)
 
+		try:
+
+			# Register (if required), configure and call routine in DLL in one go
+			handles, wire_id, return_dict = self.dll.__call_cold_on_server__(
+				self.name, self.argtypes_d, self.restype_d, memsync_d_packed, self.argdirs_d,
+				self.__arg_list_pack__(args), mem_package_list
+				)
+
+			# Routine is configured on server, even if the call itself failed
+			if self.handles is None:
+				self.__set_handles__(handles)
+			self.__set_wire_id__(wire_id)
+			self.__remember_definitions__(memsync_d_packed, definition_hash)
+			self.called = True
+
+			# Log status
+			self.log.out('[routine-client] ... configured. Proceeding ...')
+
+			# Unpack return dict, return value or raise
+			return self.__unpack_return_dict__(args, return_dict)
+
+		finally:
+
+			# Release shared memory (if used)
+			self.data.client_free_memory_list(mem_package_list)
+
+
+	def __call_on_server__(self, args, mem_package_list):
+
+		# Try to encode call as binary frame if signature allows it
+		frame = None
+		if self.wire_codec is not None:
+			frame = self.wire_codec.encode_request(self.wire_id, args, mem_package_list)
+
+		# Actually call routine in DLL via binary frame!
+		if frame is not None:
+
+			return_dict = self.rpc_client.call_raw(frame)
+
+			# Server answered with binary frame
+			if isinstance(return_dict, bytes):
+				return self.__unpack_frame__(args, return_dict)
+
 		# Actually call routine in DLL! TODO Handle kw ...
-		return_dict = self.__handle_call_on_server__(
-			self.data.arg_list_pack(args, self.argtypes_d), mem_package_list
-			)
+		else:
+
+			return_dict = self.__handle_call_on_server__(
+				self.__arg_list_pack__(args), mem_package_list
+				)
+
+		# Unpack return dict, return value or raise
+		return self.__unpack_return_dict__(args, return_dict)
+
+
+	def __unpack_return_dict__(self, args, return_dict):
 
 		# Log status
 		self.log.out('[routine-client] ... received feedback from server, unpacking & syncing arguments ...')
 
-		# Unpack return dict (call may have failed partially only)
-		self.data.arg_list_sync(
-			args,
-			self.data.arg_list_unpack(return_dict['args'], self.argtypes_d),
-			self.argtypes_d
-			)
+		# Unpack return dict, arguments are not sent back if call failed
+		if return_dict['success']:
+			self.__arg_list_sync__(args, self.__arg_list_unpack__(return_dict['args']))
 
 		# Log status
 		self.log.out('[routine-client] ... unpacking return value ...')
 
 		# Unpack return value of routine
-		return_value = self.data.return_msg_unpack(return_dict['return_value'], self.restype_d)
+		return_value = self.__return_msg_unpack__(return_dict['return_value'])
 
 		# Log status
 		self.log.out('[routine-client] ... overwriting memory ...')
@@ -157,8 +313,163 @@ class routine_client_class():
 		return return_value
 
 
+	def call_many(self, args_iterable, return_exceptions = False):
+		"""
+		Calls routine once per tuple of arguments, all in one request to the server.
+		Returns list of return values. If a call fails, its exception is put
+		into the list if return_exceptions is set, otherwise the first exception
+		is raised once all calls have been unpacked.
+		"""
+
+		# Log status
+		self.log.out('[routine-client] Trying to call routine "%s" in DLL file "%s" many times ...', self.name, self.dll.name)
+
+		# Configure routine on its first call
+		self.__configure_on_first_call__()
+
+		# Arguments for every call
+		args_list = [tuple(args) for args in args_iterable]
+
+		# Log status
+		self.log.out('[routine-client] ... %d calls. Packing and pushing to server ...', len(args_list))
+
+		# Handle memory of every call
+		mem_package_list_list = []
+
+		try:
+
+			# Pack arguments and memory of every call, errors are kept per call
+			call_list = []
+			return_dict_list = []
+			for args in args_list:
+				try:
+					mem_package_list = self.data.client_pack_memory_list(args, self.memsync_d)
+					mem_package_list_list.append(mem_package_list)
+					call_list.append((self.__arg_list_pack__(args), mem_package_list))
+					return_dict_list.append(None)
+				except Exception as e:
+					return_dict_list.append(e)
+
+			# Actually call routine in DLL, many times, in one request
+			if len(call_list) > 0:
+				return_dict_iter = iter(self.__handle_call_many_on_server__(call_list))
+				return_dict_list = [
+					next(return_dict_iter) if return_dict is None else return_dict
+					for return_dict in return_dict_list
+					]
+
+			# Unpack every call, collect exceptions
+			return_value_list = []
+			exception = None
+			for args, return_dict in zip(args_list, return_dict_list):
+				try:
+					# Call failed before or after calling into DLL, nothing to sync
+					if isinstance(return_dict, Exception):
+						raise return_dict
+					return_value_list.append(self.__unpack_return_dict__(args, return_dict))
+				except Exception as e:
+					if not return_exceptions and exception is None:
+						exception = e
+					return_value_list.append(e)
+
+		finally:
+
+			# Release shared memory (if used)
+			for mem_package_list in mem_package_list_list:
+				self.data.client_free_memory_list(mem_package_list)
+
+		# Raise first error if exceptions are not returned
+		if exception is not None:
+			raise exception
+
+		# Log status
+		self.log.out('[routine-client] ... return.')
+
+		return return_value_list
+
+
+	def map(self, *iterables):
+		"""
+		Like built-in map, but calls routine with all arguments in one request, see call_many
+		"""
+
+		return self.call_many(zip(*iterables))
+
+
+	def __configure_on_first_call__(self):
+
+		# Has this routine ever been called?
+		if self.called:
+			return
+
+		with self.__configure_lock__:
+
+			# Another thread might have configured routine in the meantime
+			if self.called:
+				return
+
+			# Log status
+			self.log.out('[routine-client] ... has not been called before. Configuring ...')
+
+			# Tell wine-python about types
+			self.__configure__()
+
+			# Change status of routine - it has been called once and is therefore configured
+			self.called = True
+
+		# Log status
+		self.log.out('[routine-client] ... configured. Proceeding ...')
+
+
+	def __unpack_frame__(self, args, frame):
+
+		# Log status
+		self.log.out('[routine-client] ... received binary frame from server, unpacking ...')
+
+		# Decode return value and memory
+		return_msg, mem_package_list = self.wire_codec.decode_response(frame)
+
+		# Unpack return value of routine
+		return_value = self.__return_msg_unpack__(return_msg)
+
+		# Unpack memory
+		self.data.client_unpack_memory_list(args, return_value, mem_package_list, self.memsync_d)
+
+		# Log status
+		self.log.out('[routine-client] ... return.')
+
+		# Return result. return_value will be None if there was not a result.
+		return return_value
+
+
 	def __configure__(self):
 
+		# Parse definitions and compile plans locally
+		memsync_d_packed, definition_hash = self.__configure_definitions__()
+
+		# Routine might have been configured with identical definitions at session start
+		if self.__is_preloaded__(definition_hash):
+			self.__set_wire_id__(self.preloaded['wire_id'])
+			return
+
+		# Register routine in wine, if this has not happened on attribute access
+		if self.handles is None:
+			self.__set_handles__(self.dll.__register_routine_on_server__(self.name))
+
+		# Pass argument and return value types as strings ...
+		wire_id = self.__configure_on_server__(
+			self.argtypes_d, self.restype_d, memsync_d_packed, self.argdirs_d
+			)
+
+		# Remember definitions for subsequent sessions
+		self.__remember_definitions__(memsync_d_packed, definition_hash)
+
+		# Use binary frames if server and session allow it
+		self.__set_wire_id__(wire_id)
+
+
+	def __configure_definitions__(self):
+
 		# Prepare list of arguments by parsing them into list of dicts (TODO field name / kw)
 		self.argtypes_d = self.data.pack_definition_argtypes(self.__argtypes__)
 
@@ -176,19 +487,92 @@ class routine_client_class():
 			self.memsync_d, self.argtypes_d, self.restype_d
 			)
 
+		# Directions of arguments, after memsync has been applied
+		self.argdirs_d = self.data.pack_definition_argdirs(self.__argdirs__, self.argtypes_d)
+
+		# Compile (un-) packing plans for this signature, outputs are not sent and inputs are not synced
+		self.__arg_list_pack__ = self.data.compile_arg_list_pack(self.argtypes_d, self.argdirs_d, DIR_OUT)
+		self.__arg_list_unpack__ = self.data.compile_arg_list_unpack(self.argtypes_d, self.argdirs_d, DIR_IN)
+		self.__arg_list_sync__ = self.data.compile_arg_list_sync(self.argtypes_d, self.argdirs_d)
+		self.__return_msg_unpack__ = self.data.compile_return_msg_unpack(self.restype_d)
+
 		# Log status
-		self.log.out(' memsync: \n%s' % pf(self.memsync_d))
-		self.log.out(' argtypes: \n%s' % pf(self.__argtypes__))
-		self.log.out(' argtypes_d: \n%s' % pf(self.argtypes_d))
-		self.log.out(' restype: \n%s' % pf(self.__restype__))
-		self.log.out(' restype_d: \n%s' % pf(self.restype_d))
+		self.log.out(' memsync: \n%s', pformat_lazy(self.memsync_d))
+		self.log.out(' argtypes: \n%s', pformat_lazy(self.__argtypes__))
+		self.log.out(' argtypes_d: \n%s', pformat_lazy(self.argtypes_d))
+		self.log.out(' argdirs_d: \n%s', pformat_lazy(self.argdirs_d))
+		self.log.out(' restype: \n%s', pformat_lazy(self.__restype__))
+		self.log.out(' restype_d: \n%s', pformat_lazy(self.restype_d))
 
-		# Pass argument and return value types as strings ...
-		result = self.__configure_on_server__(
-			self.argtypes_d, self.restype_d, memsync_d_packed
+		# Hash of definitions, if they are cached across sessions
+		if self.session.signature_cache is not None:
+			definition_hash = get_definition_hash(self.argtypes_d, self.restype_d, memsync_d_packed, self.argdirs_d)
+		else:
+			definition_hash = None
+
+		return memsync_d_packed, definition_hash
+
+
+	def __is_preloaded__(self, definition_hash):
+
+		return self.preloaded is not None and definition_hash is not None and self.preloaded['hash'] == definition_hash
+
+
+	def __remember_definitions__(self, memsync_d_packed, definition_hash):
+
+		# Definitions can not be cached
+		if definition_hash is None:
+			return
+
+		self.session.signature_cache.update(
+			self.dll.name, self.dll.calling_convention, self.dll.param, self.name, definition_hash, {
+				'argtypes': self.argtypes_d,
+				'restype': self.restype_d,
+				'memsync': memsync_d_packed,
+				'argdirs': self.argdirs_d
+				}
 			)
 
 
+	def __set_handles__(self, handles):
+
+		# Remember handles, e.g. for routines registered along with their first call
+		self.handles = handles
+
+		# Get handle on server-side configure
+		self.__configure_on_server__ = self.rpc_client.get_function_broadcast(handles['configure'])
+
+		# Get handle on server-side handle_call
+		self.__handle_call_on_server__ = self.rpc_client.get_function(handles['handle_call'])
+		self.__handle_call_on_server_async__ = self.rpc_client.get_function_async(handles['handle_call'])
+
+		# Get handle on server-side handle_call_many
+		self.__handle_call_many_on_server__ = self.rpc_client.get_function(handles['handle_call_many'])
+
+
+	def __set_wire_id__(self, wire_id):
+
+		# Use binary frames if server and session allow it
+		if wire_id is not None and self.session.wire_binary:
+			self.wire_id = wire_id
+			self.wire_codec = get_wire_codec(self.argtypes_d, self.restype_d)
+
+
+	@property
+	def argdirs(self):
+
+		return self.__argdirs__
+
+
+	@argdirs.setter
+	def argdirs(self, value):
+
+		if value is not None and not isinstance(value, list) and not isinstance(value, tuple):
+			raise TypeError
+
+		self.__argdirs__ = value
+
+
 	@property
 	def argtypes(self):
 
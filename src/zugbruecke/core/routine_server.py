@@ -31,9 +31,15 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-from pprint import pformat as pf
 import traceback
 
+from .const import (
+	DIR_IN,
+	DIR_OUT
+	)
+from .log import pformat_lazy
+from .wire import get_wire_codec
+
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # DLL SERVER CLASS
@@ -62,19 +68,23 @@ class routine_server_class():
 		# Set routine handler
 		self.handler = routine_handler
 
+		# RPC handles for call and configuration, set by dll_server_class
+		self.handles = None
+
+		# Binary frames can not be handled until routine is configured
+		self.wire_id = None
+		self.wire_codec = None
+
 
 	def __call__(self, arg_message_list, arg_memory_list):
-		"""
-		TODO: Optimize for speed!
-		"""
 
 		# Log status
-		self.log.out('[routine-server] Trying call routine "%s" ...' % self.name)
+		self.log.out('[routine-server] Trying call routine "%s" ...', self.name)
 
 		try:
 
 			# Unpack passed arguments, handle pointers and structs ...
-			args_list = self.data.arg_list_unpack(arg_message_list, self.argtypes_d)
+			args_list = self.__arg_list_unpack__(arg_message_list)
 
 			# Unpack pointer data
 			self.data.server_unpack_memory_list(args_list, arg_memory_list, self.memsync_d)
@@ -102,9 +112,9 @@ class routine_server_class():
 			# Push traceback to log
 			self.log.err(traceback.format_exc())
 
-			# Pack return package and return it
+			# Pack return package and return it, arguments are not synced
 			return {
-				'args': arg_message_list,
+				'args': None,
 				'return_value': return_value,
 				'memory': arg_memory_list,
 				'success': False,
@@ -117,10 +127,10 @@ class routine_server_class():
 			self.data.server_pack_memory_list(args_list, return_value, arg_memory_list, self.memsync_d)
 
 			# Get new arg message list
-			arg_message_list = self.data.arg_list_pack(args_list, self.argtypes_d)
+			arg_message_list = self.__arg_list_pack__(args_list)
 
 			# Get new return message list
-			return_message = self.data.return_msg_pack(return_value, self.restype_d)
+			return_message = self.__return_msg_pack__(return_value)
 
 			# Log status
 			self.log.out('[routine-server] ... done.')
@@ -145,11 +155,58 @@ class routine_server_class():
 			raise e
 
 
-	def __configure__(self, argtypes_d, restype_d, memsync_d):
+	def call_many(self, call_list):
+		"""
+		Exposed interface: Runs __call__ for every pair of argument and memory messages
+		"""
+
+		# Log status
+		self.log.out('[routine-server] Trying call routine "%s" %d times ...', self.name, len(call_list))
+
+		return_dict_list = []
+
+		for arg_message_list, arg_memory_list in call_list:
+
+			try:
+
+				# Actual call, catches errors in DLL
+				return_dict_list.append(self(arg_message_list, arg_memory_list))
+
+			except Exception as e:
+
+				# Errors while (un-) packing, nothing to sync - pass error only
+				return_dict_list.append(e)
+
+		return return_dict_list
+
+
+	def __handle_frame__(self, frame):
+
+		# Decode arguments and memory from binary frame
+		arg_message_list, arg_memory_list = self.wire_codec.decode_request(frame)
+
+		# Actual call
+		return_dict = self(arg_message_list, arg_memory_list)
+
+		# Errors are pickled
+		if not return_dict['success']:
+			return return_dict
+
+		# Encode binary response, fall back to pickle if the return value does not fit
+		response = self.wire_codec.encode_response(
+			self.wire_id, return_dict['return_value'], return_dict['memory']
+			)
+		return return_dict if response is None else response
+
+
+	def __configure__(self, argtypes_d, restype_d, memsync_d, argdirs_d = None):
 
 		# Store argtype definition dict
 		self.argtypes_d = argtypes_d
 
+		# Store directions of arguments
+		self.argdirs_d = argdirs_d
+
 		# Store return value definition dict
 		self.restype_d = restype_d
 
@@ -167,6 +224,14 @@ class routine_server_class():
 			# Parse and apply restype definition dict to actual ctypes routine
 			self.handler.restype = self.data.unpack_definition_returntype(restype_d)
 
+			# Compile (un-) packing plans for this signature, inputs are not sent back and outputs are allocated
+			self.__arg_list_pack__ = self.data.compile_arg_list_pack(argtypes_d, argdirs_d, DIR_IN)
+			self.__arg_list_unpack__ = self.data.compile_arg_list_unpack(argtypes_d, argdirs_d, DIR_OUT)
+			self.__return_msg_pack__ = self.data.compile_return_msg_pack(restype_d)
+
+			# Compile binary wire codec if signature allows it
+			self.wire_codec = get_wire_codec(argtypes_d, restype_d)
+
 		except Exception as e:
 
 			# Push traceback to log
@@ -175,8 +240,12 @@ class routine_server_class():
 			raise e
 
 		# Log status
-		self.log.out(' memsync: \n%s' % pf(self.memsync_d))
-		self.log.out(' argtypes: \n%s' % pf(self.handler.argtypes))
-		self.log.out(' argtypes_d: \n%s' % pf(self.argtypes_d))
-		self.log.out(' restype: \n%s' % pf(self.handler.restype))
-		self.log.out(' restype_d: \n%s' % pf(self.restype_d))
+		self.log.out(' memsync: \n%s', pformat_lazy(self.memsync_d))
+		self.log.out(' argtypes: \n%s', pformat_lazy(self.handler.argtypes))
+		self.log.out(' argtypes_d: \n%s', pformat_lazy(self.argtypes_d))
+		self.log.out(' argdirs_d: \n%s', pformat_lazy(self.argdirs_d))
+		self.log.out(' restype: \n%s', pformat_lazy(self.handler.restype))
+		self.log.out(' restype_d: \n%s', pformat_lazy(self.restype_d))
+
+		# Tell client how to reach this routine with binary frames, if possible
+		return self.wire_id if self.wire_codec is not None else None
@@ -31,14 +31,40 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+from concurrent.futures import Future
+import itertools
 from multiprocessing.connection import (
 	Client,
 	Listener
 	)
-from threading import Thread
+import os
+import pickle
+from queue import Queue
+import select
+import socket
+import struct
+from threading import (
+	local,
+	Lock,
+	Thread
+	)
 import time
 import traceback
 
+from .wire import (
+	decode_wire_id,
+	is_wire_frame,
+	WIRE_VERSION
+	)
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+# Prefix of every request and response
+RPC_REQUEST_ID = struct.Struct('<I')
+
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # CLASSES AND CONSTRUCTOR ROUTINES
@@ -73,53 +99,632 @@ def mp_client_safe_connect(socket_path, authkey, timeout_after_seconds = 30, wai
 	raise # TODO
 
 
+def mp_client_pipe_connect(read_fd, write_fd, timeout_after_seconds = 30):
+
+	# Wrap inherited pipe pair
+	connection = mp_pipe_connection_class(read_fd, write_fd)
+
+	# Wait for server to announce itself on the pipe
+	connection.wait_for_announcement(timeout_after_seconds)
+
+	# Fire up client on top of pipe
+	mp_client = mp_client_class(None, None, connection = connection)
+
+	# Get status from server and return handle
+	if mp_client.__get_handler_status__():
+		return mp_client
+
+	# Server is there but not ready, give up on the pipe
+	connection.close()
+	raise ConnectionError('server on pipe reported it is not ready')
+
+
+def set_tcp_nodelay(connection):
+
+	# Disable Nagle's algorithm on the socket underneath a connection
+	s = socket.socket(socket.AF_INET, socket.SOCK_STREAM, fileno = connection.fileno())
+	try:
+		s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+	except OSError:
+		pass
+	finally:
+		# Do not close the socket, the connection still owns it
+		s.detach()
+
+
 class mp_client_class:
+	"""
+	Every request is prefixed with a request ID, which the server copies into its
+	response. Synchronous calls send and receive directly. Once the first
+	asynchronous call is made, a reader thread takes over receiving and
+	resolves futures by request ID, i.e. responses may arrive out of order.
+	"""
 
 
-	def __init__(self, socket_path, authkey):
+	def __init__(self, socket_path, authkey, connection = None):
+
+		# Request IDs and futures of requests in flight
+		self.__request_ids__ = itertools.count()
+		self.__futures__ = {}
+
+		# Serializes synchronous calls and the start of the reader, serializes sending
+		self.__lock__ = Lock()
+		self.__send_lock__ = Lock()
+
+		# Reader thread, started with first asynchronous call
+		self.__reader__ = None
+
+		# Guards futures in flight and the error of a lost connection
+		self.__futures_lock__ = Lock()
+		self.__broken__ = None
+
+		# Set by owner, likely None
+		self.log = None
+
+		# Pipe or other pre-established connection
+		if connection is not None:
+			self.client = connection
+			return
 
 		# Start new client on top of socket
 		self.client = Client(socket_path, authkey = authkey.encode('utf-8'))
 
+		# Requests are small and latency-bound
+		if isinstance(socket_path, tuple):
+			set_tcp_nodelay(self.client)
+
+
+	def call_raw(self, frame):
+
+		# Send binary frame to server, return binary answer or raise
+		return self.__request__(frame)
+
+
+	def call_raw_async(self, frame):
+
+		# Send binary frame to server, return future
+		return self.__request_async__(frame)
+
 
 	def __getattr__(self, name):
 
-		# Handler routine in __getattr__ namespace
-		def do_rpc(*args, **kwargs):
+		return self.get_function(name)
 
-			# Send request to server
-			self.client.send((name, args, kwargs))
-			# Receive answer
-			result = self.client.recv()
 
-			# If the answer is an error, raise it
-			if isinstance(result, Exception):
-				raise result
+	def get_function(self, name_or_handle):
 
-			# Return answer
-			return result
+		# Handler routine, addressing server function by name (str) or by handle (int)
+		def do_rpc(*args, **kwargs):
+
+			# Send request to server, receive and return answer
+			return self.__request__(pickle.dumps((name_or_handle, args, kwargs)))
 
 		# Return pointer to handler routine
 		return do_rpc
 
 
+	def get_function_async(self, name_or_handle):
+
+		# Handler routine, returning a future instead of the answer
+		def do_rpc_async(*args, **kwargs):
+
+			# Send request to server, return future
+			return self.__request_async__(pickle.dumps((name_or_handle, args, kwargs)))
+
+		# Return pointer to handler routine
+		return do_rpc_async
+
+
+	def get_function_broadcast(self, name_or_handle):
+
+		# There is only one server behind this client
+		return self.get_function(name_or_handle)
+
+
+	def get_function_sticky(self, name_or_handle):
+
+		# There is only one server behind this client
+		return self.get_function(name_or_handle)
+
+
+	def get_pinned(self, index):
+
+		# There is only one server behind this client
+		return self
+
+
+	def __decode_response__(self, payload):
+
+		# Binary answer, decoded by caller
+		if is_wire_frame(payload):
+			return bytes(payload)
+
+		# Pickled answer
+		return pickle.loads(payload)
+
+
+	def __read_response__(self):
+
+		# Receive answer, split off request ID
+		message = self.client.recv_bytes()
+		return RPC_REQUEST_ID.unpack_from(message)[0], memoryview(message)[RPC_REQUEST_ID.size:]
+
+
+	def __read_responses__(self):
+
+		try:
+
+			while True:
+
+				# Receive answer and find its future
+				request_id, payload = self.__read_response__()
+				with self.__futures_lock__:
+					future = self.__futures__.pop(request_id, None)
+
+				# Unknown or duplicate ID, nobody is waiting for this answer
+				if future is None:
+					if self.log is not None:
+						self.log.err('[mp-client] Dropping response with unknown request ID %d.', request_id)
+					continue
+
+				# Resolve future
+				try:
+					result = self.__decode_response__(payload)
+				except Exception as e:
+					future.set_exception(e)
+					continue
+				if isinstance(result, Exception):
+					future.set_exception(result)
+				else:
+					future.set_result(result)
+
+		except Exception as e:
+
+			# Connection is gone (or reader failed), fail everything in flight and all later requests
+			with self.__futures_lock__:
+				self.__broken__ = 'connection to server lost: %s' % (str(e) or e.__class__.__name__)
+				future_list = list(self.__futures__.values())
+				self.__futures__.clear()
+			for future in future_list:
+				future.set_exception(EOFError(self.__broken__))
+
+
+	def __request__(self, payload):
+
+		# Reader thread has died with the connection
+		if self.__broken__ is not None:
+			raise EOFError(self.__broken__)
+
+		# Another thread is waiting for its response, go through reader thread so both calls overlap
+		if not self.__lock__.acquire(False):
+			return self.__request_async__(payload).result()
+
+		try:
+
+			# No reader thread, send and receive directly
+			if self.__reader__ is None:
+
+				request_id = next(self.__request_ids__) & 0xFFFFFFFF
+				self.client.send_bytes(RPC_REQUEST_ID.pack(request_id) + payload)
+				response_id, response = self.__read_response__()
+				if response_id != request_id:
+					# Stream is out of sync, no later response can be trusted either
+					with self.__futures_lock__:
+						self.__broken__ = 'response %d does not match request %d' % (response_id, request_id)
+					raise ConnectionError(self.__broken__)
+				result = self.__decode_response__(response)
+
+				# If the answer is an error, raise it
+				if isinstance(result, Exception):
+					raise result
+
+				# Return answer
+				return result
+
+		finally:
+
+			self.__lock__.release()
+
+		# Reader thread is running, wait for future
+		return self.__request_async__(payload).result()
+
+
+	def __request_async__(self, payload):
+
+		# Start reader thread on first asynchronous request
+		if self.__reader__ is None:
+			with self.__lock__:
+				if self.__reader__ is None:
+					self.__reader__ = Thread(target = self.__read_responses__)
+					self.__reader__.daemon = True
+					self.__reader__.start()
+
+		# Register future before request is out, unless reader thread has died with the connection
+		request_id = next(self.__request_ids__) & 0xFFFFFFFF
+		future = Future()
+		with self.__futures_lock__:
+			if self.__broken__ is not None:
+				raise EOFError(self.__broken__)
+			self.__futures__[request_id] = future
+
+		# Send request
+		try:
+			with self.__send_lock__:
+				self.client.send_bytes(RPC_REQUEST_ID.pack(request_id) + payload)
+		except:
+			with self.__futures_lock__:
+				self.__futures__.pop(request_id, None)
+			raise
+
+		return future
+
+
+class mp_client_pool_class:
+	"""
+	Stands in for mp_client_class with several servers (worker processes) behind it.
+	Calls are dispatched to one worker, either round-robin or to the worker with the
+	fewest calls in flight. Configuration is broadcast to all workers one after
+	another, so server-side registrations happen in the same order and handles
+	are identical on every worker.
+	"""
+
+
+	def __init__(self, client_list, dispatch = 'least_loaded'):
+
+		if dispatch not in ('least_loaded', 'round_robin'):
+			raise ValueError('unsupported dispatch "%s", expected "least_loaded" or "round_robin"' % dispatch)
+
+		self.__client_list__ = client_list
+		self.__least_loaded__ = dispatch == 'least_loaded'
+
+		# Calls in flight per worker and next worker for round-robin
+		self.__load_list__ = [0] * len(client_list)
+		self.__next_index__ = itertools.count()
+		self.__load_lock__ = Lock()
+
+		# Serializes broadcasts
+		self.__broadcast_lock__ = Lock()
+
+		# Worker, which served the last call of the current thread
+		self.__local__ = local()
+
+
+	def call_raw(self, frame, index = None):
+
+		index = self.__acquire_worker__(index)
+		try:
+			return self.__client_list__[index].call_raw(frame)
+		finally:
+			self.__release_worker__(index)
+
+
+	def call_raw_async(self, frame, index = None):
+
+		index = self.__acquire_worker__(index)
+		try:
+			future = self.__client_list__[index].call_raw_async(frame)
+		except:
+			self.__release_worker__(index)
+			raise
+		future.add_done_callback(lambda _: self.__release_worker__(index))
+		return future
+
+
+	def __getattr__(self, name):
+
+		return self.get_function(name)
+
+
+	def get_function(self, name_or_handle, index = None):
+
+		return self.__dispatch__(
+			[client.get_function(name_or_handle) for client in self.__client_list__], index
+			)
+
+
+	def get_function_async(self, name_or_handle, index = None):
+
+		return self.__dispatch_async__(
+			[client.get_function_async(name_or_handle) for client in self.__client_list__], index
+			)
+
+
+	def get_function_broadcast(self, name_or_handle):
+
+		function_list = [client.get_function(name_or_handle) for client in self.__client_list__]
+
+		# Handler routine, calling every worker and returning the (common) answer
+		def do_rpc_broadcast(*args, **kwargs):
+
+			with self.__broadcast_lock__:
+				result_list = [function(*args, **kwargs) for function in function_list]
+
+			# Workers must not diverge, otherwise handles would be mixed up
+			if any(result != result_list[0] for result in result_list[1:]):
+				raise SystemError('workers returned different results for "%s"' % str(name_or_handle))
+
+			return result_list[0]
+
+		return do_rpc_broadcast
+
+
+	def get_function_sticky(self, name_or_handle):
+
+		function_list = [client.get_function(name_or_handle) for client in self.__client_list__]
+
+		# Handler routine, calling the worker which served the last call of this thread (e.g. for GetLastError)
+		def do_rpc_sticky(*args, **kwargs):
+
+			return function_list[getattr(self.__local__, 'index', 0)](*args, **kwargs)
+
+		return do_rpc_sticky
+
+
+	def get_pinned(self, index):
+
+		return mp_client_pinned_class(self, index % len(self.__client_list__))
+
+
+	def __acquire_worker__(self, index):
+
+		with self.__load_lock__:
+
+			# Pick next worker unless pinned
+			if index is None and not self.__least_loaded__:
+				index = next(self.__next_index__) % len(self.__client_list__)
+
+			# Pick worker with fewest calls in flight, prefer the one this thread used last (it is warm)
+			elif index is None:
+				start = getattr(self.__local__, 'index', 0)
+				index = start
+				for offset in range(1, len(self.__client_list__)):
+					candidate = (start + offset) % len(self.__client_list__)
+					if self.__load_list__[candidate] < self.__load_list__[index]:
+						index = candidate
+
+			self.__load_list__[index] += 1
+
+		self.__local__.index = index
+		return index
+
+
+	def __release_worker__(self, index):
+
+		with self.__load_lock__:
+			self.__load_list__[index] -= 1
+
+
+	def __dispatch__(self, function_list, pinned_index):
+
+		# Handler routine, calling one worker
+		def do_rpc_dispatch(*args, **kwargs):
+
+			index = self.__acquire_worker__(pinned_index)
+			try:
+				return function_list[index](*args, **kwargs)
+			finally:
+				self.__release_worker__(index)
+
+		return do_rpc_dispatch
+
+
+	def __dispatch_async__(self, function_list, pinned_index):
+
+		# Handler routine, calling one worker and returning a future
+		def do_rpc_dispatch_async(*args, **kwargs):
+
+			index = self.__acquire_worker__(pinned_index)
+			try:
+				future = function_list[index](*args, **kwargs)
+			except:
+				self.__release_worker__(index)
+				raise
+			future.add_done_callback(lambda _: self.__release_worker__(index))
+			return future
+
+		return do_rpc_dispatch_async
+
+
+class mp_client_pinned_class:
+	"""
+	View on mp_client_pool_class, which sends all calls to one worker
+	"""
+
+
+	def __init__(self, pool, index):
+
+		self.__pool__ = pool
+		self.__index__ = index
+
+
+	def call_raw(self, frame):
+
+		return self.__pool__.call_raw(frame, self.__index__)
+
+
+	def call_raw_async(self, frame):
+
+		return self.__pool__.call_raw_async(frame, self.__index__)
+
+
+	def __getattr__(self, name):
+
+		return self.get_function(name)
+
+
+	def get_function(self, name_or_handle):
+
+		return self.__pool__.get_function(name_or_handle, self.__index__)
+
+
+	def get_function_async(self, name_or_handle):
+
+		return self.__pool__.get_function_async(name_or_handle, self.__index__)
+
+
+	def get_function_broadcast(self, name_or_handle):
+
+		return self.__pool__.get_function_broadcast(name_or_handle)
+
+
+	def get_function_sticky(self, name_or_handle):
+
+		return self.__pool__.get_function_sticky(name_or_handle)
+
+
+	def get_pinned(self, index):
+
+		return self
+
+
+class mp_pipe_connection_class:
+	"""
+	Minimal multiprocessing connection on top of a pair of pipe file descriptors,
+	using the same length-prefixed framing as multiprocessing.connection
+	"""
+
+
+	# Written once by the server before it starts serving the pipe
+	ANNOUNCEMENT = b'\x00ZUGBRUECKE-PIPE\x00'
+
+	# Length prefix of every message
+	HEADER = struct.Struct('!i')
+
+
+	def __init__(self, read_fd, write_fd):
+
+		self.read_fd = read_fd
+		self.write_fd = write_fd
+
+
+	def announce(self):
+
+		self.__write__(self.ANNOUNCEMENT)
+
+
+	def wait_for_announcement(self, timeout_after_seconds):
+
+		# Anything preceding the announcement (e.g. output of Wine itself) is dropped
+		started_waiting_at = time.time()
+		buffer = b''
+		while not buffer.endswith(self.ANNOUNCEMENT):
+			remaining = started_waiting_at + timeout_after_seconds - time.time()
+			if remaining <= 0 or not select.select([self.read_fd], [], [], remaining)[0]:
+				raise TimeoutError('no announcement from server on pipe')
+			chunk = os.read(self.read_fd, 1)
+			if len(chunk) == 0:
+				raise EOFError
+			buffer = (buffer + chunk)[-len(self.ANNOUNCEMENT):]
+
+
+	def close(self):
+
+		for fd in (self.read_fd, self.write_fd):
+			try:
+				os.close(fd)
+			except OSError:
+				pass
+
+
+	def fileno(self):
+
+		return self.read_fd
+
+
+	def recv(self):
+
+		return pickle.loads(self.recv_bytes())
+
+
+	def recv_bytes(self):
+
+		length = self.HEADER.unpack(self.__read__(self.HEADER.size))[0]
+		return self.__read__(length)
+
+
+	def send(self, obj):
+
+		self.send_bytes(pickle.dumps(obj))
+
+
+	def send_bytes(self, buf):
+
+		# Header and payload in one write
+		self.__write__(self.HEADER.pack(len(buf)) + buf)
+
+
+	def __read__(self, length):
+
+		chunk_list = []
+		while length > 0:
+			chunk = os.read(self.read_fd, length)
+			if len(chunk) == 0:
+				raise EOFError
+			chunk_list.append(chunk)
+			length -= len(chunk)
+		return b''.join(chunk_list)
+
+
+	def __write__(self, buf):
+
+		view = memoryview(buf)
+		while len(view) > 0:
+			view = view[os.write(self.write_fd, view):]
+
+
 class mp_server_handler_class:
 
 
-	def __init__(self):
+	def __init__(self, workers = 1):
+
+		# Requests are handled in order by the connection's thread or out of order by a pool of workers
+		if workers > 1:
+			self.__queue__ = Queue()
+			for _ in range(workers):
+				t = Thread(target = self.__work__)
+				t.daemon = True
+				t.start()
+		else:
+			self.__queue__ = None
+
+		# Registrations may come from several threads
+		self.__register_lock__ = Lock()
 
-		# cache for registered functions
+		# cache for registered functions, by name and by handle
 		self.__functions__ = {}
+		self.__functions_list__ = []
+
+		# cache for registered functions handling binary frames, indexed by id
+		self.__raw_functions__ = []
 
 		# Method for verifying server status
 		self.register_function(self.__get_handler_status__)
 
+		# Method for negotiating the wire format
+		self.register_function(self.__get_wire_version__)
+
 
 	def __get_handler_status__(self):
 
 		return True
 
 
+	def __get_wire_version__(self):
+
+		return WIRE_VERSION
+
+
+	def register_raw_function(self, function_pointer):
+
+		with self.__register_lock__:
+
+			# Register function in list
+			self.__raw_functions__.append(function_pointer)
+
+			# Return id of function, expected in frame headers
+			return len(self.__raw_functions__) - 1
+
+
 	def register_function(self, function_pointer, public_name = None):
 
 		# Is there a custom public name?
@@ -128,35 +733,78 @@ class mp_server_handler_class:
 		else:
 			function_name = function_pointer.__name__
 
-		# Register function in dict
-		self.__functions__[function_name] = function_pointer
+		with self.__register_lock__:
+
+			# Register function in dict and list
+			self.__functions__[function_name] = function_pointer
+			self.__functions_list__.append(function_pointer)
+
+			# Return handle of function
+			return len(self.__functions_list__) - 1
 
 
 	def handle_connection(self, connection_client):
 
+		# Responses of workers must not interleave
+		send_lock = Lock()
+
 		try:
 
 			while True:
 
 				# Receive the incomming message
-				function_name, args, kwargs = connection_client.recv()
+				message = connection_client.recv_bytes()
 
-				# Run the RPC and send a response
-				try:
-					r = self.__functions__[function_name](*args,**kwargs)
-					connection_client.send(r)
-				except Exception as e:
-					connection_client.send(e)
+				# Handle it right here or pass it to a worker
+				if self.__queue__ is None:
+					self.__handle_message__(connection_client, send_lock, message)
+				else:
+					self.__queue__.put((connection_client, send_lock, message))
 
-		except EOFError:
+		except (EOFError, OSError):
 
+			# Client has gone away (possibly without saying goodbye)
 			pass
 
 
+	def __work__(self):
+
+		# Worker thread, handles messages from all connections
+		while True:
+			self.__handle_message__(*self.__queue__.get())
+
+
+	def __handle_message__(self, connection_client, send_lock, message):
+
+		# Split off request ID, which goes back with the response
+		request_id = bytes(message[:RPC_REQUEST_ID.size])
+		payload = memoryview(message)[RPC_REQUEST_ID.size:]
+
+		# Run the RPC and get a response, either a binary frame or a pickled object
+		try:
+			if is_wire_frame(payload):
+				r = self.__raw_functions__[decode_wire_id(payload)](payload)
+				if not isinstance(r, bytes):
+					r = pickle.dumps(r)
+			else:
+				function_name, args, kwargs = pickle.loads(payload)
+				if type(function_name) is int:
+					r = self.__functions_list__[function_name](*args,**kwargs)
+				else:
+					r = self.__functions__[function_name](*args,**kwargs)
+				r = pickle.dumps(r)
+		except Exception as e:
+			r = pickle.dumps(e)
+
+		# Send response
+		with send_lock:
+			connection_client.send_bytes(request_id + r)
+
+
 class mp_server_class():
 
 
-	def __init__(self, socket_path, authkey, log = None, terminate_function = None):
+	def __init__(self, socket_path, authkey, log = None, terminate_function = None, workers = 1):
 
 		# Set log, likely None
 		self.log = log
@@ -174,11 +822,19 @@ class mp_server_class():
 		# Set terminate func - to be called on termination. Likely None.
 		self.terminate_function = terminate_function
 
+		# Called once the last client has disconnected while server is up. Likely None.
+		self.disconnect_function = None
+
+		# Number of connected clients
+		self.connection_count = 0
+		self.__connection_lock__ = Lock()
+
 		# Set up handler
-		self.handler = mp_server_handler_class()
+		self.handler = mp_server_handler_class(workers = workers)
 
 		# Directly pass functions into handler
 		self.register_function = self.handler.register_function
+		self.register_raw_function = self.handler.register_raw_function
 
 		# Status log
 		if self.log is not None:
@@ -206,10 +862,30 @@ class mp_server_class():
 				self.log.out('[mp-server] TERMINATED.')
 
 
+	def release_socket(self):
+
+		# Only after termination and only if the loop waits for a client on a TCP socket
+		if self.up or not hasattr(self, 'server') or not isinstance(self.socket_path, tuple):
+			return
+
+		# Wake up the loop, so it can end and close the socket
+		try:
+			socket.create_connection(self.socket_path).close()
+		except OSError:
+			pass
+
+
+	def listen(self):
+
+		# Open socket, clients can connect from now on (they are queued until accepted)
+		if not hasattr(self, 'server'):
+			self.server = Listener(self.socket_path, authkey = self.authkey)
+
+
 	def serve_forever(self):
 
 		# Open socket
-		self.server = Listener(self.socket_path, authkey = self.authkey)
+		self.listen()
 
 		# Server while server is up
 		while self.up:
@@ -219,19 +895,61 @@ class mp_server_class():
 				# Accept new client
 				client = self.server.accept()
 
+				# Responses are small and latency-bound
+				if isinstance(self.socket_path, tuple):
+					set_tcp_nodelay(client)
+
 				# Handle incomming message in new thread
-				t = Thread(target = self.handler.handle_connection, args = (client,))
+				t = Thread(target = self.__handle_connection__, args = (client,))
 				t.daemon = True
 				t.start()
 
 			except Exception:
 
+				# Server was terminated while waiting
+				if not self.up:
+					break
+
 				# TODO just print traceback. Better solution?
 				traceback.print_exc()
 
+		# Release socket
+		self.server.close()
+
+
+	def __handle_connection__(self, client):
+
+		with self.__connection_lock__:
+			self.connection_count += 1
+
+		try:
+			self.handler.handle_connection(client)
+		finally:
+			with self.__connection_lock__:
+				self.connection_count -= 1
+				disconnected = self.connection_count == 0
+			# Last client gone without terminating the server, e.g. because it crashed
+			if disconnected and self.up and self.disconnect_function is not None:
+				self.disconnect_function()
+
+
+	def serve_pipe_in_thread(self, read_fd, write_fd, daemon = True):
+
+		# Wrap pipe pair and tell the client that the server is there
+		connection = mp_pipe_connection_class(read_fd, write_fd)
+		connection.announce()
+
+		# Handle incomming messages in their own thread
+		t = Thread(target = self.handler.handle_connection, args = (connection,))
+		t.daemon = daemon
+		t.start()
+
 
 	def server_forever_in_thread(self, daemon = True):
 
+		# Open socket right here, so the server is reachable once this returns
+		self.listen()
+
 		# Start the server in its own thread
 		t = Thread(target = self.serve_forever)
 		t.daemon = daemon
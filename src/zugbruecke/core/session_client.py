@@ -31,15 +31,27 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+import asyncio
 import atexit
+import ctypes
 from ctypes import (
 	_FUNCFLAG_CDECL,
 	_FUNCFLAG_USE_ERRNO,
 	_FUNCFLAG_USE_LASTERROR
 	)
+import fcntl
+import json
 import os
+import select
 import signal
+from threading import (
+	Condition,
+	Lock,
+	RLock,
+	Thread
+	)
 import time
+import traceback
 
 from .const import _FUNCFLAG_STDCALL
 from .config import get_module_config
@@ -51,10 +63,20 @@ from .lib import (
 	get_location_of_file
 	)
 from .log import log_class
+from .remote_buffer import remote_buffer_class
+from .signature_cache import signature_cache_class
+from .signature_manifest import load_signature_manifest
 from .rpc import (
+	mp_client_pipe_connect,
+	mp_client_pool_class,
 	mp_client_safe_connect,
 	mp_server_class
 	)
+from .shm import (
+	get_shm_path,
+	shm_arena_class
+	)
+from .wire import WIRE_VERSION
 from .wineenv import (
 	create_wine_prefix,
 	setup_wine_python,
@@ -80,8 +102,8 @@ class session_client_class():
 		if self.stage == 1:
 			self.__init_stage_2__()
 
-		# Ask the server
-		return self.rpc_client.ctypes_FormatError(code)
+		# Ask the worker, which served the last call of this thread
+		return self.rpc_client.get_function_sticky('ctypes_FormatError')(code)
 
 
 	def ctypes_get_last_error(self):
@@ -90,8 +112,8 @@ class session_client_class():
 		if self.stage == 1:
 			self.__init_stage_2__()
 
-		# Ask the server
-		return self.rpc_client.ctypes_get_last_error()
+		# Ask the worker, which served the last call of this thread
+		return self.rpc_client.get_function_sticky('ctypes_get_last_error')()
 
 
 	def ctypes_GetLastError(self):
@@ -100,8 +122,8 @@ class session_client_class():
 		if self.stage == 1:
 			self.__init_stage_2__()
 
-		# Ask the server
-		return self.rpc_client.ctypes_GetLastError()
+		# Ask the worker, which served the last call of this thread
+		return self.rpc_client.get_function_sticky('ctypes_GetLastError')()
 
 
 	def ctypes_set_last_error(self, value):
@@ -110,8 +132,8 @@ class session_client_class():
 		if self.stage == 1:
 			self.__init_stage_2__()
 
-		# Ask the server
-		return self.rpc_client.ctypes_set_last_error(value)
+		# Ask the worker, which served the last call of this thread
+		return self.rpc_client.get_function_sticky('ctypes_set_last_error')(value)
 
 
 	def ctypes_WinError(self, code = None, descr = None):
@@ -120,8 +142,8 @@ class session_client_class():
 		if self.stage == 1:
 			self.__init_stage_2__()
 
-		# Ask the server
-		return self.rpc_client.ctypes_WinError(code, descr)
+		# Ask the worker, which served the last call of this thread
+		return self.rpc_client.get_function_sticky('ctypes_WinError')(code, descr)
 
 
 	def ctypes_CFUNCTYPE(self, restype, *argtypes, **kw):
@@ -160,7 +182,28 @@ class session_client_class():
 		return self.data.generate_callback_decorator(flags, restype, *argtypes)
 
 
-	def load_library(self, dll_name, dll_type, dll_param = {}):
+	def load_library(self, dll_name, dll_type, dll_param = {}, signatures = None):
+		"""
+		Returns DLL object. Routines can be bound in bulk with signatures, a dict or the
+		path to a JSON or TOML file mapping routine names to their argtypes, restype,
+		memsync and argdirs.
+		"""
+
+		# Parse manifest before anything is loaded
+		manifest_dict = load_signature_manifest(signatures) if signatures is not None else None
+
+		# Threads may load libraries concurrently, only one of them starts stage 2 or attaches
+		with self.__load_lock__:
+			dll = self.__load_library__(dll_name, dll_type, dll_param)
+
+		# Register and configure routines in one round trip
+		if manifest_dict is not None:
+			dll.__bind_signatures__(manifest_dict)
+
+		return dll
+
+
+	def __load_library__(self, dll_name, dll_type, dll_param):
 
 		# If in stage 1, fire up stage 2
 		if self.stage == 1:
@@ -187,14 +230,22 @@ class session_client_class():
 			dll_param['use_last_error'] = False
 
 		# Log status
-		self.log.out('[session-client] Attaching to DLL file "%s" with calling convention "%s" ...' % (dll_name, dll_type))
+		self.log.out('[session-client] Attaching to DLL file "%s" with calling convention "%s" ...', dll_name, dll_type)
+
+		# Load DLL and configure its routines known from earlier sessions in one request
+		if self.signature_cache is not None:
+			self.__preload_signatures__(dll_name, dll_type, dll_param)
+
+		# DLL might have been preloaded
+		hash_id = self.signature_cache.get_dll(dll_name, dll_type, dll_param) if self.signature_cache is not None else None
 
 		try:
 
 			# Tell wine about the dll and its type
-			hash_id = self.rpc_client.load_library(
-				dll_name, dll_type, dll_param
-				)
+			if hash_id is None:
+				hash_id = self.rpc_client.get_function_broadcast('load_library')(
+					dll_name, dll_type, dll_param
+					)
 
 		except OSError as e:
 
@@ -206,7 +257,7 @@ class session_client_class():
 
 		# Fire up new dll object
 		self.dll_dict[dll_name] = dll_client_class(
-			self, dll_name, dll_type, hash_id
+			self, dll_name, dll_type, dll_param, hash_id, self.__get_rpc_client_for_dll__(dll_name)
 			)
 
 		# Log status
@@ -216,6 +267,49 @@ class session_client_class():
 		return self.dll_dict[dll_name]
 
 
+	def load_library_async(self, dll_name, dll_type, dll_param = {}, signatures = None):
+		"""
+		Awaitable flavour of load_library, runs it in the event loop's default executor
+		(it may start the Wine side, which takes a while)
+		"""
+
+		return asyncio.get_event_loop().run_in_executor(
+			None, self.load_library, dll_name, dll_type, dll_param, signatures
+			)
+
+
+	def pin(self, local):
+		"""
+		Returns a remote buffer mirroring a ctypes object, pushes its contents once
+		"""
+
+		remote_buffer = self.__remote_buffer__(local)
+		remote_buffer.push()
+
+		return remote_buffer
+
+
+	def remote_buffer(self, size):
+		"""
+		Returns a remote buffer of size bytes, mirrored by a local array of c_ubyte
+		"""
+
+		return self.__remote_buffer__((ctypes.c_ubyte * size)())
+
+
+	def __remote_buffer__(self, local):
+
+		# If in stage 1, fire up stage 2
+		if self.stage == 1:
+			self.__init_stage_2__()
+
+		# Memory lives in one Wine-Python process, calls might go to any of them
+		if self.p['workers'] > 1:
+			raise ValueError('remote buffers require a session with one worker')
+
+		return remote_buffer_class(self, local)
+
+
 	def path_unix_to_wine(self, in_path):
 
 		# If in stage 1, fire up stage 2
@@ -239,11 +333,18 @@ class session_client_class():
 	def set_parameter(self, parameter):
 
 		self.p.update(parameter)
-		self.rpc_client.set_parameter(parameter)
+		self.rpc_client.get_function_broadcast('set_parameter')(parameter)
 
 
 	def terminate(self):
 
+		# Stage 2 might still be starting in the background
+		with self.__stage_lock__:
+			self.__terminate__()
+
+
+	def __terminate__(self):
+
 		# Run only if session is still up
 		if self.up:
 
@@ -254,13 +355,22 @@ class session_client_class():
 			if self.stage == 2:
 
 				# Wait for server to appear
-				self.__wait_for_server_status_change__(target_status = False)
+				self.__wait_for_server_status_change__(target_status = True)
+
+				# Store definitions of new routines for subsequent sessions
+				if self.signature_cache is not None:
+					self.__save_signatures__()
 
-				# Tell server via message to terminate
-				self.rpc_client.terminate()
+				# Tell servers via message to terminate
+				self.rpc_client.get_function_broadcast('terminate')()
 
-				# Destruct interpreter session
-				self.interpreter_session.terminate()
+				# Destruct interpreter sessions
+				for interpreter_session in self.interpreter_session_list:
+					interpreter_session.terminate()
+
+				# Remove shared memory arena
+				if self.data.arena is not None:
+					self.data.arena.terminate()
 
 			# Terminate callback server
 			self.rpc_server.terminate()
@@ -291,8 +401,8 @@ class session_client_class():
 
 		# Log status
 		self.log.out('[session-client] STARTING (STAGE 1) ...')
-		self.log.out('[session-client] Configured Wine-Python version is %s for %s.' % (self.p['version'], self.p['arch']))
-		self.log.out('[session-client] Log socket port: %d.' % self.p['port_socket_unix'])
+		self.log.out('[session-client] Configured Wine-Python version is %s for %s.', self.p['version'], self.p['arch'])
+		self.log.out('[session-client] Log socket port: %d.', self.p['port_socket_unix'])
 
 		# Store current working directory
 		self.dir_cwd = os.getcwd()
@@ -302,15 +412,45 @@ class session_client_class():
 
 		# Set up a dict for loaded dlls
 		self.dll_dict = {}
+		self.__load_lock__ = Lock()
+
+		# Binary wire format is negotiated in stage 2
+		self.wire_binary = False
+
+		# Definitions of routines from earlier sessions
+		if self.p['signature_cache'] is False:
+			self.signature_cache = None
+		else:
+			self.signature_cache = signature_cache_class(
+				os.path.join(self.p['dir'], 'signatures.json') if self.p['signature_cache'] is True
+				else self.p['signature_cache'],
+				self.log
+				)
 
 		# Mark session as up
 		self.up = True
 
-		# Marking server component as down
+		# Marking server component as down, changes are signaled by servers
 		self.server_up = False
+		self.servers_up = 0
+		self.__status_condition__ = Condition()
 
-		# Set current stage to 1
+		# Check number of workers (Wine-Python processes)
+		if self.p['workers'] < 1:
+			raise ValueError('workers must be at least 1, got %d' % self.p['workers'])
+		if self.p['daemon'] and self.p['workers'] > 1:
+			raise ValueError('a session attached to a daemon has exactly one worker')
+
+		# Pinned DLLs are matched by lowercase file name
+		self.p['workers_pinned'] = [os.path.basename(name).lower() for name in self.p['workers_pinned']]
+		self.pinned_count = 0
+
+		# Set current stage to 1, stage 2 is started by one thread only
 		self.stage = 1
+		self.__stage_lock__ = RLock()
+
+		# Durations of startup steps in seconds
+		self.startup_timings = {}
 
 		# Register session destructur
 		atexit.register(self.terminate)
@@ -324,30 +464,89 @@ class session_client_class():
 		if force_stage_2:
 			self.__init_stage_2__()
 
+		# ... or in the background, so it is (almost) ready once it is needed
+		elif self.p['prewarm']:
+			t = Thread(target = self.__prewarm__, name = 'prewarm')
+			t.daemon = True
+			t.start()
+
 
 	def __init_stage_2__(self):
 
+		with self.__stage_lock__:
+
+			# Another thread (e.g. prewarm) might have done it in the meantime
+			if self.stage == 2:
+				return
+
+			started_at = time.time()
+			self.__start_stage_2__()
+			self.startup_timings['stage_2'] = time.time() - started_at
+
+
+	def __prewarm__(self):
+
+		try:
+			self.__init_stage_2__()
+		except Exception:
+			# Stage 2 is tried again (and fails loudly) on first use
+			self.log.err(traceback.format_exc())
+
+
+	def __start_stage_2__(self):
+
 		# Log status
 		self.log.out('[session-client] STARTING (STAGE 2) ...')
 
-		# Install wine-python
-		setup_wine_python(self.p['arch'], self.p['version'], self.p['dir'])
-
-		# Initialize Wine session
+		# Both steps below create files in here
+		os.makedirs(self.p['dir'], exist_ok = True)
+
+		# Install wine-python in the background, might include a download
+		setup_error_list = []
+		def setup():
+			try:
+				self.__timed__(
+					'setup_wine_python', setup_wine_python, self.p['arch'], self.p['version'], self.p['dir'],
+					cache_dir = self.p['cache_dir'], trust_on_first_use = self.p['cache_trust_on_first_use']
+					)
+			except Exception as e:
+				setup_error_list.append(e)
+		setup_thread = Thread(target = setup)
+		setup_thread.start()
+
+		# Meanwhile, initialize Wine session
 		self.dir_wineprefix = set_wine_env(self.p['dir'], self.p['arch'])
-		create_wine_prefix(self.dir_wineprefix)
+		self.__timed__(
+			'create_wine_prefix', create_wine_prefix, self.dir_wineprefix, self.p['arch'],
+			cache_dir = self.p['cache_dir'] if self.p['prefix_template'] else None,
+			clone = self.p['prefix_clone']
+			)
 
-		# Prepare python command for ctypes server or interpreter
-		self.__prepare_python_command__()
+		# Wine-Python is required from here on
+		setup_thread.join()
+		if len(setup_error_list) > 0:
+			raise setup_error_list[0]
 
-		# Initialize interpreter session
-		self.interpreter_session = interpreter_session_class(self.id, self.p, self.log)
+		# Attach to shared daemon or initialize interpreter sessions, one per worker, each with its own ctypes server command
+		if self.p['daemon']:
+			self.__timed__('attach_to_daemon', self.__attach_to_daemon__)
+		else:
+			self.interpreter_session_list = self.__timed__('start_interpreters', lambda: [
+				interpreter_session_class(self.id, self.__prepare_python_command__(), self.log)
+				for _ in range(self.p['workers'])
+				])
 
 		# Wait for server to appear
-		self.__wait_for_server_status_change__(target_status = True)
+		self.__timed__('wait_for_server', self.__wait_for_server_status_change__, target_status = True)
 
 		# Try to connect to Wine side
-		self.__start_rpc_client__()
+		self.__timed__('start_rpc_client', self.__start_rpc_client__)
+
+		# Negotiate wire format
+		self.__negotiate_wire_format__()
+
+		# Share memory arena for memsync payloads with Wine side
+		self.__timed__('start_shm_arena', self.__start_shm_arena__)
 
 		# Set current stage to 2
 		self.stage = 2
@@ -356,18 +555,250 @@ class session_client_class():
 		self.log.out('[session-client] STARTED (STAGE 2).')
 
 
+	def __timed__(self, step, function, *args, **kwargs):
+
+		started_at = time.time()
+
+		try:
+			return function(*args, **kwargs)
+		finally:
+			self.startup_timings[step] = time.time() - started_at
+
+
+	def __preload_signatures__(self, dll_name, dll_type, dll_param):
+
+		preload_d = self.signature_cache.get_preload(dll_name, dll_type, dll_param)
+		if preload_d is None:
+			return
+
+		self.signature_cache.set_preloaded(self.rpc_client.get_function_broadcast('preload_signatures')(
+			[preload_d]
+			))
+
+
+	def __save_signatures__(self):
+
+		try:
+			self.signature_cache.save(
+				lambda dll_name: self.rpc_client.get_function(self.dll_dict[dll_name].hash_id + '_fingerprint')()
+				)
+		except Exception:
+			# Must not prevent termination
+			self.log.err(traceback.format_exc())
+
+
+	def __negotiate_wire_format__(self):
+
+		# Binary frames only if requested and if both sides speak the same version
+		self.wire_binary = (
+			self.p['wire'] == 'binary' and
+			self.rpc_client.get_function_broadcast('__get_wire_version__')() == WIRE_VERSION
+			)
+
+		# Log status
+		self.log.out('[session-client] Wire format: %s.', 'binary' if self.wire_binary else 'pickle')
+
+
+	def __start_shm_arena__(self):
+
+		# Arena disabled?
+		if self.p['shm_size'] <= 0:
+			return
+
+		# Memory-backed file system required
+		path = get_shm_path(self.id)
+		if path is None:
+			self.log.out('[session-client] No memory-backed file system for shared memory arena, using sockets only.')
+			return
+
+		# Create and map file
+		try:
+			arena = shm_arena_class(
+				path, self.p['shm_size'], owner = True, threshold = self.p['shm_threshold']
+				)
+		except (OSError, ValueError):
+			self.log.out('[session-client] Shared memory arena could not be created, using sockets only.')
+			return
+
+		# Wine side must be able to map it as well
+		if not self.rpc_client.get_function_broadcast('attach_shm')(arena.path, arena.size):
+			self.log.out('[session-client] Shared memory arena could not be attached, using sockets only.')
+			arena.terminate()
+			return
+
+		# Both sides have mapped the file, it is not needed any longer
+		arena.unlink()
+
+		# Hand arena to data handling
+		self.data.arena = arena
+
+		# Log status
+		self.log.out('[session-client] Shared memory arena: %s (%d bytes).', arena.path, arena.size)
+
+
+	def __attach_to_daemon__(self):
+
+		# Daemon is not owned by this session, there are no interpreters to terminate
+		self.interpreter_session_list = []
+
+		# Daemons are identified by ID, Wine-Python architecture and version
+		state_path = os.path.join(self.p['dir'], 'daemon_%s-python%s_%s.json' % (
+			self.p['arch'], self.p['version'], self.p['daemon_id']
+			))
+		os.makedirs(self.p['dir'], exist_ok = True)
+
+		# Only one process at a time looks for or starts the daemon
+		with open(state_path + '.lock', 'w') as f:
+			fcntl.flock(f, fcntl.LOCK_EX)
+
+			# Daemon might just be exiting, start a new one then
+			for daemon_client in (self.__connect_to_daemon__(state_path), None):
+				if daemon_client is None:
+					daemon_client = self.__start_daemon__(state_path)
+				try:
+					self.daemon_port = daemon_client.attach_session({
+						'id': self.id,
+						'port_socket_unix': self.p['port_socket_unix'],
+						'rpc_workers': self.p['rpc_workers'],
+						'log_level': self.p['log_level'],
+						'log_write': self.p['log_write']
+						})
+					break
+				except (EOFError, OSError):
+					continue
+				finally:
+					daemon_client.client.close()
+			else:
+				raise OSError('could not attach to daemon "%s"' % self.p['daemon_id'])
+
+		# Log status
+		self.log.out('[session-client] Attached to daemon "%s", session server on port %d.',
+			self.p['daemon_id'], self.daemon_port
+			)
+
+
+	def __connect_to_daemon__(self, state_path):
+
+		# Is there a daemon?
+		if not os.path.isfile(state_path):
+			return None
+		with open(state_path, 'r') as f:
+			state_dict = json.loads(f.read())
+
+		# State files of older daemons do not carry a key
+		if 'authkey' not in state_dict:
+			return None
+		self.daemon_authkey = state_dict['authkey']
+
+		# Is it (still) alive? Only try once.
+		try:
+			return mp_client_safe_connect(
+				('localhost', state_dict['port']), self.daemon_authkey, timeout_after_seconds = 0
+				)
+		except Exception:
+			return None
+
+
+	def __start_daemon__(self, state_path):
+
+		# Log status
+		self.log.out('[session-client] Starting daemon "%s" ...', self.p['daemon_id'])
+
+		# Fire up Wine-Python, which outlives this session
+		p = self.__prepare_python_command__(daemon = True)
+		interpreter_session = interpreter_session_class(self.id, p, self.log, detach = True)
+
+		# Daemon writes its key as a line to its standard output once it listens
+		stdout = interpreter_session.proc_winepython.stdout
+		line = stdout.readline().strip() if len(select.select([stdout], [], [], 30)[0]) > 0 else b''
+		stdout.close()
+		if line == b'':
+			raise OSError('daemon "%s" did not start' % self.p['daemon_id'])
+		self.daemon_authkey = line.decode('ascii')
+
+		# Connect to daemon
+		daemon_client = mp_client_safe_connect(
+			('localhost', p['port_socket_wine']), self.daemon_authkey, timeout_after_seconds = 0
+			)
+
+		# Tell other processes of this user where to find it
+		fd = os.open(state_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+		os.fchmod(fd, 0o600) # File might be left behind by an older daemon
+		with open(fd, 'w') as f:
+			f.write(json.dumps({
+				'port': p['port_socket_wine'],
+				'pid': interpreter_session.proc_winepython.pid,
+				'authkey': self.daemon_authkey
+				}))
+
+		# Log status
+		self.log.out('[session-client] ... started on port %d.', p['port_socket_wine'])
+
+		return daemon_client
+
+
+	def __get_rpc_client_for_dll__(self, dll_name):
+
+		# Calls into stateful DLLs always go to the same worker
+		if os.path.basename(dll_name).lower() not in self.p['workers_pinned']:
+			return self.rpc_client
+
+		# Spread pinned DLLs across workers
+		rpc_client = self.rpc_client.get_pinned(self.pinned_count)
+		self.pinned_count += 1
+
+		return rpc_client
+
+
 	def __set_server_status__(self, status):
 
-		# Interface for session server through RPC
-		self.server_up = status
+		# Interface for session servers through RPC, all workers must be up
+		with self.__status_condition__:
+			self.servers_up += 1 if status else -1
+			self.server_up = self.servers_up == self.p['workers']
+			self.__status_condition__.notify_all()
 
 
 	def __start_rpc_client__(self):
 
-		# Fire up xmlrpc client
-		self.rpc_client = mp_client_safe_connect(
-			('localhost', self.p['port_socket_wine']),
-			'zugbruecke_wine'
+		# Session server in daemon, listening since it was attached
+		if self.p['daemon']:
+			self.rpc_client = mp_client_safe_connect(
+				('localhost', self.daemon_port), self.daemon_authkey, timeout_after_seconds = 0
+				)
+			self.rpc_client.log = self.log
+			return
+
+		# One client per worker
+		client_list = [
+			self.__start_rpc_client_for_interpreter__(interpreter_session)
+			for interpreter_session in self.interpreter_session_list
+			]
+		for client in client_list:
+			client.log = self.log
+
+		# Only one worker, talk to it directly
+		if len(client_list) == 1:
+			self.rpc_client = client_list[0]
+			return
+
+		# Dispatch calls across workers
+		self.rpc_client = mp_client_pool_class(client_list, dispatch = self.p['workers_dispatch'])
+
+
+	def __start_rpc_client_for_interpreter__(self, interpreter_session):
+
+		# Talk to Wine side through stdin & stdout of the interpreter
+		if self.p['transport'] == 'pipe':
+			return mp_client_pipe_connect(
+				interpreter_session.proc_winepython.stdout.fileno(),
+				interpreter_session.proc_winepython.stdin.fileno()
+				)
+
+		# Fire up xmlrpc client, server is listening since it signaled its status
+		return mp_client_safe_connect(
+			('localhost', interpreter_session.p['port_socket_wine']),
+			'zugbruecke_wine', timeout_after_seconds = 0
 			)
 
 
@@ -389,24 +820,46 @@ class session_client_class():
 		self.rpc_server.server_forever_in_thread()
 
 
-	def __prepare_python_command__(self):
+	def __prepare_python_command__(self, daemon = False):
+
+		# Check transport of ctypes bridge
+		if self.p['transport'] not in ('tcp', 'pipe'):
+			raise ValueError('unsupported transport "%s", expected "tcp" or "pipe"' % self.p['transport'])
+
+		# Parameters of one interpreter (worker)
+		p = self.p.copy()
+
+		# Daemons are shared by several processes, they can only be reached through sockets
+		if daemon:
+			p['transport'] = 'tcp'
 
 		# Get socket for ctypes bridge
-		self.p['port_socket_wine'] = get_free_port()
+		if p['transport'] == 'tcp':
+			p['port_socket_wine'] = get_free_port()
+		else:
+			p['port_socket_wine'] = 0
 
 		# Prepare command with minimal meta info. All other info can be passed via sockets.
-		self.p['command_dict'] = [
+		p['command_dict'] = [
 			os.path.join(
 				os.path.abspath(os.path.join(get_location_of_file(__file__), os.pardir)),
 				'_server_.py'
 				),
 			'--id', self.id,
-			'--port_socket_wine', str(self.p['port_socket_wine']),
+			'--port_socket_wine', str(p['port_socket_wine']),
 			'--port_socket_unix', str(self.p['port_socket_unix']),
+			'--transport', p['transport'],
+			'--rpc_workers', str(self.p['rpc_workers']),
 			'--log_level', str(self.p['log_level']),
 			'--log_write', str(int(self.p['log_write']))
 			]
 
+		# Daemon hosts session servers of many clients
+		if daemon:
+			p['command_dict'].extend(['--daemon_linger', str(self.p['daemon_linger'])])
+
+		return p
+
 
 	def __wait_for_server_status_change__(self, target_status):
 
@@ -420,36 +873,30 @@ class session_client_class():
 		STATUS_DICT = {True: 'up', False: 'down'}
 
 		# Log status
-		self.log.out('[session-client] Waiting for session-server to be %s ...' % STATUS_DICT[target_status])
+		self.log.out('[session-client] Waiting for session-server to be %s ...', STATUS_DICT[target_status])
 
-		# Time-step
-		wait_for_seconds = 0.01
 		# Timeout
 		timeout_after_seconds = 30.0
 		# Already waited for ...
 		started_waiting_at = time.time()
 
-		# Run loop until socket appears
-		while not self.server_up:
-
-			# Wait before trying again
-			time.sleep(wait_for_seconds)
-
-			# Time out
-			if time.time() >= (started_waiting_at + timeout_after_seconds):
-				break
+		# Sleep until servers signal the status change (or time out)
+		with self.__status_condition__:
+			self.__status_condition__.wait_for(
+				lambda: self.server_up == target_status, timeout = timeout_after_seconds
+				)
 
 		# Handle timeout
-		if not self.server_up:
+		if self.server_up != target_status:
 
 			# Log status
-			self.log.out('[session-client] ... wait timed out (after %0.2f seconds).' %
-				(time.time() - started_waiting_at)
+			self.log.out('[session-client] ... wait timed out (after %0.2f seconds).',
+				time.time() - started_waiting_at
 				)
 
 			raise # TODO
 
 		# Log status
-		self.log.out('[session-client] ... session server is %s (after %0.2f seconds).' %
-			(STATUS_DICT[target_status], time.time() - started_waiting_at)
+		self.log.out('[session-client] ... session server is %s (after %0.2f seconds).',
+			STATUS_DICT[target_status], time.time() - started_waiting_at
 			)
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	src/zugbruecke/core/session_daemon.py: Long-lived Wine side, shared by many sessions
+
+	Required to run on platform / side: [WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import binascii
+import os
+from threading import (
+	Lock,
+	Timer
+	)
+import traceback
+
+from .lib import get_free_port
+from .log import log_class
+from .rpc import mp_server_class
+from .session_server import session_server_class
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+# Seconds an attached session client has for connecting to its session server
+ATTACH_TIMEOUT = 30
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# SESSION DAEMON CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+class session_daemon_class:
+	"""
+	Outlives the session which started it. Every attaching session client gets
+	its own session server (own port, DLL handles, routines, callbacks and log)
+	inside this process. DLLs are loaded into this one process though, i.e.
+	their global state is shared and a crash takes down all sessions. Once the
+	last one has detached and nobody attached within daemon_linger seconds,
+	the process exits.
+	"""
+
+
+	def __init__(self, daemon_id, parameter):
+
+		# Store daemon id and parameter
+		self.id = daemon_id
+		self.p = parameter
+
+		# Nobody to send log messages to, they go to files (if configured)
+		self.log = log_class(self.id, self.p)
+
+		# Status log
+		self.log.out('[session-daemon] STARTING ...')
+
+		# Session servers by session id, counted references
+		self.session_dict = {}
+		self.__lock__ = Lock()
+
+		# Only clients which can read the daemon's state file may connect
+		self.authkey = binascii.hexlify(os.urandom(16)).decode('ascii')
+
+		# Create server
+		self.rpc_server = mp_server_class(
+			('localhost', self.p['port_socket_wine']),
+			self.authkey,
+			log = self.log
+			)
+
+		# Register call: Attach a session client
+		self.rpc_server.register_function(self.__attach_session__, 'attach_session')
+		# Register call: Number of attached session clients
+		self.rpc_server.register_function(self.__get_session_count__, 'get_session_count')
+
+		# Exit if the session, which started the daemon, does not show up
+		self.__schedule_exit__()
+
+		# Open socket and tell the session, which started the daemon
+		self.rpc_server.listen()
+		self.__signal_readiness__()
+
+		# Status log
+		self.log.out('[session-daemon] STARTED, listening on port %d.', self.p['port_socket_wine'])
+
+		# Run server in this thread until the process exits
+		self.rpc_server.serve_forever()
+
+
+	def __attach_session__(self, parameter):
+		"""
+		Exposed interface
+		"""
+
+		# Status log
+		self.log.out('[session-daemon] Attaching session "%s" ...', parameter['id'])
+
+		# Session server gets its own port
+		parameter = parameter.copy()
+		parameter.update({
+			'platform': 'WINE',
+			'stdout': False,
+			'stderr': False,
+			'port_socket_wine': get_free_port(),
+			'transport': 'tcp',
+			'authkey': self.authkey
+			})
+
+		with self.__lock__:
+
+			try:
+				session = session_server_class(
+					parameter['id'], parameter,
+					terminate_function = lambda: self.__detach_session__(parameter['id'])
+					)
+			except:
+				self.log.err(traceback.format_exc())
+				raise
+
+			# Session client might crash or exit without terminating its session
+			session.rpc_server.disconnect_function = lambda: self.__lose_session__(parameter['id'])
+			self.session_dict[parameter['id']] = session
+
+		# Session client might never connect
+		t = Timer(ATTACH_TIMEOUT, self.__lose_session_if_unconnected__, args = (parameter['id'],))
+		t.daemon = True
+		t.start()
+
+		# Status log
+		self.log.out('[session-daemon] ... attached on port %d.', parameter['port_socket_wine'])
+
+		# Session client connects here
+		return parameter['port_socket_wine']
+
+
+	def __detach_session__(self, session_id):
+
+		with self.__lock__:
+
+			# Drop reference, free port of session server
+			session = self.session_dict.pop(session_id, None)
+			if session is not None:
+				session.rpc_server.release_socket()
+
+			# Status log
+			self.log.out('[session-daemon] Session "%s" detached, %d left.', session_id, len(self.session_dict))
+
+			# Last one gone?
+			if len(self.session_dict) == 0:
+				self.__schedule_exit__()
+
+
+	def __lose_session__(self, session_id):
+
+		session = self.session_dict.get(session_id, None)
+		if session is None:
+			return
+
+		# Status log
+		self.log.out('[session-daemon] Session "%s" lost its client, terminating it ...', session_id)
+
+		# Terminates session server, which then detaches
+		session.rpc_server.terminate()
+
+
+	def __lose_session_if_unconnected__(self, session_id):
+
+		session = self.session_dict.get(session_id, None)
+		if session is None or session.rpc_server.connection_count > 0:
+			return
+
+		self.__lose_session__(session_id)
+
+
+	def __exit_if_unused__(self):
+
+		with self.__lock__:
+
+			# Somebody attached in the meantime
+			if len(self.session_dict) > 0:
+				return
+
+			# Status log
+			self.log.out('[session-daemon] No sessions attached, TERMINATING.')
+
+			# Session servers' threads would keep the process alive
+			os._exit(0)
+
+
+	def __get_session_count__(self):
+		"""
+		Exposed interface
+		"""
+
+		return len(self.session_dict)
+
+
+	def __signal_readiness__(self):
+
+		# One line on standard output, carrying the key for connecting ...
+		os.write(1, self.authkey.encode('ascii') + b'\n')
+
+		# ... which goes away with the session that started the daemon, let go of it
+		devnull_fd = os.open(os.devnull, os.O_WRONLY)
+		os.dup2(devnull_fd, 1)
+		os.close(devnull_fd)
+
+
+	def __schedule_exit__(self):
+
+		# Give the next session some time to show up (and the last one its response to terminate)
+		t = Timer(max(self.p['daemon_linger'], 1), self.__exit_if_unused__)
+		t.daemon = True
+		t.start()
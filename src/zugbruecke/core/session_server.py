@@ -32,6 +32,7 @@ specific language governing rights and limitations under the License.
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 import ctypes
+import os
 import time
 import traceback
 
@@ -39,6 +40,7 @@ from .data import data_class
 from .dll_server import dll_server_class
 from .log import log_class
 from .path import path_class
+from .shm import shm_arena_class
 from .rpc import (
 	mp_client_safe_connect,
 	mp_server_class
@@ -52,16 +54,23 @@ from .rpc import (
 class session_server_class:
 
 
-	def __init__(self, session_id, parameter):
+	def __init__(self, session_id, parameter, terminate_function = None):
 
 		# Store session id and parameter
 		self.id = session_id
 		self.p = parameter
 
-		# Connect to Unix side
+		# Called on termination, e.g. by a daemon hosting this session. Likely None.
+		self.terminate_function = terminate_function
+
+		# Take stdin & stdout away from everybody else if they carry the ctypes bridge
+		if self.p['transport'] == 'pipe':
+			self.__detach_stdio__()
+
+		# Connect to Unix side, its server is listening before this process is started
 		self.rpc_client = mp_client_safe_connect(
 			('localhost', self.p['port_socket_unix']),
-			'zugbruecke_unix'
+			'zugbruecke_unix', timeout_after_seconds = 0
 			)
 
 		# Start logging session and connect it with log on unix side
@@ -81,6 +90,9 @@ class session_server_class:
 		# Start dict for dll files and routines
 		self.dll_dict = {}
 
+		# Remote buffers by address, kept alive across calls
+		self.buffer_dict = {}
+
 		# Organize all DLL types
 		self.dll_types = {
 			'cdll': ctypes.CDLL,
@@ -91,18 +103,27 @@ class session_server_class:
 		# Set data cache and parser
 		self.data = data_class(self.log, is_server = True, callback_client = self.rpc_client)
 
-		# Create server
+		# Create server, sessions hosted by a daemon use its key
 		self.rpc_server = mp_server_class(
 			('localhost', self.p['port_socket_wine']),
-			'zugbruecke_wine',
+			self.p.get('authkey', 'zugbruecke_wine'),
 			log = self.log,
-			terminate_function = self.__terminate__
+			terminate_function = self.__terminate__,
+			workers = self.p['rpc_workers']
 			)
 
 		# Register call: Accessing a dll
 		self.rpc_server.register_function(self.__load_library__, 'load_library')
+		self.rpc_server.register_function(self.__preload_signatures__, 'preload_signatures')
 		# Expose routine for updating parameters
 		self.rpc_server.register_function(self.__set_parameter__, 'set_parameter')
+		# Map shared memory arena
+		self.rpc_server.register_function(self.__attach_shm__, 'attach_shm')
+		# Remote buffers
+		self.rpc_server.register_function(self.__allocate_buffer__, 'allocate_buffer')
+		self.rpc_server.register_function(self.__free_buffer__, 'free_buffer')
+		self.rpc_server.register_function(self.__read_buffer__, 'read_buffer')
+		self.rpc_server.register_function(self.__write_buffer__, 'write_buffer')
 		# Register destructur: Call goes into xmlrpc-server first, which then terminates parent
 		self.rpc_server.register_function(self.rpc_server.terminate, 'terminate')
 		# Convert path: Unix to Wine
@@ -114,17 +135,119 @@ class session_server_class:
 		self.__expose_ctypes_routines__()
 
 		# Status log
-		self.log.out('[session-server] ctypes server is listening on port %d.' % self.p['port_socket_wine'])
+		if self.p['transport'] == 'pipe':
+			self.log.out('[session-server] ctypes server is listening on stdin.')
+		else:
+			self.log.out('[session-server] ctypes server is listening on port %d.', self.p['port_socket_wine'])
 		self.log.out('[session-server] STARTED.')
 		self.log.out('[session-server] Serve forever ...')
 
 		# Run server ...
-		self.rpc_server.server_forever_in_thread(daemon = False)
+		if self.p['transport'] == 'pipe':
+			self.rpc_server.serve_pipe_in_thread(self.pipe_read_fd, self.pipe_write_fd, daemon = False)
+		else:
+			self.rpc_server.server_forever_in_thread(daemon = False)
 
 		# Indicate to session client that the server is up
 		self.rpc_client.set_server_status(True)
 
 
+	def __allocate_buffer__(self, size):
+		"""
+		Exposed interface
+		"""
+
+		# Zero-initialized memory, address serves as handle
+		buffer = (ctypes.c_ubyte * size)()
+		address = ctypes.addressof(buffer)
+		self.buffer_dict[address] = buffer
+
+		# Status log
+		self.log.out('[session-server] Allocated remote buffer of %d bytes at 0x%x.', size, address)
+
+		return address
+
+
+	def __free_buffer__(self, address):
+		"""
+		Exposed interface
+		"""
+
+		self.buffer_dict.pop(address)
+
+		# Status log
+		self.log.out('[session-server] Freed remote buffer at 0x%x.', address)
+
+
+	def __read_buffer__(self, address, offset, length):
+		"""
+		Exposed interface
+		"""
+
+		self.__check_buffer_range__(address, offset, length)
+
+		return ctypes.string_at(address + offset, length)
+
+
+	def __write_buffer__(self, address, offset, data):
+		"""
+		Exposed interface
+		"""
+
+		self.__check_buffer_range__(address, offset, len(data))
+
+		ctypes.memmove(address + offset, data, len(data))
+
+
+	def __check_buffer_range__(self, address, offset, length):
+
+		if offset < 0 or length < 0 or offset + length > len(self.buffer_dict[address]):
+			raise ValueError('range %d:%d out of bounds of remote buffer' % (offset, offset + length))
+
+
+	def __attach_shm__(self, path, size):
+		"""
+		Exposed interface
+		"""
+
+		# Status log
+		self.log.out('[session-server] Attaching to shared memory arena "%s" ...', path)
+
+		try:
+			self.data.arena = shm_arena_class(self.path_unix_to_wine(path), size, owner = False)
+		except (OSError, ValueError):
+			self.log.err(traceback.format_exc())
+			self.log.out('[session-server] ... failed!')
+			return False
+
+		# Status log
+		self.log.out('[session-server] ... attached.')
+
+		return True
+
+
+	def __detach_stdio__(self):
+
+		# Keep private handles on the pipe pair
+		self.pipe_read_fd = os.dup(0)
+		self.pipe_write_fd = os.dup(1)
+
+		# Python-level stdin reads nothing, stdout goes to stderr
+		devnull_fd = os.open(os.devnull, os.O_RDONLY)
+		os.dup2(devnull_fd, 0)
+		os.close(devnull_fd)
+		os.dup2(2, 1)
+
+		# DLLs (and their C runtimes) pick up standard handles on their own - redirect them as well
+		STD_INPUT_HANDLE, STD_OUTPUT_HANDLE, STD_ERROR_HANDLE = 0xFFFFFFF6, 0xFFFFFFF5, 0xFFFFFFF4
+		kernel32 = ctypes.windll.kernel32
+		kernel32.GetStdHandle.argtypes = (ctypes.c_uint32,)
+		kernel32.GetStdHandle.restype = ctypes.c_void_p
+		kernel32.SetStdHandle.argtypes = (ctypes.c_uint32, ctypes.c_void_p)
+		kernel32.SetStdHandle(STD_OUTPUT_HANDLE, kernel32.GetStdHandle(STD_ERROR_HANDLE))
+		kernel32.SetStdHandle(STD_INPUT_HANDLE, None)
+
+
 	def __expose_ctypes_routines__(self):
 
 		# As-is exported platform-specific routines from ctypes
@@ -146,12 +269,12 @@ class session_server_class:
 
 		# Although this should happen only once per dll, lets be on the safe side
 		if dll_name in self.dll_dict.keys():
-			return (True, self.dll_dict[dll_name].hash_id) # Success & dll hash_id
+			return self.dll_dict[dll_name].hash_id
 
 		# Status log
-		self.log.out('[session-server] Attaching to DLL file "%s" with calling convention "%s" ...' % (
+		self.log.out('[session-server] Attaching to DLL file "%s" with calling convention "%s" ...',
 			dll_name, dll_type
-			))
+			)
 
 		try:
 
@@ -189,6 +312,44 @@ class session_server_class:
 		return self.dll_dict[dll_name].hash_id
 
 
+	def __preload_signatures__(self, dll_list):
+		"""
+		Exposed interface - loads DLLs and configures routines from signature cache
+		"""
+
+		preloaded_dict = {}
+
+		for dll_d in dll_list:
+
+			# DLL might be gone
+			try:
+				hash_id = self.__load_library__(dll_d['name'], dll_d['type'], dll_d['param'])
+			except Exception:
+				self.log.out('[session-server] Preloading DLL file "%s" failed.', dll_d['name'])
+				continue
+
+			dll = self.dll_dict[dll_d['name']]
+			fingerprint = dll.get_fingerprint()
+
+			routine_list = []
+
+			# Only if DLL file has not changed since (or if it can not be found, e.g. a system DLL)
+			if fingerprint == dll_d['fingerprint']:
+
+				# Routines might be gone
+				for routine_d, result in zip(dll_d['routines'], dll.__configure_routines__(dll_d['routines'])):
+					if result is not None:
+						routine_list.append((routine_d['name'], result[0], result[1], routine_d['hash']))
+
+			preloaded_dict[dll_d['name']] = {
+				'hash_id': hash_id,
+				'fingerprint': fingerprint,
+				'routines': routine_list
+				}
+
+		return preloaded_dict
+
+
 	def __set_parameter__(self, parameter):
 
 		self.p.update(parameter)
@@ -214,5 +375,12 @@ class session_server_class:
 			# Status log
 			self.log.out('[session-server] TERMINATED.')
 
-			# Indicate to session client that server was terminated
-			self.rpc_client.set_server_status(False)
+			# Indicate to session client that server was terminated, it might be gone already
+			try:
+				self.rpc_client.set_server_status(False)
+			except (EOFError, OSError):
+				pass
+
+			# Call terminate function if it exists
+			if self.terminate_function is not None:
+				self.terminate_function()
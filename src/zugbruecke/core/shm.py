@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	src/zugbruecke/core/shm.py: Shared memory arena for memsync payloads
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import bisect
+import ctypes
+import mmap
+import os
+import threading
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+# Blocks start on cache line boundaries
+SHM_ALIGNMENT = 64
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def get_shm_path(session_id):
+	"""
+	Returns path of arena file in memory-backed file system or None if there is none
+	"""
+
+	# Wine sees it through drive Z:, a disk-backed file would defeat the purpose
+	if not os.path.isdir('/dev/shm'):
+		return None
+
+	return os.path.join('/dev/shm', 'zugbruecke_%s.shm' % session_id)
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS: Shared memory arena
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+class shm_arena_class:
+	"""
+	A file, memory-mapped by both the Unix and the Wine side. Only the side,
+	which creates the file (the owner, i.e. the Unix side), allocates blocks.
+	The other side only translates offsets into local addresses.
+	"""
+
+
+	def __init__(self, path, size, owner, threshold = 0):
+
+		# Store parameters
+		self.path = path
+		self.size = size
+		self.owner = owner
+
+		# Minimum length of segments, which go through the arena
+		self.threshold = threshold
+
+		# Create (owner) or open file, map it
+		if self.owner:
+			fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+			try:
+				os.ftruncate(fd, self.size)
+				self.map = mmap.mmap(fd, self.size)
+			except:
+				os.close(fd)
+				os.unlink(self.path)
+				raise
+		else:
+			fd = os.open(self.path, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+			try:
+				self.map = mmap.mmap(fd, self.size)
+			except:
+				os.close(fd)
+				raise
+		os.close(fd)
+
+		# Base address of mapping, keeps an export on the map
+		self.__base__ = ctypes.c_char.from_buffer(self.map)
+		self.address = ctypes.addressof(self.__base__)
+
+		# Free blocks as sorted list of offsets and dict of offsets to lengths, allocated blocks
+		self.__free_offsets__ = [0]
+		self.__free__ = {0: self.size}
+		self.__allocated__ = {}
+		self.__lock__ = threading.Lock()
+
+		# Arena is up
+		self.up = True
+
+
+	def allocate(self, length):
+		"""
+		Returns offset of new block or None if arena can not hold it
+		"""
+
+		# Only the owner allocates
+		if not self.owner or length <= 0:
+			return None
+
+		# Round up to alignment
+		length = (length + SHM_ALIGNMENT - 1) // SHM_ALIGNMENT * SHM_ALIGNMENT
+
+		with self.__lock__:
+
+			# First fit
+			for index, offset in enumerate(self.__free_offsets__):
+				free_length = self.__free__[offset]
+				if free_length < length:
+					continue
+				del self.__free_offsets__[index]
+				del self.__free__[offset]
+				if free_length > length:
+					self.__free_offsets__.insert(index, offset + length)
+					self.__free__[offset + length] = free_length - length
+				self.__allocated__[offset] = length
+				return offset
+
+		return None
+
+
+	def free(self, offset):
+
+		with self.__lock__:
+
+			length = self.__allocated__.pop(offset)
+
+			# Insert block into free list
+			index = bisect.bisect(self.__free_offsets__, offset)
+			self.__free_offsets__.insert(index, offset)
+			self.__free__[offset] = length
+
+			# Merge with next block
+			if index + 1 < len(self.__free_offsets__):
+				next_offset = self.__free_offsets__[index + 1]
+				if offset + length == next_offset:
+					self.__free__[offset] += self.__free__.pop(next_offset)
+					del self.__free_offsets__[index + 1]
+
+			# Merge with previous block
+			if index > 0:
+				prev_offset = self.__free_offsets__[index - 1]
+				if prev_offset + self.__free__[prev_offset] == offset:
+					self.__free__[prev_offset] += self.__free__.pop(offset)
+					del self.__free_offsets__[index]
+
+
+	def get_pointer(self, offset):
+
+		return ctypes.c_void_p(self.address + offset)
+
+
+	def terminate(self):
+
+		if self.up:
+
+			# Drop export on map, then close it
+			del self.__base__
+			self.map.close()
+
+			# Owner removes file (if still there)
+			if self.owner:
+				self.unlink()
+
+			self.up = False
+
+
+	def unlink(self):
+		"""
+		Removes file, mappings stay valid. Nothing is left behind if a process gets killed.
+		"""
+
+		try:
+			os.unlink(self.path)
+		except OSError:
+			pass
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	src/zugbruecke/core/signature_cache.py: Routine definitions persisting across sessions
+
+	Required to run on platform / side: [UNIX]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import json
+import os
+from threading import Lock
+
+from .const import GROUP_FUNCTION
+from .lib import get_hash_of_string
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+# Files of other versions are ignored (and overwritten)
+SIGNATURE_CACHE_VERSION = 1
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def get_definition_hash(argtypes_d, restype_d, memsync_d, argdirs_d):
+	"""
+	Returns a hash of packed definitions, or None if they can not be cached
+	"""
+
+	definition_list = [argtypes_d, restype_d, memsync_d, argdirs_d]
+
+	# Callbacks are identified by per-process hashes, they never match
+	if __contains_group__(definition_list, GROUP_FUNCTION):
+		return None
+
+	try:
+		return get_hash_of_string(json.dumps(definition_list, sort_keys = True))
+	except (TypeError, ValueError): # custom objects
+		return None
+
+
+def __contains_group__(item, group):
+
+	if isinstance(item, dict):
+		return item.get('g', None) == group or any(__contains_group__(value, group) for value in item.values())
+
+	if isinstance(item, (list, tuple)):
+		return any(__contains_group__(value, group) for value in item)
+
+	return False
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS: Signature cache
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+class signature_cache_class:
+	"""
+	Keeps packed definitions of configured routines in a file. When a DLL found in
+	the file is loaded, the Wine side configures all of its routines at once.
+	Routines with unchanged definitions are then neither registered nor configured
+	one by one. Entries of a DLL are dropped if its file has changed.
+	"""
+
+
+	def __init__(self, path, log):
+
+		self.path = path
+		self.log = log
+
+		# DLLs by name, each with a dict of routines by name
+		self.dll_dict = self.__read__()
+
+		# Handles of DLLs and routines, which were configured when their DLL was loaded
+		self.preloaded_dict = {}
+
+		# Names of DLLs with new or changed entries
+		self.changed_set = set()
+
+		self.__lock__ = Lock()
+
+
+	def get_dll(self, dll_name, dll_type, dll_param):
+		"""
+		Returns hash id of preloaded DLL or None
+		"""
+
+		dll_d = self.dll_dict.get(dll_name, None)
+		if dll_name not in self.preloaded_dict or dll_d['type'] != dll_type or dll_d['param'] != dll_param:
+			return None
+
+		return self.preloaded_dict[dll_name]['hash_id']
+
+
+	def get_preload(self, dll_name, dll_type, dll_param):
+		"""
+		Returns entry of DLL for preloading or None
+		"""
+
+		dll_d = self.dll_dict.get(dll_name, None)
+		if dll_d is None or dll_d['type'] != dll_type or dll_d['param'] != dll_param:
+			return None
+
+		return {
+			'name': dll_name,
+			'type': dll_d['type'],
+			'param': dll_d['param'],
+			'fingerprint': dll_d['fingerprint'],
+			'routines': list(dll_d['routines'].values())
+			}
+
+
+	def get_routine(self, dll_name, routine_name):
+		"""
+		Returns dict with handles, wire id and definition hash of preloaded routine or None
+		"""
+
+		if dll_name not in self.preloaded_dict:
+			return None
+
+		return self.preloaded_dict[dll_name]['routines'].get(routine_name, None)
+
+
+	def save(self, get_fingerprint):
+		"""
+		Merges new entries into file, get_fingerprint returns fingerprint of DLL by name
+		"""
+
+		with self.__lock__:
+
+			if len(self.changed_set) == 0:
+				return
+
+			# Other processes might have added entries in the meantime
+			dll_dict = self.__read__()
+
+			for dll_name in self.changed_set:
+
+				dll_d = self.dll_dict[dll_name]
+				if dll_d['fingerprint'] is None:
+					dll_d['fingerprint'] = get_fingerprint(dll_name)
+
+				# Entries of DLL files, which have changed since, are dropped
+				if dll_name in dll_dict and dll_dict[dll_name]['fingerprint'] == dll_d['fingerprint']:
+					dll_dict[dll_name]['routines'].update(dll_d['routines'])
+					dll_dict[dll_name].update({'type': dll_d['type'], 'param': dll_d['param']})
+				else:
+					dll_dict[dll_name] = dll_d
+
+			self.__write__(dll_dict)
+			self.changed_set.clear()
+
+		# Log status
+		self.log.out('[signature-cache] Saved signatures to "%s".', self.path)
+
+
+	def set_preloaded(self, preloaded_dict):
+		"""
+		Takes handles of DLLs and routines configured on the Wine side when loading DLLs
+		"""
+
+		for dll_name, preloaded_dll_d in preloaded_dict.items():
+
+			# DLL file has changed, do not trust its entries any longer
+			if self.dll_dict[dll_name]['fingerprint'] != preloaded_dll_d['fingerprint']:
+				self.dll_dict[dll_name].update({'fingerprint': preloaded_dll_d['fingerprint'], 'routines': {}})
+				self.changed_set.add(dll_name)
+
+			self.preloaded_dict[dll_name] = {
+				'hash_id': preloaded_dll_d['hash_id'],
+				'routines': {
+					routine_name: {'handles': handles, 'wire_id': wire_id, 'hash': definition_hash}
+					for routine_name, handles, wire_id, definition_hash in preloaded_dll_d['routines']
+					}
+				}
+
+			# Log status
+			self.log.out('[signature-cache] Preloaded %d routines of DLL file "%s".',
+				len(self.preloaded_dict[dll_name]['routines']), dll_name
+				)
+
+
+	def update(self, dll_name, dll_type, dll_param, routine_name, definition_hash, definition_dict):
+		"""
+		Stores definitions of a routine, which was configured on the Wine side
+		"""
+
+		with self.__lock__:
+
+			if dll_name not in self.dll_dict:
+				self.dll_dict[dll_name] = {
+					'type': dll_type, 'param': dll_param, 'fingerprint': None, 'routines': {}
+					}
+
+			routine_d = {'name': routine_name, 'hash': definition_hash}
+			routine_d.update(definition_dict)
+			self.dll_dict[dll_name]['routines'][routine_name] = routine_d
+
+			self.changed_set.add(dll_name)
+
+
+	def __read__(self):
+
+		try:
+			with open(self.path, 'r') as f:
+				cache_d = json.load(f)
+		except (OSError, ValueError):
+			return {}
+
+		if cache_d.get('version', None) != SIGNATURE_CACHE_VERSION:
+			return {}
+
+		# Routines by name, names can be ordinals
+		return {
+			dll_d['name']: {
+				'type': dll_d['type'],
+				'param': dll_d['param'],
+				'fingerprint': dll_d['fingerprint'],
+				'routines': {routine_d['name']: routine_d for routine_d in dll_d['routines']}
+				}
+			for dll_d in cache_d['dlls']
+			}
+
+
+	def __write__(self, dll_dict):
+
+		cache_d = {
+			'version': SIGNATURE_CACHE_VERSION,
+			'dlls': [
+				{
+					'name': dll_name,
+					'type': dll_d['type'],
+					'param': dll_d['param'],
+					'fingerprint': dll_d['fingerprint'],
+					'routines': list(dll_d['routines'].values())
+					}
+				for dll_name, dll_d in dll_dict.items()
+				]
+			}
+
+		# Write to temporary file first, concurrent readers see old or new file
+		os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok = True)
+		path_tmp = '%s.%d.tmp' % (self.path, os.getpid())
+		with open(path_tmp, 'w') as f:
+			json.dump(cache_d, f)
+		os.replace(path_tmp, self.path)
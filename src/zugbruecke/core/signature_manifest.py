@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	src/zugbruecke/core/signature_manifest.py: Definitions of many routines from a dict or file
+
+	Required to run on platform / side: [UNIX]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import ctypes
+import json
+import os
+
+try:
+	import tomllib as toml_lib # Python 3.11 and later
+except ImportError:
+	try:
+		import toml as toml_lib
+	except ImportError:
+		toml_lib = None
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+# Attributes of routines, which can be set through a manifest
+SIGNATURE_KEYS = ('argtypes', 'restype', 'memsync', 'argdirs')
+
+# Return type of routines without return value
+VOID_NAMES = ('None', 'void')
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def get_type_from_name(type_name):
+	"""
+	Returns ctypes type from a string like "c_int", "POINTER(c_float)" or "c_double * 3"
+	"""
+
+	type_name = type_name.strip()
+
+	# Pointer (checked first, its target might be an array)
+	if type_name.startswith('POINTER(') and type_name.endswith(')'):
+		return ctypes.POINTER(get_type_from_name(type_name[len('POINTER('):-1]))
+
+	# Array, dimensions from the inside out
+	if '*' in type_name:
+		element_name, _, length = type_name.rpartition('*')
+		try:
+			length = int(length)
+		except ValueError:
+			raise ValueError('invalid array length in type "%s"' % type_name)
+		return get_type_from_name(element_name) * length
+
+	if type_name in VOID_NAMES:
+		return None
+
+	datatype = getattr(ctypes, type_name, None)
+	if not isinstance(datatype, type) or not issubclass(datatype, ctypes._SimpleCData):
+		raise ValueError('unknown type "%s"' % type_name)
+
+	return datatype
+
+
+def load_signature_manifest(signatures):
+	"""
+	Returns dict of routine names and dicts of their attributes (argtypes, restype,
+	memsync, argdirs) from a dict or a JSON or TOML file. Types can be ctypes types
+	or their names.
+	"""
+
+	# Path to file
+	if isinstance(signatures, str):
+		signatures = __read_manifest_file__(signatures)
+
+	if not isinstance(signatures, dict):
+		raise TypeError('signatures must be a dict or a path to a JSON or TOML file')
+
+	manifest_dict = {}
+
+	for routine_name, signature_d in signatures.items():
+
+		unknown_key_list = [key for key in signature_d.keys() if key not in SIGNATURE_KEYS]
+		if len(unknown_key_list) > 0:
+			raise ValueError('unknown keys %s in signature of routine "%s"' % (
+				', '.join(sorted(unknown_key_list)), str(routine_name)
+				))
+
+		routine_d = {}
+
+		if 'argtypes' in signature_d.keys():
+			routine_d['argtypes'] = tuple(__get_type__(datatype) for datatype in signature_d['argtypes'])
+		if 'restype' in signature_d.keys():
+			routine_d['restype'] = __get_type__(signature_d['restype'])
+		if 'memsync' in signature_d.keys():
+			routine_d['memsync'] = [dict(memsync_d) for memsync_d in signature_d['memsync']]
+		if 'argdirs' in signature_d.keys():
+			routine_d['argdirs'] = list(signature_d['argdirs'])
+
+		manifest_dict[routine_name] = routine_d
+
+	return manifest_dict
+
+
+def __get_type__(datatype):
+
+	# Actual types (or None for void) are used as they are
+	if isinstance(datatype, str):
+		return get_type_from_name(datatype)
+
+	return datatype
+
+
+def __read_manifest_file__(path):
+
+	extension = os.path.splitext(path)[1].lower()
+
+	if extension == '.json':
+		with open(path, 'r') as f:
+			return json.load(f)
+
+	if extension == '.toml':
+		if toml_lib is None:
+			raise ImportError('reading TOML files requires Python 3.11 or the "toml" package')
+		if toml_lib.__name__ == 'tomllib':
+			with open(path, 'rb') as f:
+				return toml_lib.load(f)
+		with open(path, 'r') as f:
+			return toml_lib.load(f)
+
+	raise ValueError('unknown type of signature file "%s", expected .json or .toml' % path)
@@ -32,41 +32,119 @@ specific language governing rights and limitations under the License.
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 from io import BytesIO
+import fcntl
+import hashlib
 import os
 import shutil
 import subprocess
 import urllib.request
+import warnings
 import zipfile
 
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# SETUP ROUTINES
+# CONST
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-def create_wine_prefix(dir_wineprefix):
+# ioctl of Linux for cloning a file by reflink (shared blocks on file systems like btrfs and XFS)
+FICLONE = 0x40049409
 
-	# Does it exist?
-	if not os.path.exists(dir_wineprefix):
-
-		# Start wine server into prepared environment
-		proc_winecfg = subprocess.Popen(
-			['wineboot', '-i'],
-			stdin = subprocess.PIPE,
-			stdout = subprocess.PIPE,
-			stderr = subprocess.PIPE,
-			shell = False
-			)
 
-		# Get feedback
-		cfg_out, cfg_err = proc_winecfg.communicate()
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# SETUP ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def create_wine_prefix(dir_wineprefix, arch = None, cache_dir = None, clone = 'auto'):
+	"""
+	Without a cache directory, the prefix is initialized by wineboot. Otherwise,
+	a template prefix per architecture is initialized once in the cache directory
+	and cloned by reflink (auto, if supported) or copy, see clone. Hardlinks are
+	refused: Wine modifies files in prefixes in place, which would alter the
+	template and every other clone.
+	"""
 
+	# Prefixes must not share files with the template
+	if clone not in ('auto', 'copy'):
+		raise ValueError('unknown clone mode for Wine prefixes "%s"' % clone)
 
-def setup_wine_pip(arch, version, directory):
+	# Does it exist?
+	if os.path.exists(dir_wineprefix):
+		return
+
+	# No template, start wine server into prepared environment
+	if cache_dir is None:
+		__boot_wine_prefix__(dir_wineprefix)
+		return
+
+	# Template prefix in cache
+	dir_template = get_wine_prefix_template(arch, cache_dir)
+
+	# Only one process at a time creates a prefix in this place
+	lock_path = dir_wineprefix + '.lock'
+	with open(lock_path, 'w') as f:
+		fcntl.flock(f, fcntl.LOCK_EX)
+
+		# Someone else might have been faster (and might have removed the lock file already)
+		if os.path.exists(dir_wineprefix):
+			__remove_lock_file__(lock_path)
+			return
+
+		# Clone into a temporary folder which is then moved into place
+		tmp_wineprefix = '%s.%d.tmp' % (dir_wineprefix, os.getpid())
+		try:
+			__clone_tree__(
+				dir_template, tmp_wineprefix, clone,
+				copy_suffix_tuple = ('.reg',) # Registry is modified in place
+				)
+		except:
+			shutil.rmtree(tmp_wineprefix, ignore_errors = True)
+			raise
+		os.rename(tmp_wineprefix, dir_wineprefix)
+
+		# Prefix exists from now on, so latecomers return before they need the lock
+		__remove_lock_file__(lock_path)
+
+
+def get_wine_prefix_template(arch, cache_dir):
+	"""
+	Returns path of template prefix for architecture, initializes it if required
+	"""
+
+	# Template prefix in cache
+	dir_template = os.path.join(cache_dir, 'prefix', arch + '-wine')
+
+	# Make sure the parent directory exists
+	os.makedirs(os.path.dirname(dir_template), exist_ok = True)
+
+	# Only one process at a time creates the template
+	with open(dir_template + '.lock', 'w') as f:
+		fcntl.flock(f, fcntl.LOCK_EX)
+
+		# Initialize template in a temporary folder which is then moved into place
+		if not os.path.exists(dir_template):
+			tmp_template = '%s.%d.tmp' % (dir_template, os.getpid())
+			env_dict = os.environ.copy()
+			env_dict.update({'WINEARCH': arch, 'WINEPREFIX': tmp_template})
+			__boot_wine_prefix__(tmp_template, env_dict, wait = True)
+			os.rename(tmp_template, dir_template)
+
+	return dir_template
+
+
+def setup_wine_pip(arch, version, directory, cache_dir = None, trust_on_first_use = False):
+
+	# Get get-pip.py from cache, download it only if it is not there
+	if cache_dir is not None:
+		with open(get_cached_archive(
+			cache_dir, 'get-pip.py', 'https://bootstrap.pypa.io/get-pip.py', trust_on_first_use
+			)[0], 'rb') as f:
+			getpip_bin = f.read()
 
 	# Download get-pip.py into memory
-	getpip_req = urllib.request.urlopen('https://bootstrap.pypa.io/get-pip.py')
-	getpip_bin = getpip_req.read()
-	getpip_req.close()
+	else:
+		getpip_req = urllib.request.urlopen('https://bootstrap.pypa.io/get-pip.py')
+		getpip_bin = getpip_req.read()
+		getpip_req.close()
 
 	# Start Python on top of Wine
 	proc_getpip = subprocess.Popen(
@@ -81,7 +159,7 @@ def setup_wine_pip(arch, version, directory):
 	getpip_out, getpip_err = proc_getpip.communicate(input = getpip_bin)
 
 
-def setup_wine_python(arch, version, directory, overwrite = False):
+def setup_wine_python(arch, version, directory, overwrite = False, cache_dir = None, trust_on_first_use = False, clone = 'auto'):
 
 	# File name for python stand-alone zip file
 	pyarchive = 'python-%s-embed-%s.zip' % (version, 'amd64' if arch == 'win64' else arch)
@@ -105,37 +183,101 @@ def setup_wine_python(arch, version, directory, overwrite = False):
 		# Create folder
 		os.makedirs(directory)
 
-	# Only do if Python is not there OR if should be overwritten
-	if overwrite or not preexisting:
+	# Nothing to do if Python is there and should not be overwritten
+	if preexisting and not overwrite:
+		return
+
+	# Download URL of zip file
+	pyarchive_url = 'https://www.python.org/ftp/python/%s/%s' % (version, pyarchive)
+
+	# No cache, download zip file from Python website and unpack it in place
+	if cache_dir is None:
 
 		# Generate in-memory file-like-object
 		archive_zip = BytesIO()
 
 		# Download zip file from Python website into file-like-object
-		archive_req = urllib.request.urlopen(
-			'https://www.python.org/ftp/python/%s/%s' % (version, pyarchive)
-			)
+		archive_req = urllib.request.urlopen(pyarchive_url)
 		archive_zip.write(archive_req.read())
 		archive_req.close()
 
-		# Unpack from memory to disk
-		f = zipfile.ZipFile(archive_zip)
-		f.extractall(path = target_directory) # Directory created if required
-		f.close()
+		__unpack_wine_python__(archive_zip, version, target_directory)
+
+		return
+
+	# Get zip file from cache and its checksum
+	archive_path, archive_sha256 = get_cached_archive(cache_dir, pyarchive, pyarchive_url, trust_on_first_use)
+
+	# Unpacked Python, content-addressed by checksum of zip file
+	tree_directory = os.path.join(cache_dir, 'sha256', archive_sha256)
+
+	# Unpack only once, into a temporary folder which is then moved into place
+	if not os.path.isdir(tree_directory):
+		tmp_directory = '%s.%d.tmp' % (tree_directory, os.getpid())
+		__unpack_wine_python__(archive_path, version, tmp_directory)
+		try:
+			os.rename(tmp_directory, tree_directory)
+		except OSError: # Another process was faster
+			shutil.rmtree(tmp_directory)
+
+	# Populate target directory from cache, see __clone_tree__ for clone modes
+	__clone_tree__(tree_directory, target_directory, clone)
+
+
+def get_cached_archive(cache_dir, archive_name, archive_url, trust_on_first_use = False):
+	"""
+	Returns path and SHA256 checksum of an archive in the cache directory.
+	Archives are only downloaded if they are not in the cache. Archives listed
+	in the cache's SHA256SUMS file must match their checksum. All others cause
+	a warning and are only added to it on first use if trust_on_first_use is set.
+	"""
+
+	# Make sure the cache directory exists
+	if not os.path.exists(cache_dir):
+		os.makedirs(cache_dir)
+
+	# Path of archive in cache
+	archive_path = os.path.join(cache_dir, archive_name)
+
+	# Not in cache, download it into a temporary file which is then moved into place
+	if not os.path.isfile(archive_path):
+		tmp_path = '%s.%d.tmp' % (archive_path, os.getpid())
+		archive_req = urllib.request.urlopen(archive_url)
+		with open(tmp_path, 'wb') as f:
+			shutil.copyfileobj(archive_req, f)
+		archive_req.close()
+		os.rename(tmp_path, archive_path)
+
+	# Compute checksum of archive
+	archive_hash = hashlib.sha256()
+	with open(archive_path, 'rb') as f:
+		for chunk in iter(lambda: f.read(1024 * 1024), b''):
+			archive_hash.update(chunk)
+	archive_sha256 = archive_hash.hexdigest()
 
-		# Get path of Python library zip
-		library_zip_path = os.path.join(target_directory, 'python%s%s.zip' % (
-			version.split('.')[0], version.split('.')[1]
-			))
+	# Checksums of known archives
+	sums_path = os.path.join(cache_dir, 'SHA256SUMS')
+	sums_dict = __read_sha256sums__(sums_path)
 
-		# Unpack Python library from embedded zip on disk
-		f = zipfile.ZipFile(library_zip_path, 'r')
-		f.extractall(path = os.path.join(target_directory, 'Lib')) # Directory created if required
-		f.close()
+	# Known archive, verify it
+	if archive_name in sums_dict:
+		if sums_dict[archive_name] != archive_sha256:
+			raise ValueError('checksum mismatch of "%s" in cache: expected %s, got %s' % (
+				archive_name, sums_dict[archive_name], archive_sha256
+				))
 
-		# Remove Python library zip from disk
-		os.remove(os.path.join(target_directory, 'python36._pth'))
-		os.remove(library_zip_path)
+	# New archive, remember its checksum only if asked to
+	elif trust_on_first_use:
+		with open(sums_path, 'a') as f:
+			f.write('%s  %s\n' % (archive_sha256, archive_name))
+
+	# New archive, can not be verified
+	else:
+		warnings.warn('checksum of "%s" in cache is not listed in "%s", got %s' % (
+			archive_name, sums_path, archive_sha256
+			), RuntimeWarning)
+
+	return archive_path, archive_sha256
 
 
 def set_wine_env(cfg_dir, arch):
@@ -150,3 +292,140 @@ def set_wine_env(cfg_dir, arch):
 	os.environ['WINEPREFIX'] = dir_wineprefix
 
 	return dir_wineprefix
+
+
+def __boot_wine_prefix__(dir_wineprefix, env_dict = None, wait = False):
+
+	# Start wine server into prepared environment
+	proc_winecfg = subprocess.Popen(
+		['wineboot', '-i'],
+		stdin = subprocess.PIPE,
+		stdout = subprocess.PIPE,
+		stderr = subprocess.PIPE,
+		shell = False,
+		env = env_dict
+		)
+
+	# Get feedback
+	cfg_out, cfg_err = proc_winecfg.communicate()
+
+	# Registry is written by wine server when it exits, wait for it if prefix is cloned later
+	if wait:
+		subprocess.call(
+			['wineserver', '-w'],
+			stdin = subprocess.DEVNULL,
+			stdout = subprocess.DEVNULL,
+			stderr = subprocess.DEVNULL,
+			env = env_dict
+			)
+
+
+def __clone_file__(source_path, target_path, clone):
+	"""
+	Returns clone mode for next file, falls back to copies where required
+	"""
+
+	# Shares blocks with source until either one is modified, Linux only
+	if clone == 'auto':
+		try:
+			with open(source_path, 'rb') as fs, open(target_path, 'wb') as ft:
+				fcntl.ioctl(ft.fileno(), FICLONE, fs.fileno())
+			shutil.copystat(source_path, target_path)
+			return clone
+		except OSError: # Not supported by file system (or platform), copy from now on
+			clone = 'copy'
+
+	# Shares file with source, also if modified
+	elif clone == 'hardlink':
+		try:
+			os.link(source_path, target_path)
+			return clone
+		except OSError: # Different file systems or no support for hardlinks, copy instead
+			pass
+
+	# Plain copy, keeping time stamps
+	shutil.copy2(source_path, target_path)
+	return clone
+
+
+def __clone_tree__(source_directory, target_directory, clone, copy_suffix_tuple = ()):
+	"""
+	Clones a tree by reflink (auto), hardlink or copy. Symlinks are re-created
+	as they are, files ending with copy_suffix_tuple are always copied.
+	"""
+
+	if clone not in ('auto', 'hardlink', 'copy'):
+		raise ValueError('unknown clone mode "%s"' % clone)
+
+	# Walk through source, re-create folders and clone files
+	for path, dir_list, file_list in os.walk(source_directory):
+
+		target_path = os.path.join(target_directory, os.path.relpath(path, source_directory))
+		if not os.path.exists(target_path):
+			os.makedirs(target_path)
+
+		# Symlinks to folders (e.g. drives in dosdevices) are not followed
+		for dir_name in dir_list:
+			if os.path.islink(os.path.join(path, dir_name)):
+				os.symlink(os.readlink(os.path.join(path, dir_name)), os.path.join(target_path, dir_name))
+
+		for file_name in file_list:
+			source_file, target_file = os.path.join(path, file_name), os.path.join(target_path, file_name)
+			if os.path.islink(source_file):
+				os.symlink(os.readlink(source_file), target_file)
+			elif file_name.endswith(copy_suffix_tuple):
+				shutil.copy2(source_file, target_file)
+			else:
+				clone = __clone_file__(source_file, target_file, clone)
+
+
+def __remove_lock_file__(lock_path):
+
+	try:
+		os.remove(lock_path)
+	except FileNotFoundError:
+		pass
+
+
+def __read_sha256sums__(sums_path):
+
+	# No checksums yet
+	if not os.path.isfile(sums_path):
+		return {}
+
+	# Format of sha256sum, i.e. "<checksum>  <name>" per line
+	sums_dict = {}
+	with open(sums_path, 'r') as f:
+		for line in f:
+			line = line.strip()
+			if line == '' or line.startswith('#'):
+				continue
+			checksum, name = line.split(None, 1)
+			sums_dict[name.lstrip('*')] = checksum.lower()
+
+	return sums_dict
+
+
+def __unpack_wine_python__(archive, version, target_directory):
+
+	# Unpack from memory or file to disk
+	f = zipfile.ZipFile(archive)
+	f.extractall(path = target_directory) # Directory created if required
+	f.close()
+
+	# Version without micro, e.g. "36"
+	version_short = '%s%s' % (version.split('.')[0], version.split('.')[1])
+
+	# Get path of Python library zip
+	library_zip_path = os.path.join(target_directory, 'python%s.zip' % version_short)
+
+	# Unpack Python library from embedded zip on disk
+	f = zipfile.ZipFile(library_zip_path, 'r')
+	f.extractall(path = os.path.join(target_directory, 'Lib')) # Directory created if required
+	f.close()
+
+	# Remove path configuration (if present) and Python library zip from disk
+	pth_path = os.path.join(target_directory, 'python%s._pth' % version_short)
+	if os.path.isfile(pth_path):
+		os.remove(pth_path)
+	os.remove(library_zip_path)
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	src/zugbruecke/core/wire.py: Binary wire format for routine calls
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import ctypes
+import struct
+
+from .const import (
+	GROUP_VOID,
+	GROUP_FUNDAMENTAL
+	)
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+# Pickled messages start with b'\x80', binary frames with this
+WIRE_MAGIC = b'ZB'
+
+# Must match on both sides, otherwise the session falls back to pickle
+WIRE_VERSION = 4
+
+WIRE_KIND_REQUEST = 0
+WIRE_KIND_RESPONSE = 1
+
+# Magic, version, kind, routine id
+WIRE_HEADER = struct.Struct('<2sBBI')
+
+# Flags, local address, remote address, wchar length, length, length of data
+WIRE_SEGMENT = struct.Struct('<BQQBQQ')
+WIRE_SEGMENT_COUNT = struct.Struct('<H')
+
+# Offset in shared memory arena, follows segment if flag is set
+WIRE_SEGMENT_OFFSET = struct.Struct('<Q')
+
+SEGMENT_FLAG_A = 1
+SEGMENT_FLAG_REMOTE_A = 2
+SEGMENT_FLAG_W = 4
+SEGMENT_FLAG_SHM = 8
+SEGMENT_FLAG_PATCH = 16
+SEGMENT_FLAG_BUFFER = 32
+
+# ctypes type codes with identical meaning in struct's standard size mode
+CTYPES_STRUCT_CODES = {
+	code: code for code in ('b', 'B', 'h', 'H', 'i', 'I', 'l', 'L', 'q', 'Q', 'f', 'd', '?', 'c')
+	}
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def decode_wire_id(frame):
+
+	return WIRE_HEADER.unpack_from(frame)[3]
+
+
+def get_wire_codec(argtypes_d, restype_d):
+	"""
+	Returns a codec if all arguments are fundamental values or memsync pointers
+	and the return value is a fundamental value or void - otherwise None
+	"""
+
+	arg_code_list = [__get_struct_code__(arg_d) for arg_d in argtypes_d]
+	if None in arg_code_list:
+		return None
+
+	return_code = __get_struct_code__(restype_d)
+	if return_code is None:
+		return None
+
+	return wire_codec_class(arg_code_list, return_code)
+
+
+def is_wire_frame(frame):
+
+	return frame[:2] == WIRE_MAGIC
+
+
+def __get_struct_code__(datatype_d):
+
+	# Flags or arrays involved
+	if len(datatype_d['f']) > 0:
+		# Pointers handled by memsync are shipped as None
+		if datatype_d['g'] == GROUP_VOID and datatype_d['s']:
+			return ''
+		return None
+
+	# Void, i.e. no return value
+	if datatype_d['g'] == GROUP_VOID:
+		return ''
+
+	# Only fundamental types beyond this point
+	if datatype_d['g'] != GROUP_FUNDAMENTAL:
+		return None
+
+	datatype = getattr(ctypes, datatype_d['t'], None)
+	if datatype is None:
+		return None
+
+	return CTYPES_STRUCT_CODES.get(datatype._type_, None)
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS: Wire codec
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+class wire_codec_class:
+
+
+	def __init__(self, arg_code_list, return_code):
+
+		# Number of expected arguments
+		self.argc = len(arg_code_list)
+
+		# Indices of arguments in the scalar block, all others are memsync pointers
+		self.arg_index_list = [index for index, code in enumerate(arg_code_list) if code != '']
+		self.args = struct.Struct('<' + ''.join(arg_code_list))
+
+		# Return value block, empty for void
+		self.has_return = return_code != ''
+		self.ret = struct.Struct('<' + return_code)
+
+
+	def decode_request(self, frame):
+
+		offset = WIRE_HEADER.size
+
+		# Rebuild argument message list, memsync pointers are None
+		args_message = [(None, None)] * self.argc
+		for index, value in zip(self.arg_index_list, self.args.unpack_from(frame, offset)):
+			args_message[index] = (None, value)
+		offset += self.args.size
+
+		return args_message, self.__decode_memory_list__(frame, offset)
+
+
+	def decode_response(self, frame):
+
+		offset = WIRE_HEADER.size
+
+		# Is there a return value?
+		has_return = frame[offset]
+		offset += 1
+		if self.has_return and has_return:
+			return_msg = self.ret.unpack_from(frame, offset)[0]
+		else:
+			return_msg = None
+		offset += self.ret.size
+
+		return return_msg, self.__decode_memory_list__(frame, offset)
+
+
+	def encode_request(self, wire_id, args_tuple, mem_package_list):
+		"""
+		Returns None if arguments do not fit, the caller then falls back to pickle
+		"""
+
+		# Unexpected number of arguments, let the generic path handle it
+		if len(args_tuple) != self.argc:
+			return None
+
+		try:
+			scalar_block = self.args.pack(*(
+				getattr(args_tuple[index], 'value', args_tuple[index]) for index in self.arg_index_list
+				))
+		except (struct.error, OverflowError):
+			return None
+
+		return b''.join([
+			WIRE_HEADER.pack(WIRE_MAGIC, WIRE_VERSION, WIRE_KIND_REQUEST, wire_id),
+			scalar_block,
+			] + self.__encode_memory_list__(mem_package_list))
+
+
+	def encode_response(self, wire_id, return_msg, mem_package_list):
+		"""
+		Returns None if the return value does not fit, the caller then falls back to pickle
+		"""
+
+		try:
+			if self.has_return and return_msg is not None:
+				return_block = b'\x01' + self.ret.pack(return_msg)
+			else:
+				return_block = b'\x00' + bytes(self.ret.size)
+		except (struct.error, OverflowError):
+			return None
+
+		return b''.join([
+			WIRE_HEADER.pack(WIRE_MAGIC, WIRE_VERSION, WIRE_KIND_RESPONSE, wire_id),
+			return_block
+			] + self.__encode_memory_list__(mem_package_list))
+
+
+	def __decode_memory_list__(self, frame, offset):
+
+		mem_package_list = []
+
+		count = WIRE_SEGMENT_COUNT.unpack_from(frame, offset)[0]
+		offset += WIRE_SEGMENT_COUNT.size
+
+		for _ in range(count):
+
+			flags, a, _a, w, l, data_len = WIRE_SEGMENT.unpack_from(frame, offset)
+			offset += WIRE_SEGMENT.size
+
+			memory_d = {
+				'd': bytes(frame[offset:offset + data_len]),
+				'l': l,
+				'a': a if flags & SEGMENT_FLAG_A else None,
+				'_a': _a if flags & SEGMENT_FLAG_REMOTE_A else None,
+				'w': w if flags & SEGMENT_FLAG_W else None
+				}
+			offset += data_len
+
+			if flags & SEGMENT_FLAG_SHM:
+				memory_d['o'] = WIRE_SEGMENT_OFFSET.unpack_from(frame, offset)[0]
+				offset += WIRE_SEGMENT_OFFSET.size
+
+			# Data is a patch of changed ranges
+			if flags & SEGMENT_FLAG_PATCH:
+				memory_d['p'] = True
+
+			# Pointer to a remote buffer
+			if flags & SEGMENT_FLAG_BUFFER:
+				memory_d['r'] = True
+
+			mem_package_list.append(memory_d)
+
+		return mem_package_list
+
+
+	def __encode_memory_list__(self, mem_package_list):
+
+		chunk_list = [WIRE_SEGMENT_COUNT.pack(len(mem_package_list))]
+
+		for memory_d in mem_package_list:
+
+			flags = (
+				(SEGMENT_FLAG_A if memory_d['a'] is not None else 0) |
+				(SEGMENT_FLAG_REMOTE_A if memory_d['_a'] is not None else 0) |
+				(SEGMENT_FLAG_W if memory_d['w'] is not None else 0) |
+				(SEGMENT_FLAG_SHM if 'o' in memory_d else 0) |
+				(SEGMENT_FLAG_PATCH if memory_d.get('p', False) else 0) |
+				(SEGMENT_FLAG_BUFFER if memory_d.get('r', False) else 0)
+				)
+
+			chunk_list.append(WIRE_SEGMENT.pack(
+				flags, memory_d['a'] or 0, memory_d['_a'] or 0, memory_d['w'] or 0,
+				memory_d['l'], len(memory_d['d'])
+				))
+			chunk_list.append(memory_d['d'])
+
+			if 'o' in memory_d:
+				chunk_list.append(WIRE_SEGMENT_OFFSET.pack(memory_d['o']))
+
+		return chunk_list
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_acall.py: Tests asyncio flavour of routine calls
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import asyncio
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+elif platform.startswith('win'):
+	import ctypes
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+@pytest.mark.skipif(platform.startswith('win'), reason = 'asyncio flavour is specific to zugbruecke')
+def test_acall():
+
+	session = ctypes.session()
+	loop = asyncio.new_event_loop()
+	asyncio.set_event_loop(loop)
+
+	try:
+
+		dll = loop.run_until_complete(session.load_library_async('tests/demo_dll.dll', 'windll'))
+
+		gcd = dll.cookbook_gcd
+		gcd.argtypes = (ctypes.c_int, ctypes.c_int)
+		gcd.restype = ctypes.c_int
+
+		rem = ctypes.c_int()
+		divide = dll.cookbook_divide
+		divide.argtypes = (ctypes.c_int, ctypes.c_int, ctypes.POINTER(ctypes.c_int))
+		divide.restype = ctypes.c_int
+
+		def gather():
+			return asyncio.gather(
+				*([gcd.acall(x, 42) for x in range(1, 101)] + [divide.acall(42, 8, rem)])
+				)
+
+		result_list = loop.run_until_complete(gather())
+
+		assert [gcd(x, 42) for x in range(1, 101)] == result_list[:-1]
+		assert (5, 2) == (result_list[-1], rem.value)
+
+	finally:
+
+		asyncio.set_event_loop(None)
+		loop.close()
+		session.terminate()
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_argdirs.py: Tests directions of arguments
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+elif platform.startswith('win'):
+	import ctypes
+
+# Directions of arguments are not part of ctypes
+pytestmark = pytest.mark.skipif(platform.startswith('win'), reason = 'zugbruecke only')
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES AND ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+color_type = ctypes.c_ubyte * 3
+
+
+def get_divide(dll, argdirs):
+
+	# int divide(int, int, int *)
+	divide = dll.cookbook_divide
+	divide.argtypes = (ctypes.c_int, ctypes.c_int, ctypes.POINTER(ctypes.c_int))
+	divide.restype = ctypes.c_int
+	divide.argdirs = argdirs
+
+	return divide
+
+
+def get_mix_rgb_colors(dll, argdirs):
+
+	# void mix_rgb_colors(int8_t [3], int8_t [3], int8_t *)
+	mix_rgb_colors = dll.mix_rgb_colors
+	mix_rgb_colors.argtypes = (color_type, color_type, ctypes.POINTER(color_type))
+	mix_rgb_colors.argdirs = argdirs
+
+	return mix_rgb_colors
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+@pytest.mark.parametrize('argdirs', [None, ['in', 'in', 'out'], ('in', 'in', 'inout')])
+def test_argdirs_divide(argdirs):
+
+	session = ctypes.session()
+	divide = get_divide(session.load_library('tests/demo_dll.dll', 'windll'), argdirs)
+
+	rem = ctypes.c_int(99)
+	assert 5 == divide(42, 8, ctypes.byref(rem))
+	assert 2 == rem.value
+
+	session.terminate()
+
+
+def test_argdirs_inferred():
+
+	session = ctypes.session()
+	divide = get_divide(session.load_library('tests/demo_dll.dll', 'windll'), None)
+
+	rem = ctypes.c_int(99)
+	assert 5 == divide(42, 8, ctypes.byref(rem))
+	assert divide.argdirs_d == ['in', 'in', 'inout']
+
+	session.terminate()
+
+
+def test_argdirs_out_not_sent():
+
+	session = ctypes.session()
+	mix_rgb_colors = get_mix_rgb_colors(session.load_library('tests/demo_dll.dll', 'windll'), ['in', 'in', 'out'])
+
+	color_a, color_b, color_mixed = color_type(10, 20, 30), color_type(30, 40, 50), color_type(1, 2, 3)
+	mix_rgb_colors(color_a, color_b, ctypes.pointer(color_mixed))
+	assert color_mixed[:] == [20, 30, 40]
+
+	# Contents of output are not packed, inputs are
+	arg_message_list = mix_rgb_colors.__arg_list_pack__((color_a, color_b, ctypes.pointer(color_mixed)))
+	assert [message for _, message in arg_message_list] == [bytes(color_a), bytes(color_b), None]
+
+	session.terminate()
+
+
+def test_argdirs_in_not_synced():
+
+	session = ctypes.session()
+	mix_rgb_colors = get_mix_rgb_colors(session.load_library('tests/demo_dll.dll', 'windll'), ['in', 'in', 'in'])
+
+	# Routine writes into output, but it is declared as input
+	color_mixed = color_type(1, 2, 3)
+	mix_rgb_colors(color_type(10, 20, 30), color_type(30, 40, 50), ctypes.pointer(color_mixed))
+	assert color_mixed[:] == [1, 2, 3]
+
+	session.terminate()
+
+
+def get_replace_letter(dll, argdirs):
+
+	# void replace_letter_in_null_terminated_string_b(char *, char, char)
+	replace_letter = dll.replace_letter_in_null_terminated_string_b
+	replace_letter.argtypes = (ctypes.c_char_p, ctypes.c_char, ctypes.c_char)
+	replace_letter.argdirs = argdirs
+
+	return replace_letter
+
+
+def test_argdirs_string_inferred():
+
+	session = ctypes.session()
+	replace_letter = get_replace_letter(session.load_library('tests/demo_dll.dll', 'windll'), None)
+
+	# Routine writes into string, which is synced back like before there were directions
+	string = ctypes.c_char_p(b'zebra')
+	replace_letter(string, b'e', b'a')
+	assert string.value == b'zabra'
+	assert replace_letter.argdirs_d == ['inout', 'in', 'in']
+
+	session.terminate()
+
+
+def test_argdirs_string_out():
+
+	session = ctypes.session()
+	replace_letter = get_replace_letter(session.load_library('tests/demo_dll.dll', 'windll'), ['out', 'in', 'in'])
+
+	# Contents of strings must be sent
+	with pytest.raises(ValueError):
+		replace_letter(ctypes.c_char_p(b'zebra'), b'e', b'a')
+
+	session.terminate()
+
+
+@pytest.mark.parametrize('argdirs', [['out', 'in', 'out'], ['in', 'in'], ['in', 'in', 'sideways']])
+def test_argdirs_invalid(argdirs):
+
+	session = ctypes.session()
+	divide = get_divide(session.load_library('tests/demo_dll.dll', 'windll'), argdirs)
+
+	with pytest.raises(ValueError):
+		divide(42, 8, ctypes.byref(ctypes.c_int()))
+
+	session.terminate()
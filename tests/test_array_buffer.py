@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_array_buffer.py: Test arrays passed as one contiguous buffer
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import array
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+elif platform.startswith('win'):
+	import ctypes
+
+# Buffers other than ctypes arrays are specific to zugbruecke
+pytestmark = pytest.mark.skipif(platform.startswith('win'), reason = 'zugbruecke only')
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES AND ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+EQ_SYS = [1, 2, 3, 2, 1, 1, 1, 2, 3, 3, 1, 0]
+EQ_SYS_ELIMINATED = [1, 2, 3, 2, 0, -1, -2, 0, 0, 0, -2, -6]
+EQ_SYS_SOLUTION = [5, -6, 3]
+
+
+def get_gauss_elimination(argtypes):
+
+	# void gauss_elimination(float [3][4] *, float [3] *)
+	gauss_elimination = ctypes.windll.LoadLibrary('tests/demo_dll.dll').gauss_elimination
+	gauss_elimination.argtypes = argtypes
+
+	return gauss_elimination
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def test_array_buffer_packed_as_bytes():
+
+	gauss_elimination = get_gauss_elimination((ctypes.POINTER(ctypes.c_float * 4 * 3), ctypes.POINTER(ctypes.c_float * 3)))
+
+	A = (ctypes.c_float * 4 * 3)(*(tuple(EQ_SYS[index:index + 4]) for index in range(0, 12, 4)))
+	x = (ctypes.c_float * 3)()
+	gauss_elimination(ctypes.pointer(A), ctypes.pointer(x))
+	assert x[:] == EQ_SYS_SOLUTION
+
+	# One blob per array, no lists of elements
+	arg_message_list = gauss_elimination.__arg_list_pack__((ctypes.pointer(A), ctypes.pointer(x)))
+	assert [message for _, message in arg_message_list] == [bytes(A), bytes(x)]
+
+
+def test_array_buffer_array_module():
+
+	gauss_elimination = get_gauss_elimination((ctypes.POINTER(ctypes.c_float * 4 * 3), ctypes.POINTER(ctypes.c_float * 3)))
+
+	A, x = array.array('f', EQ_SYS), array.array('f', [0, 0, 0])
+	gauss_elimination(A, x)
+	assert (A.tolist(), x.tolist()) == (EQ_SYS_ELIMINATED, EQ_SYS_SOLUTION)
+
+
+def test_array_buffer_size_mismatch():
+
+	gauss_elimination = get_gauss_elimination((ctypes.POINTER(ctypes.c_float * 4 * 3), ctypes.POINTER(ctypes.c_float * 3)))
+
+	with pytest.raises(ValueError):
+		gauss_elimination(array.array('f', EQ_SYS[:-1]), array.array('f', [0, 0, 0]))
+
+
+def test_array_buffer_numpy():
+
+	numpy = pytest.importorskip('numpy')
+
+	gauss_elimination = get_gauss_elimination((
+		numpy.ctypeslib.ndpointer(dtype = numpy.float32, shape = (3, 4)),
+		numpy.ctypeslib.ndpointer(dtype = numpy.float32, shape = (3,))
+		))
+
+	A, x = numpy.array(EQ_SYS, dtype = numpy.float32).reshape(3, 4), numpy.zeros(3, dtype = numpy.float32)
+	gauss_elimination(A, x)
+	assert (A.flatten().tolist(), x.tolist()) == (EQ_SYS_ELIMINATED, EQ_SYS_SOLUTION)
+
+
+def test_array_buffer_numpy_memsync():
+
+	numpy = pytest.importorskip('numpy')
+
+	# void bubblesort(float *, int)
+	bubblesort = ctypes.windll.LoadLibrary('tests/demo_dll.dll').bubblesort
+	bubblesort.memsync = [
+		{
+			'p': [0],
+			'l': [1],
+			't': 'c_float'
+			}
+		]
+	bubblesort.argtypes = (numpy.ctypeslib.ndpointer(dtype = numpy.float32), ctypes.c_int)
+
+	values = numpy.array([5.74, 3.72, 6.28, 8.6, 9.34], dtype = numpy.float32)
+	bubblesort(values, len(values))
+	assert values.tolist() == pytest.approx([3.72, 5.74, 6.28, 8.6, 9.34])
+
+	with pytest.raises(ValueError):
+		bubblesort(numpy.zeros(10, dtype = numpy.float32)[::2], 5)
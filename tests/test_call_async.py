@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_call_async.py: Tests asynchronous routine calls
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from concurrent.futures import Future
+from multiprocessing import Pipe
+import pickle
+from threading import Thread
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+	from zugbruecke.core.rpc import (
+		mp_client_class,
+		RPC_REQUEST_ID
+		)
+elif platform.startswith('win'):
+	import ctypes
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES AND ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+class sample_class:
+
+
+	def __init__(self, session):
+
+		self.__dll__ = session.load_library('tests/demo_dll.dll', 'windll')
+
+		# int gcd(int, int)
+		self.gcd = self.__dll__.cookbook_gcd
+		self.gcd.argtypes = (ctypes.c_int, ctypes.c_int)
+		self.gcd.restype = ctypes.c_int
+
+		# int divide(int, int, int *)
+		self.divide = self.__dll__.cookbook_divide
+		self.divide.argtypes = (ctypes.c_int, ctypes.c_int, ctypes.POINTER(ctypes.c_int))
+		self.divide.restype = ctypes.c_int
+
+		# void bubblesort(float *, int)
+		self.bubblesort = self.__dll__.bubblesort
+		self.bubblesort.memsync = [
+			{
+				'p': [0],
+				'l': [1],
+				't': 'c_float'
+				}
+			]
+		self.bubblesort.argtypes = (ctypes.POINTER(ctypes.c_float), ctypes.c_int)
+
+
+def answer(server, result, request_id = None):
+
+	# Receive request, answer with given (or its own) request ID
+	request = server.recv_bytes()
+	if request_id is None:
+		request_id = RPC_REQUEST_ID.unpack_from(request)[0]
+	server.send_bytes(RPC_REQUEST_ID.pack(request_id) + pickle.dumps(result))
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+pytestmark = pytest.mark.skipif(platform.startswith('win'), reason = 'asynchronous calls are specific to zugbruecke')
+
+
+@pytest.mark.parametrize('rpc_workers', [1, 4])
+def test_call_async(rpc_workers):
+
+	session = ctypes.session({'rpc_workers': rpc_workers})
+	sample = sample_class(session)
+
+	# Many calls in flight
+	future_list = [sample.gcd.call_async(x, 42) for x in range(1, 201)]
+	assert all(isinstance(future, Future) for future in future_list)
+	assert [sample.gcd(x, 42) for x in range(1, 201)] == [future.result() for future in future_list]
+
+	# Arguments by reference are synced once future is done
+	rem_list = [ctypes.c_int() for _ in range(20)]
+	future_list = [sample.divide.call_async(x + 10, 3, rem) for x, rem in enumerate(rem_list)]
+	assert [(x + 10) // 3 for x in range(20)] == [future.result() for future in future_list]
+	assert [(x + 10) % 3 for x in range(20)] == [rem.value for rem in rem_list]
+
+	# Memory is synced once future is done
+	values_list = [[float((x * 7 + y * 3) % 11) for y in range(10)] for x in range(20)]
+	array_list = [(ctypes.c_float * len(values))(*values) for values in values_list]
+	future_list = [
+		sample.bubblesort.call_async(ctypes.cast(ctypes.pointer(array), ctypes.POINTER(ctypes.c_float)), len(array))
+		for array in array_list
+		]
+	for future in future_list:
+		future.result()
+	assert [sorted(values) for values in values_list] == [array[:] for array in array_list]
+
+	session.terminate()
+
+
+def test_call_async_error():
+
+	session = ctypes.session()
+	sample = sample_class(session)
+
+	with pytest.raises(TypeError):
+		sample.gcd.call_async(1)
+
+	assert 7 == sample.gcd.call_async(35, 42).result()
+
+	session.terminate()
+
+
+def test_call_async_connection_lost():
+
+	server, connection = Pipe()
+	client = mp_client_class(None, None, connection = connection)
+
+	# Server goes away while call is in flight
+	future = client.get_function_async('routine')()
+	server.recv_bytes()
+	server.close()
+	with pytest.raises(EOFError):
+		future.result(timeout = 10)
+
+	# Later requests fail right away instead of waiting forever
+	with pytest.raises(EOFError):
+		client.get_function_async('routine')()
+	with pytest.raises(EOFError):
+		client.get_function('routine')()
+
+
+def test_call_sync_mismatching_request_id():
+
+	server, connection = Pipe()
+	client = mp_client_class(None, None, connection = connection)
+
+	# Answer to another request, stream can not be trusted any longer
+	t = Thread(target = answer, args = (server, 'unexpected', 12345))
+	t.start()
+	with pytest.raises(ConnectionError):
+		client.get_function('routine')()
+	t.join()
+
+	# Client is broken from now on
+	with pytest.raises(EOFError):
+		client.get_function('routine')()
+
+
+def test_call_async_unknown_request_id():
+
+	server, connection = Pipe()
+	client = mp_client_class(None, None, connection = connection)
+
+	# Answer to a request nobody is waiting for is dropped, reader keeps going
+	future = client.get_function_async('routine')()
+	request_id = RPC_REQUEST_ID.unpack_from(server.recv_bytes())[0]
+	server.send_bytes(RPC_REQUEST_ID.pack(request_id + 1) + pickle.dumps('unexpected'))
+	server.send_bytes(RPC_REQUEST_ID.pack(request_id) + pickle.dumps('expected'))
+	assert future.result(timeout = 10) == 'expected'
+
+	# Duplicate answer is dropped as well
+	server.send_bytes(RPC_REQUEST_ID.pack(request_id) + pickle.dumps('duplicate'))
+	future = client.get_function_async('routine')()
+	answer(server, 'expected again')
+	assert future.result(timeout = 10) == 'expected again'
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_call_many.py: Tests batched routine calls
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+elif platform.startswith('win'):
+	import ctypes
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES AND ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+class sample_class:
+
+
+	def __init__(self):
+
+		self.__dll__ = ctypes.windll.LoadLibrary('tests/demo_dll.dll')
+
+		# int gcd(int, int)
+		self.gcd = self.__dll__.cookbook_gcd
+		self.gcd.argtypes = (ctypes.c_int, ctypes.c_int)
+		self.gcd.restype = ctypes.c_int
+
+		# int in_mandel(double, double, int)
+		self.in_mandel = self.__dll__.cookbook_in_mandel
+		self.in_mandel.argtypes = (ctypes.c_double, ctypes.c_double, ctypes.c_int)
+		self.in_mandel.restype = ctypes.c_int
+
+		# int divide(int, int, int *)
+		self.divide = self.__dll__.cookbook_divide
+		self.divide.argtypes = (ctypes.c_int, ctypes.c_int, ctypes.POINTER(ctypes.c_int))
+		self.divide.restype = ctypes.c_int
+
+		# void bubblesort(float *, int)
+		self.bubblesort = self.__dll__.bubblesort
+		self.bubblesort.memsync = [
+			{
+				'p': [0],
+				'l': [1],
+				't': 'c_float'
+				}
+			]
+		self.bubblesort.argtypes = (ctypes.POINTER(ctypes.c_float), ctypes.c_int)
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+pytestmark = pytest.mark.skipif(platform.startswith('win'), reason = 'batched calls are specific to zugbruecke')
+
+
+def test_call_many_gcd():
+
+	sample = sample_class()
+
+	assert [7, 1, 5] == sample.gcd.call_many([(35, 42), (17, 4), (5, 10)])
+	assert [] == sample.gcd.call_many([])
+
+
+def test_map_in_mandel():
+
+	sample = sample_class()
+
+	assert [1, 0, 1] == sample.in_mandel.map([0.0, 2.0, -0.5], [0.0, 1.0, 0.5], [500, 500, 500])
+
+
+def test_call_many_divide():
+
+	sample = sample_class()
+
+	rem_list = [ctypes.c_int() for _ in range(3)]
+	quot_list = sample.divide.call_many([(42, 8, rem_list[0]), (10, 3, rem_list[1]), (9, 3, rem_list[2])])
+
+	assert [5, 3, 3] == quot_list
+	assert [2, 1, 0] == [rem.value for rem in rem_list]
+
+
+def test_call_many_memsync():
+
+	sample = sample_class()
+
+	values_list = [[5.0, 3.0, 6.0, 8.0], [2.0, 1.0], [9.0, 4.0, 7.0]]
+	array_list = [(ctypes.c_float * len(values))(*values) for values in values_list]
+
+	sample.bubblesort.call_many([
+		(ctypes.cast(ctypes.pointer(array), ctypes.POINTER(ctypes.c_float)), len(array))
+		for array in array_list
+		])
+
+	assert [sorted(values) for values in values_list] == [array[:] for array in array_list]
+
+
+def test_call_many_errors():
+
+	sample = sample_class()
+
+	with pytest.raises(TypeError):
+		sample.gcd.call_many([(35, 42), (17,), (5, 10)])
+
+	return_value_list = sample.gcd.call_many([(35, 42), (17,), (5, 10)], return_exceptions = True)
+
+	assert 7 == return_value_list[0]
+	assert isinstance(return_value_list[1], TypeError)
+	assert 5 == return_value_list[2]
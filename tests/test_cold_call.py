@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_cold_call.py: Test registration, configuration and first call in one round trip
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+elif platform.startswith('win'):
+	import ctypes
+
+# Round trips are specific to zugbruecke
+pytestmark = pytest.mark.skipif(platform.startswith('win'), reason = 'zugbruecke only')
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def fail_on_rpc(*args):
+
+	raise AssertionError('separate round trip although first call should do it all')
+
+
+def get_gcd(dll):
+
+	gcd = dll.cookbook_gcd
+	gcd.argtypes = (ctypes.c_int, ctypes.c_int)
+	gcd.restype = ctypes.c_int
+
+	return gcd
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def test_cold_call_configures():
+
+	session = ctypes.session()
+	dll = session.load_library('tests/demo_dll.dll', 'windll')
+
+	gcd = get_gcd(dll)
+	gcd.__configure_on_server__ = fail_on_rpc
+
+	assert gcd(35, 42) == 7
+	assert gcd(12, 18) == 6
+
+	session.terminate()
+
+
+def test_cold_call_lazy_registration():
+
+	session = ctypes.session({'lazy_routines': True})
+	dll = session.load_library('tests/demo_dll.dll', 'windll')
+	dll.__register_routine_on_server__ = fail_on_rpc
+
+	gcd = get_gcd(dll)
+	assert gcd.handles is None
+
+	assert gcd(35, 42) == 7
+	assert gcd.handles is not None
+	assert gcd(12, 18) == 6
+
+	session.terminate()
+
+
+def test_cold_call_lazy_missing_routine():
+
+	session = ctypes.session({'lazy_routines': True})
+	dll = session.load_library('tests/demo_dll.dll', 'windll')
+
+	# Not exported, so the Wine side checks the name along with the first call
+	with pytest.raises(AttributeError):
+		dll.missing_routine()
+
+	session.terminate()
+
+
+def test_cold_call_lazy_call_many():
+
+	session = ctypes.session({'lazy_routines': True})
+	dll = session.load_library('tests/demo_dll.dll', 'windll')
+
+	# Routine is registered and configured separately before the first batch
+	assert get_gcd(dll).map([35, 12], [42, 18]) == [7, 6]
+
+	session.terminate()
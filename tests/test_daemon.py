@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_daemon.py: Tests sessions attached to a shared daemon
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+elif platform.startswith('win'):
+	import ctypes
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES AND ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+class sample_class:
+
+
+	def __init__(self, session, data):
+
+		self.__dll__ = session.load_library('tests/demo_dll.dll', 'windll')
+
+		# int gcd(int, int)
+		self.gcd = self.__dll__.cookbook_gcd
+		self.gcd.argtypes = (ctypes.c_int, ctypes.c_int)
+		self.gcd.restype = ctypes.c_int
+
+		conveyor_belt = session.ctypes_WINFUNCTYPE(ctypes.c_int16, ctypes.c_int16)
+
+		# int16_t sum_elements_from_callback(int16_t, conveyor_belt)
+		self.__sum_elements_from_callback__ = self.__dll__.sum_elements_from_callback
+		self.__sum_elements_from_callback__.argtypes = (ctypes.c_int16, conveyor_belt)
+		self.__sum_elements_from_callback__.restype = ctypes.c_int16
+
+		self.DATA = data
+
+		@conveyor_belt
+		def get_data(index):
+			return self.DATA[index]
+
+		self.__get_data__ = get_data
+
+
+	def sum_elements_from_callback(self):
+
+		return self.__sum_elements_from_callback__(len(self.DATA), self.__get_data__)
+
+
+def get_daemon_state_path(session):
+
+	return os.path.join(session.p['dir'], 'daemon_%s-python%s_%s.json' % (
+		session.p['arch'], session.p['version'], session.p['daemon_id']
+		))
+
+
+def get_daemon_port(session):
+
+	with open(get_daemon_state_path(session), 'r') as f:
+		return json.loads(f.read())['port']
+
+
+def run_killed_session(parameter, connection):
+
+	session = ctypes.session(parameter)
+	sample = sample_class(session, [1, 2, 3])
+	assert 7 == sample.gcd(35, 42)
+
+	# Tell parent where the daemon is, then die without terminating the session
+	connection.send((get_daemon_state_path(session), get_daemon_port(session)))
+	os.kill(os.getpid(), signal.SIGKILL)
+
+
+def is_listening(port):
+
+	try:
+		socket.create_connection(('localhost', port)).close()
+	except OSError:
+		return False
+	return True
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+pytestmark = pytest.mark.skipif(platform.startswith('win'), reason = 'daemons are specific to zugbruecke')
+
+
+def test_daemon_shared():
+
+	daemon_id = 'test_%d' % os.getpid()
+	parameter = {'daemon': True, 'daemon_id': daemon_id, 'daemon_linger': 0}
+
+	session_a = ctypes.session(parameter)
+	sample_a = sample_class(session_a, [1, 6, 8, 4, 9, 7, 4, 2, 5, 2])
+	port = get_daemon_port(session_a)
+
+	session_b = ctypes.session(parameter)
+	sample_b = sample_class(session_b, [3, 3, 3])
+
+	# Second session attached to the same daemon
+	assert port == get_daemon_port(session_b)
+	assert session_a.daemon_port != session_b.daemon_port
+
+	# Callbacks go back to their own session
+	assert 48 == sample_a.sum_elements_from_callback()
+	assert 9 == sample_b.sum_elements_from_callback()
+	assert 7 == sample_a.gcd(35, 42)
+	assert 7 == sample_b.gcd(35, 42)
+
+	# Daemon stays up while a session is attached
+	session_a.terminate()
+	assert 6 == sample_b.gcd(12, 18)
+	assert is_listening(port)
+
+	# Daemon exits once the last session has detached
+	session_b.terminate()
+	for _ in range(100):
+		if not is_listening(port):
+			break
+		time.sleep(0.1)
+	assert not is_listening(port)
+
+	os.remove(get_daemon_state_path(session_b))
+	os.remove(get_daemon_state_path(session_b) + '.lock')
+
+
+def test_daemon_killed_client():
+
+	daemon_id = 'test_killed_%d' % os.getpid()
+	parameter = {'daemon': True, 'daemon_id': daemon_id, 'daemon_linger': 0}
+
+	context = multiprocessing.get_context('fork')
+	connection_parent, connection_child = context.Pipe()
+	process = context.Process(target = run_killed_session, args = (parameter, connection_child))
+	process.start()
+	assert connection_parent.poll(60)
+	state_path, port = connection_parent.recv()
+	process.join()
+	assert process.exitcode == -signal.SIGKILL
+
+	# Only the owner can read the daemon's key
+	assert os.stat(state_path).st_mode & 0o077 == 0
+
+	# Daemon detaches the lost session and exits after its linger time
+	for _ in range(100):
+		if not is_listening(port):
+			break
+		time.sleep(0.1)
+	assert not is_listening(port)
+
+	os.remove(state_path)
+	os.remove(state_path + '.lock')
+
+
+def test_daemon_workers():
+
+	with pytest.raises(ValueError):
+		ctypes.session({'daemon': True, 'workers': 2})
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_log_lazy.py: Tests deferred formatting of log messages
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+elif platform.startswith('win'):
+	import ctypes
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES AND ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+class counting_int(ctypes.c_int):
+
+
+	repr_count = 0
+
+
+	def __repr__(self):
+
+		counting_int.repr_count += 1
+		return 'counting_int(%d)' % self.value
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+@pytest.mark.skipif(platform.startswith('win'), reason = 'logging is specific to zugbruecke')
+@pytest.mark.parametrize('log_level', [0, 1])
+def test_log_lazy(log_level):
+
+	session = ctypes.session({'log_level': log_level, 'stdout': False, 'stderr': False})
+
+	gcd = session.load_library('tests/demo_dll.dll', 'windll').cookbook_gcd
+	gcd.argtypes = (ctypes.c_int, ctypes.c_int)
+	gcd.restype = ctypes.c_int
+
+	counting_int.repr_count = 0
+	assert 7 == gcd(counting_int(35), 42)
+
+	if log_level == 0:
+		assert counting_int.repr_count == 0
+		assert len(session.log.log['out']) == 0
+	else:
+		assert counting_int.repr_count > 0
+		assert any('counting_int(35)' in message['cnt'] for message in session.log.log['out'])
+
+	session.terminate()
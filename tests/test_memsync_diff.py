@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_memsync_diff.py: Tests sending changed ranges of memory only
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+	from zugbruecke.core.data import mem_contents
+	from zugbruecke.core.data.memory import (
+		generate_patch_from_bytes,
+		overwrite_pointer_with_patch
+		)
+elif platform.startswith('win'):
+	import ctypes
+
+# Changed ranges are specific to zugbruecke
+pytestmark = pytest.mark.skipif(platform.startswith('win'), reason = 'zugbruecke only')
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES AND ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def get_bubblesort(dll, threshold):
+
+	# void bubblesort(float *, int)
+	bubblesort = dll.bubblesort
+	bubblesort.memsync = [
+		{
+			'p': [0],
+			'l': [1],
+			't': 'c_float',
+			'c': threshold
+			}
+		]
+	bubblesort.argtypes = (ctypes.POINTER(ctypes.c_float), ctypes.c_int)
+
+	return bubblesort
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+@pytest.mark.parametrize('block_list, is_patch', [
+	([], True), ([0], True), ([1, 2, 5], True), ([9], True), (list(range(10)), False)
+	])
+def test_memsync_diff_patch(block_list, is_patch):
+
+	old_bytes = bytes(10 * 64)
+	new_array = bytearray(old_bytes)
+	for block in block_list:
+		new_array[block * 64 + 7] = 1
+	new_bytes = bytes(new_array)
+
+	patch = generate_patch_from_bytes(old_bytes, new_bytes, 64)
+	assert (patch is not None) == is_patch
+	if patch is None:
+		return
+	assert len(patch) < len(new_bytes)
+
+	buffer = ctypes.create_string_buffer(old_bytes, len(old_bytes))
+	overwrite_pointer_with_patch(ctypes.addressof(buffer), patch)
+	assert buffer.raw == new_bytes
+
+
+@pytest.mark.parametrize('wire', ['binary', 'pickle'])
+@pytest.mark.parametrize('threshold, is_patch', [(0, True), (None, False), (1024 * 1024, False)])
+def test_memsync_diff_bubblesort(monkeypatch, wire, threshold, is_patch):
+
+	# Count patches applied on the Unix side
+	patch_list = []
+	def overwrite_pointer_with_patch_spy(address, patch):
+		patch_list.append(len(patch))
+		overwrite_pointer_with_patch(address, patch)
+	monkeypatch.setattr(mem_contents, 'overwrite_pointer_with_patch', overwrite_pointer_with_patch_spy)
+
+	session = ctypes.session({'wire': wire, 'shm_size': 0})
+	bubblesort = get_bubblesort(session.load_library('tests/demo_dll.dll', 'windll'), threshold)
+
+	# Sorted, except for the first two elements
+	values = [float(index) for index in range(4096)]
+	values[0], values[1] = values[1], values[0]
+	array = (ctypes.c_float * len(values))(*values)
+	bubblesort(ctypes.cast(ctypes.pointer(array), ctypes.POINTER(ctypes.c_float)), len(array))
+
+	assert array[:] == sorted(values)
+	assert (len(patch_list) == 1) == is_patch
+	if is_patch:
+		assert patch_list[0] < len(values) * ctypes.sizeof(ctypes.c_float)
+
+	session.terminate()
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_memsync_direction.py: Tests directions of memory synchronization
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+elif platform.startswith('win'):
+	import ctypes
+
+# Directions of memory are specific to zugbruecke
+pytestmark = pytest.mark.skipif(platform.startswith('win'), reason = 'zugbruecke only')
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES AND ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+# Sessions with and without shared memory arena
+SESSION_PARAMETER_LIST = [{'shm_size': 0}, {'shm_size': 1024 * 1024, 'shm_threshold': 1}]
+
+
+def get_mix_rgb_colors(dll, direction):
+
+	# void mix_rgb_colors(int8_t [3], int8_t [3], int8_t *)
+	mix_rgb_colors = dll.mix_rgb_colors
+	mix_rgb_colors.argtypes = (
+		ctypes.POINTER(ctypes.c_ubyte), ctypes.POINTER(ctypes.c_ubyte), ctypes.POINTER(ctypes.c_ubyte)
+		)
+	mix_rgb_colors.memsync = [
+		{
+			'p': [index],
+			'l': (),
+			'f': 'lambda: 3',
+			'd': index_direction
+			} for index, index_direction in enumerate(('in', 'in', direction))
+		]
+
+	return mix_rgb_colors
+
+
+def get_replace_letter(dll, direction):
+
+	# void replace_letter_in_null_terminated_string_unicode_a(wchar_t *, wchar_t, wchar_t)
+	replace_letter = dll.replace_letter_in_null_terminated_string_unicode_a
+	replace_letter.argtypes = (ctypes.POINTER(ctypes.c_wchar), ctypes.c_wchar, ctypes.c_wchar)
+	replace_letter.memsync = [
+		{
+			'p': [0],
+			'n': True,
+			'w': True,
+			'd': direction
+			}
+		]
+
+	return replace_letter
+
+
+def to_pointer(array):
+
+	return ctypes.cast(ctypes.pointer(array), ctypes.POINTER(ctypes.c_ubyte))
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+@pytest.mark.parametrize('parameter', SESSION_PARAMETER_LIST)
+@pytest.mark.parametrize('direction', ['out', 'inout'])
+def test_memsync_direction_out(parameter, direction):
+
+	session = ctypes.session(parameter)
+	mix_rgb_colors = get_mix_rgb_colors(session.load_library('tests/demo_dll.dll', 'windll'), direction)
+
+	color_type = ctypes.c_ubyte * 3
+	color_a, color_b, color_mixed = color_type(10, 20, 30), color_type(30, 40, 50), color_type(1, 2, 3)
+	args = (to_pointer(color_a), to_pointer(color_b), to_pointer(color_mixed))
+	mix_rgb_colors(*args)
+	assert color_mixed[:] == [20, 30, 40]
+
+	# Outputs only need their length on the way in
+	mem_package_list = session.data.client_pack_memory_list(args, mix_rgb_colors.memsync_d)
+	assert [memory_d['l'] for memory_d in mem_package_list] == [3, 3, 3]
+	if 'o' not in mem_package_list[2]:
+		assert (mem_package_list[2]['d'] == b'') == (direction == 'out')
+	session.data.client_free_memory_list(mem_package_list)
+
+	session.terminate()
+
+
+@pytest.mark.parametrize('parameter', SESSION_PARAMETER_LIST)
+def test_memsync_direction_in(parameter):
+
+	session = ctypes.session(parameter)
+	mix_rgb_colors = get_mix_rgb_colors(session.load_library('tests/demo_dll.dll', 'windll'), 'in')
+
+	# Routine writes into memory, but it is declared as input
+	color_type = ctypes.c_ubyte * 3
+	color_mixed = color_type(1, 2, 3)
+	mix_rgb_colors(to_pointer(color_type(10, 20, 30)), to_pointer(color_type(30, 40, 50)), to_pointer(color_mixed))
+	assert color_mixed[:] == [1, 2, 3]
+
+	session.terminate()
+
+
+@pytest.mark.parametrize('direction, result', [('in', 'zuguecke'), ('inout', 'zbgbecke'), ('out', '')])
+def test_memsync_direction_null_terminated(direction, result):
+
+	session = ctypes.session()
+	replace_letter = get_replace_letter(session.load_library('tests/demo_dll.dll', 'windll'), direction)
+
+	# Output only is not sent, i.e. routine sees an empty string of the same length
+	string_buffer = ctypes.create_unicode_buffer('zuguecke')
+	replace_letter(ctypes.cast(string_buffer, ctypes.POINTER(ctypes.c_wchar)), 'u', 'b')
+	assert string_buffer.value == result
+
+	session.terminate()
+
+
+def test_memsync_direction_invalid():
+
+	session = ctypes.session()
+	mix_rgb_colors = get_mix_rgb_colors(session.load_library('tests/demo_dll.dll', 'windll'), 'sideways')
+
+	color_type = ctypes.c_ubyte * 3
+	with pytest.raises(ValueError):
+		mix_rgb_colors(*(to_pointer(color_type()) for _ in range(3)))
+
+	session.terminate()
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_pe_exports.py: Test reading export tables of DLL files on the Unix side
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import os
+import struct
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+	from zugbruecke.core.pe_exports import get_pe_exports
+elif platform.startswith('win'):
+	import ctypes
+
+# Export tables are read by zugbruecke only
+pytestmark = pytest.mark.skipif(platform.startswith('win'), reason = 'zugbruecke only')
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def build_pe(name_list, ordinal_base = 1, gap = False, stub = b''):
+	"""
+	Returns minimal 32 bit PE file with one section holding the export table.
+	If gap is set, the address table has an empty entry after the named routines.
+	"""
+
+	edata_rva = 0x1000
+	function_count = len(name_list) + (2 if gap else 0)
+
+	# Export directory, address table, name pointers, name ordinals, names
+	functions_rva = edata_rva + 40
+	names_rva = functions_rva + 4 * function_count
+	name_ordinals_rva = names_rva + 4 * len(name_list)
+	strings_rva = name_ordinals_rva + 2 * len(name_list)
+
+	name_rva_list = []
+	strings = b''
+	for name in name_list:
+		name_rva_list.append(strings_rva + len(strings))
+		strings += name.encode('ascii') + b'\0'
+
+	function_rva_list = [0x2000 + index for index in range(len(name_list))]
+	if gap:
+		function_rva_list += [0, 0x3000]
+
+	edata = b''.join([
+		struct.pack('<IIHHIIIIIII', 0, 0, 0, 0, 0, ordinal_base, function_count, len(name_list),
+			functions_rva, names_rva, name_ordinals_rva),
+		struct.pack('<%dI' % function_count, *function_rva_list),
+		struct.pack('<%dI' % len(name_list), *name_rva_list),
+		struct.pack('<%dH' % len(name_list), *range(len(name_list))),
+		strings
+		])
+
+	# DOS header (and stub), PE header at 0x80
+	dos = (b'MZ' + bytes(0x3a) + struct.pack('<I', 0x80) + stub).ljust(0x80, b'\0')
+
+	# Optional header with 16 data directories, first one is the export table
+	optional = struct.pack('<H', 0x10b) + bytes(90) + struct.pack('<I', 16)
+	optional += struct.pack('<II', edata_rva, len(edata)) + bytes(15 * 8)
+
+	headers = b''.join([
+		dos,
+		b'PE\0\0',
+		struct.pack('<HHIIIHH', 0x14c, 1, 0, 0, 0, len(optional), 0x2102),
+		optional,
+		struct.pack('<8sIIII16x', b'.edata', len(edata), edata_rva, len(edata), 0x200)
+		])
+
+	return headers.ljust(0x200, b'\0') + edata
+
+
+def write_pe(path, *args, **kwargs):
+
+	with open(path, 'wb') as f:
+		f.write(build_pe(*args, **kwargs))
+
+	return path
+
+
+def record_registrations(dll):
+
+	registered_list = []
+	register_routine_on_server = dll.__register_routine_on_server__
+
+	def on_register(name):
+		registered_list.append(name)
+		return register_routine_on_server(name)
+
+	dll.__register_routine_on_server__ = on_register
+
+	return registered_list
+
+
+def configure_gcd(dll):
+
+	gcd = dll.cookbook_gcd
+	gcd.argtypes = (ctypes.c_int, ctypes.c_int)
+	gcd.restype = ctypes.c_int
+
+	return gcd
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def test_pe_exports_parse(tmp_path):
+
+	exports = get_pe_exports(write_pe(str(tmp_path / 'a.dll'), ['foo', 'bar'], ordinal_base = 5, gap = True))
+
+	assert exports.names == {'foo', 'bar'}
+	assert exports.ordinals == {5, 6, 8}
+	assert 'foo' in exports
+	assert 'baz' not in exports
+	assert 6 in exports
+	assert 7 not in exports
+
+
+def test_pe_exports_cache(tmp_path):
+
+	path = write_pe(str(tmp_path / 'a.dll'), ['foo'])
+	exports = get_pe_exports(path)
+	assert get_pe_exports(path) is exports
+
+	# Modified file is read again
+	write_pe(path, ['bar'])
+	os.utime(path, ns = (0, os.stat(path).st_mtime_ns + 10 ** 9))
+	assert get_pe_exports(path) is not exports
+	assert get_pe_exports(path).names == {'bar'}
+
+
+@pytest.mark.parametrize('data', [
+	b'not a DLL',
+	build_pe(['foo'])[:0x100],
+	build_pe([]),
+	build_pe(['foo'], stub = b'Wine placeholder DLL'),
+	])
+def test_pe_exports_invalid(tmp_path, data):
+
+	path = str(tmp_path / 'a.dll')
+	with open(path, 'wb') as f:
+		f.write(data)
+
+	with pytest.raises(ValueError):
+		get_pe_exports(path).names
+
+
+def test_pe_exports_dll():
+
+	session = ctypes.session()
+	dll = session.load_library('tests/demo_dll.dll', 'windll')
+
+	# Names are checked on the Unix side, routines are registered on first call
+	registered_list = record_registrations(dll)
+
+	assert 'cookbook_gcd' in dir(dll)
+	assert configure_gcd(dll)(35, 42) == 7
+	assert registered_list == []
+
+	# Names missing locally are checked on the Wine side
+	with pytest.raises(AttributeError):
+		dll.missing_routine
+	assert registered_list == ['missing_routine']
+
+	session.terminate()
+
+
+def test_pe_exports_dll_decorated(tmp_path):
+
+	session = ctypes.session()
+	dll = session.load_library('tests/demo_dll.dll', 'windll')
+
+	# Export table with decorated stdcall names only
+	dll.__exports__ = get_pe_exports(write_pe(str(tmp_path / 'a.dll'), ['_cookbook_gcd@8']))
+	dll.__exports_read__ = True
+	registered_list = record_registrations(dll)
+
+	# Decorated name counts as export
+	assert configure_gcd(dll)(35, 42) == 7
+	assert registered_list == []
+
+	# Not in the table, but found by the Wine side
+	dll.bubblesort
+	assert registered_list == ['bubblesort']
+
+	# Not found anywhere
+	with pytest.raises(AttributeError):
+		dll.missing_routine
+	assert registered_list == ['bubblesort', 'missing_routine']
+
+	session.terminate()
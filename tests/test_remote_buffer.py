@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_remote_buffer.py: Test memory persisting on the Wine side across calls
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+elif platform.startswith('win'):
+	import ctypes
+
+# Remote buffers are specific to zugbruecke
+pytestmark = pytest.mark.skipif(platform.startswith('win'), reason = 'zugbruecke only')
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES AND ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def get_bubblesort(session):
+
+	# void bubblesort(float *, int)
+	bubblesort = session.load_library('tests/demo_dll.dll', 'windll').bubblesort
+	bubblesort.memsync = [
+		{
+			'p': [0],
+			'l': [1],
+			't': 'c_float'
+			}
+		]
+	bubblesort.argtypes = (ctypes.POINTER(ctypes.c_float), ctypes.c_int)
+
+	return bubblesort
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def test_remote_buffer_pin():
+
+	session = ctypes.session()
+	bubblesort = get_bubblesort(session)
+
+	values = (ctypes.c_float * 5)(5.74, 3.72, 6.28, 8.6, 9.34)
+	with session.pin(values) as remote_values:
+
+		# Data stays on the Wine side, local mirror is untouched
+		for _ in range(3):
+			bubblesort(remote_values, len(values))
+		assert values[0] == pytest.approx(5.74)
+
+		remote_values.pull()
+		assert values[:] == pytest.approx([3.72, 5.74, 6.28, 8.6, 9.34])
+
+	session.terminate()
+
+
+def test_remote_buffer_range():
+
+	session = ctypes.session()
+	bubblesort = get_bubblesort(session)
+
+	remote_values = session.remote_buffer(4 * ctypes.sizeof(ctypes.c_float))
+	values = (ctypes.c_float * 4).from_buffer(remote_values.local)
+
+	# Push only the first two values, then sort them on the Wine side
+	values[:] = [2.0, 1.0, 4.0, 3.0]
+	remote_values.push(0, 8)
+	bubblesort(remote_values, 2)
+	values[:] = [0.0, 0.0, 0.0, 0.0]
+	remote_values.pull(4, 8)
+	assert values[:] == [0.0, 2.0, 0.0, 0.0]
+
+	with pytest.raises(ValueError):
+		remote_values.pull(8, 16)
+
+	remote_values.free()
+	remote_values.free()
+	with pytest.raises(ValueError):
+		remote_values.push()
+
+	session.terminate()
+
+
+def test_remote_buffer_type():
+
+	session = ctypes.session()
+
+	with pytest.raises(TypeError):
+		session.pin([1.0, 2.0])
+
+	session.terminate()
+
+
+def test_remote_buffer_workers():
+
+	session = ctypes.session({'workers': 2})
+
+	with pytest.raises(ValueError):
+		session.remote_buffer(16)
+
+	session.terminate()
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_shm.py: Tests memsync through shared memory arena
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import os
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+	from zugbruecke.core.shm import get_shm_path
+elif platform.startswith('win'):
+	import ctypes
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES AND ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def get_square_int_array(session):
+
+	square_int_array = session.load_library('tests/demo_dll.dll', 'windll').square_int_array
+	square_int_array.argtypes = (
+		ctypes.POINTER(ctypes.c_int16),
+		ctypes.c_void_p,
+		ctypes.c_int16
+		)
+	square_int_array.memsync = [
+		{
+			'p': [0],
+			'l': [2],
+			't': 'c_int16'
+			},
+		{
+			'p': [1, -1],
+			'l': [2],
+			't': 'c_int16'
+			}
+		]
+
+	def call(in_array):
+
+		in_array_p = ctypes.cast(
+			ctypes.pointer((ctypes.c_int16 * len(in_array))(*in_array)),
+			ctypes.POINTER(ctypes.c_int16)
+			)
+		out_array_p = ctypes.pointer(ctypes.c_void_p())
+
+		square_int_array(in_array_p, out_array_p, ctypes.c_int16(len(in_array)))
+
+		return ctypes.cast(
+			out_array_p.contents,
+			ctypes.POINTER(ctypes.c_int16 * len(in_array))
+			).contents[:]
+
+	return call
+
+
+def get_bubblesort(session):
+
+	bubblesort = session.load_library('tests/demo_dll.dll', 'windll').bubblesort
+	bubblesort.argtypes = (ctypes.POINTER(ctypes.c_float), ctypes.c_int)
+	bubblesort.memsync = [
+		{
+			'p': [0],
+			'l': [1],
+			't': 'c_float'
+			}
+		]
+
+	def call(values):
+
+		ctypes_float_values = ((ctypes.c_float)*len(values))(*values)
+		ctypes_float_pointer_firstelement = ctypes.cast(
+			ctypes.pointer(ctypes_float_values), ctypes.POINTER(ctypes.c_float)
+			)
+		bubblesort(ctypes_float_pointer_firstelement, len(values))
+		values[:] = ctypes_float_values[:]
+
+	return call
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+@pytest.mark.skipif(platform.startswith('win'), reason = 'shared memory arena is specific to zugbruecke')
+@pytest.mark.parametrize('shm_size', [0, 64, 1024 * 1024])
+def test_shm(shm_size):
+
+	session = ctypes.session({'shm_size': shm_size, 'shm_threshold': 0})
+
+	bubblesort = get_bubblesort(session)
+	square_int_array = get_square_int_array(session)
+
+	for _ in range(3):
+
+		values = [5.74, 3.72, 6.28, 8.6, 9.34, 6.47, 2.05, 9.09, 4.39, 4.75] * 10
+		bubblesort(values)
+		assert values == sorted(values)
+
+		assert [4, 16, 9, 25] == square_int_array([2, 4, 3, 5])
+
+	if shm_size > 0:
+		assert session.data.arena.__free__ == {0: shm_size}
+		# File is gone once both sides have mapped it
+		assert not os.path.exists(session.data.arena.path)
+
+	session.terminate()
+
+
+@pytest.mark.skipif(platform.startswith('win'), reason = 'shared memory arena is specific to zugbruecke')
+def test_shm_no_dev_shm(monkeypatch):
+
+	# No memory-backed file system, no arena
+	monkeypatch.setattr(os.path, 'isdir', lambda path: False)
+	assert get_shm_path('test') is None
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_signature_cache.py: Test routine definitions persisting across sessions
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import json
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+	from zugbruecke.core.signature_cache import get_definition_hash
+elif platform.startswith('win'):
+	import ctypes
+
+# Signature cache is specific to zugbruecke
+pytestmark = pytest.mark.skipif(platform.startswith('win'), reason = 'zugbruecke only')
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES AND ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+class signature_point(ctypes.Structure):
+
+	_fields_ = [
+		('x', ctypes.c_double),
+		('y', ctypes.c_double)
+		]
+
+
+def configure(dll):
+
+	# int gcd(int, int)
+	dll.cookbook_gcd.argtypes = (ctypes.c_int, ctypes.c_int)
+	dll.cookbook_gcd.restype = ctypes.c_int
+
+	# void bubblesort(float *, int)
+	dll.bubblesort.memsync = [
+		{
+			'p': [0],
+			'l': [1],
+			't': 'c_float'
+			}
+		]
+	dll.bubblesort.argtypes = (ctypes.POINTER(ctypes.c_float), ctypes.c_int)
+
+	# double distance(Point *, Point *)
+	dll.cookbook_distance.argtypes = (ctypes.POINTER(signature_point), ctypes.POINTER(signature_point))
+	dll.cookbook_distance.restype = ctypes.c_double
+
+
+def call(dll):
+
+	values = (ctypes.c_float * 3)(3.0, 1.0, 2.0)
+	dll.bubblesort(ctypes.cast(ctypes.pointer(values), ctypes.POINTER(ctypes.c_float)), len(values))
+
+	return (
+		dll.cookbook_gcd(35, 42),
+		values[:],
+		dll.cookbook_distance(ctypes.pointer(signature_point(1.0, 2.0)), ctypes.pointer(signature_point(4.0, 6.0)))
+		)
+
+
+def run_session(path, on_configure = None):
+
+	session = ctypes.session({'signature_cache': path})
+	dll = session.load_library('tests/demo_dll.dll', 'windll')
+	configure(dll)
+
+	# Intercept configuration on the Wine side
+	if on_configure is not None:
+		dll.__call_cold_on_server__ = on_configure
+		for routine in dll.routines.values():
+			routine.__configure_on_server__ = on_configure
+
+	result = call(dll)
+	preloaded_count = sum(routine.preloaded is not None for routine in dll.routines.values())
+
+	session.terminate()
+
+	return result, preloaded_count
+
+
+def fail_on_configure(*args):
+
+	raise AssertionError('routine configured although it was preloaded')
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+EXPECTED_RESULT = (7, [1.0, 2.0, 3.0], pytest.approx(5.0))
+
+
+def test_signature_cache_warm(tmp_path):
+
+	path = str(tmp_path / 'signatures.json')
+
+	# Cold session writes file
+	assert run_session(path) == (EXPECTED_RESULT, 0)
+	with open(path, 'r') as f:
+		cache_d = json.load(f)
+	assert [dll_d['name'] for dll_d in cache_d['dlls']] == ['tests/demo_dll.dll']
+	assert sorted(routine_d['name'] for routine_d in cache_d['dlls'][0]['routines']) == [
+		'bubblesort', 'cookbook_distance', 'cookbook_gcd'
+		]
+
+	# Warm session neither registers nor configures routines
+	assert run_session(path, fail_on_configure) == (EXPECTED_RESULT, 3)
+
+
+def test_signature_cache_changed_definition(tmp_path):
+
+	path = str(tmp_path / 'signatures.json')
+	run_session(path)
+
+	# Changed definition in file, routine must be configured again
+	with open(path, 'r') as f:
+		cache_d = json.load(f)
+	for routine_d in cache_d['dlls'][0]['routines']:
+		if routine_d['name'] == 'cookbook_gcd':
+			routine_d['hash'] = 'outdated'
+	with open(path, 'w') as f:
+		json.dump(cache_d, f)
+
+	configured_list = []
+	def on_configure(*args):
+		configured_list.append(args)
+		raise AssertionError('configured')
+	with pytest.raises(AssertionError):
+		run_session(path, on_configure)
+	assert len(configured_list) == 1
+
+	# Entry has been replaced
+	assert run_session(path)[0] == EXPECTED_RESULT
+	assert run_session(path, fail_on_configure) == (EXPECTED_RESULT, 3)
+
+
+def test_signature_cache_changed_dll(tmp_path):
+
+	path = str(tmp_path / 'signatures.json')
+	run_session(path)
+
+	# DLL file has changed, entries are dropped
+	with open(path, 'r') as f:
+		cache_d = json.load(f)
+	cache_d['dlls'][0]['fingerprint'] = '0:0'
+	with open(path, 'w') as f:
+		json.dump(cache_d, f)
+
+	assert run_session(path) == (EXPECTED_RESULT, 0)
+	assert run_session(path, fail_on_configure) == (EXPECTED_RESULT, 3)
+
+
+def test_signature_cache_other_dll(tmp_path):
+
+	path = str(tmp_path / 'signatures.json')
+	run_session(path)
+
+	# Entry of a DLL, which is never loaded by the session
+	with open(path, 'r') as f:
+		cache_d = json.load(f)
+	other_d = dict(cache_d['dlls'][0], name = 'tests/other_dll.dll')
+	cache_d['dlls'].append(other_d)
+	with open(path, 'w') as f:
+		json.dump(cache_d, f)
+
+	session = ctypes.session({'signature_cache': path})
+	requested_list = []
+	get_preload = session.signature_cache.get_preload
+	def on_get_preload(dll_name, *args):
+		requested_list.append(dll_name)
+		return get_preload(dll_name, *args)
+	session.signature_cache.get_preload = on_get_preload
+
+	dll = session.load_library('tests/demo_dll.dll', 'windll')
+	configure(dll)
+	assert call(dll) == EXPECTED_RESULT
+
+	# Only DLLs loaded by the session are preloaded
+	assert requested_list == ['tests/demo_dll.dll']
+	assert list(session.signature_cache.preloaded_dict.keys()) == ['tests/demo_dll.dll']
+	session.terminate()
+
+	# Entry is kept for other sessions
+	with open(path, 'r') as f:
+		assert other_d in json.load(f)['dlls']
+
+
+def test_signature_cache_definition_hash():
+
+	argtypes_d = [{'g': 2, 'f': [], 't': 'c_int'}]
+
+	assert get_definition_hash(argtypes_d, {'g': 2}, [], ['in']) == get_definition_hash(argtypes_d, {'g': 2}, [], ['in'])
+	assert get_definition_hash(argtypes_d, {'g': 2}, [], ['in']) != get_definition_hash(argtypes_d, {'g': 2}, [], ['out'])
+
+	# Callbacks can not be cached
+	assert get_definition_hash([{'g': 8, 'f': []}], {'g': 2}, [], ['in']) is None
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_signature_manifest.py: Test binding many routines at once from a manifest
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import json
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+	from zugbruecke.core.signature_manifest import get_type_from_name
+elif platform.startswith('win'):
+	import ctypes
+
+# Signature manifests are specific to zugbruecke
+pytestmark = pytest.mark.skipif(platform.startswith('win'), reason = 'zugbruecke only')
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES AND ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+class manifest_point(ctypes.Structure):
+
+	_fields_ = [
+		('x', ctypes.c_double),
+		('y', ctypes.c_double)
+		]
+
+
+MANIFEST_FILE_DICT = {
+	'cookbook_gcd': {
+		'argtypes': ['c_int', 'c_int'],
+		'restype': 'c_int'
+		},
+	'bubblesort': {
+		'argtypes': ['POINTER(c_float)', 'c_int'],
+		'restype': None,
+		'memsync': [{'p': [0], 'l': [1], 't': 'c_float'}]
+		}
+	}
+
+MANIFEST_TOML = """
+[cookbook_gcd]
+argtypes = ["c_int", "c_int"]
+restype = "c_int"
+
+[bubblesort]
+argtypes = ["POINTER(c_float)", "c_int"]
+restype = "void"
+memsync = [{p = [0], l = [1], t = "c_float"}]
+"""
+
+
+def fail_on_rpc(*args):
+
+	raise AssertionError('routine configured although it was bound')
+
+
+def call(dll):
+
+	# Routines were configured while binding
+	dll.__call_cold_on_server__ = fail_on_rpc
+	for routine in dll.routines.values():
+		routine.__configure_on_server__ = fail_on_rpc
+
+	values = (ctypes.c_float * 3)(3.0, 1.0, 2.0)
+	dll.bubblesort(ctypes.cast(ctypes.pointer(values), ctypes.POINTER(ctypes.c_float)), len(values))
+
+	return dll.cookbook_gcd(35, 42), values[:]
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def test_signature_manifest_type_names():
+
+	assert get_type_from_name('c_int') is ctypes.c_int
+	assert get_type_from_name(' POINTER(c_float) ') is ctypes.POINTER(ctypes.c_float)
+	assert get_type_from_name('c_double * 3')._length_ == 3
+	assert get_type_from_name('c_double * 3')._type_ is ctypes.c_double
+	assert get_type_from_name('c_int * 2 * 3')._type_._length_ == 2
+	assert get_type_from_name('POINTER(c_ubyte * 4)')._type_._length_ == 4
+	assert get_type_from_name('void') is None
+
+	with pytest.raises(ValueError):
+		get_type_from_name('c_unknown')
+	with pytest.raises(ValueError):
+		get_type_from_name('c_int * n')
+
+
+def test_signature_manifest_dict():
+
+	session = ctypes.session()
+	dll = session.load_library('tests/demo_dll.dll', 'windll', signatures = {
+		'cookbook_gcd': {
+			'argtypes': (ctypes.c_int, ctypes.c_int),
+			'restype': ctypes.c_int
+			},
+		'cookbook_distance': {
+			'argtypes': (ctypes.POINTER(manifest_point), ctypes.POINTER(manifest_point)),
+			'restype': ctypes.c_double
+			}
+		})
+
+	assert dll.cookbook_distance.called
+	dll.__call_cold_on_server__ = fail_on_rpc
+
+	assert dll.cookbook_gcd(35, 42) == 7
+	assert dll.cookbook_distance(
+		ctypes.pointer(manifest_point(1.0, 2.0)), ctypes.pointer(manifest_point(4.0, 6.0))
+		) == pytest.approx(5.0)
+
+	session.terminate()
+
+
+@pytest.mark.parametrize('extension', ['json', 'toml'])
+def test_signature_manifest_file(tmp_path, extension):
+
+	path = str(tmp_path / ('signatures.' + extension))
+	with open(path, 'w') as f:
+		if extension == 'json':
+			json.dump(MANIFEST_FILE_DICT, f)
+		else:
+			f.write(MANIFEST_TOML)
+
+	session = ctypes.session()
+	dll = session.load_library('tests/demo_dll.dll', 'windll', signatures = path)
+
+	assert dll.bubblesort.restype is None
+	assert call(dll) == (7, [1.0, 2.0, 3.0])
+
+	session.terminate()
+
+
+def test_signature_manifest_cached(tmp_path):
+
+	path = str(tmp_path / 'cache.json')
+
+	# Bound routines end up in signature cache
+	session = ctypes.session({'signature_cache': path})
+	dll = session.load_library('tests/demo_dll.dll', 'windll', signatures = MANIFEST_FILE_DICT)
+	call(dll)
+	session.terminate()
+
+	# Routines are configured at session start, binding does not ask the Wine side again
+	session = ctypes.session({'signature_cache': path})
+	dll = session.load_library('tests/demo_dll.dll', 'windll')
+	dll.__configure_routines_on_server__ = fail_on_rpc
+	session.load_library('tests/demo_dll.dll', 'windll', signatures = MANIFEST_FILE_DICT)
+	assert call(dll) == (7, [1.0, 2.0, 3.0])
+	session.terminate()
+
+
+def test_signature_manifest_missing_routine():
+
+	session = ctypes.session()
+
+	with pytest.raises(AttributeError):
+		session.load_library('tests/demo_dll.dll', 'windll', signatures = {
+			'cookbook_gcd': {'argtypes': ['c_int', 'c_int']},
+			'missing_routine': {'argtypes': ['c_int']}
+			})
+
+	# Routines, which were found, are bound nevertheless
+	assert session.load_library('tests/demo_dll.dll', 'windll').cookbook_gcd(35, 42) == 7
+
+	session.terminate()
+
+
+def test_signature_manifest_unknown_key():
+
+	session = ctypes.session()
+
+	with pytest.raises(ValueError):
+		session.load_library('tests/demo_dll.dll', 'windll', signatures = {
+			'cookbook_gcd': {'argtype': ['c_int', 'c_int']}
+			})
+
+	session.terminate()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_startup.py: Tests background startup and startup timings of sessions
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+elif platform.startswith('win'):
+	import ctypes
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+pytestmark = pytest.mark.skipif(platform.startswith('win'), reason = 'sessions are specific to zugbruecke')
+
+
+@pytest.mark.parametrize('prewarm', [False, True])
+@pytest.mark.parametrize('transport', ['pipe', 'tcp'])
+def test_startup_timings(prewarm, transport):
+
+	session = ctypes.session({'prewarm': prewarm, 'transport': transport})
+	dll = session.load_library('tests/demo_dll.dll', 'windll')
+
+	gcd = dll.cookbook_gcd
+	gcd.argtypes = (ctypes.c_int, ctypes.c_int)
+	gcd.restype = ctypes.c_int
+	assert 7 == gcd(35, 42)
+
+	assert 2 == session.stage
+	assert {
+		'setup_wine_python',
+		'create_wine_prefix',
+		'start_interpreters',
+		'wait_for_server',
+		'start_rpc_client',
+		'start_shm_arena',
+		'stage_2'
+		} <= set(session.startup_timings.keys())
+	assert all(duration >= 0.0 for duration in session.startup_timings.values())
+	assert session.startup_timings['stage_2'] >= session.startup_timings['wait_for_server']
+
+	session.terminate()
+
+
+def test_startup_prewarm_terminate():
+
+	# Terminate while stage 2 is (likely) still starting in the background
+	session = ctypes.session({'prewarm': True})
+	session.terminate()
+
+	assert not session.up
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_struct_blob.py: Test structs sent as raw memory
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+elif platform.startswith('win'):
+	import ctypes
+
+# Packing of structs is specific to zugbruecke
+pytestmark = pytest.mark.skipif(platform.startswith('win'), reason = 'zugbruecke only')
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES AND ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+class blob_point(ctypes.Structure):
+
+	_fields_ = [
+		('x', ctypes.c_double),
+		('y', ctypes.c_double)
+		]
+
+
+class blob_line(ctypes.Structure):
+
+	_fields_ = [
+		('a', blob_point),
+		('b', blob_point),
+		('tag', ctypes.c_ubyte * 4)
+		]
+
+
+class blob_pointer(ctypes.Structure):
+
+	_fields_ = [
+		('p', ctypes.POINTER(ctypes.c_float)),
+		('n', ctypes.c_int)
+		]
+
+
+class blob_long(ctypes.Structure):
+
+	_fields_ = [
+		('n', ctypes.c_long)
+		]
+
+
+class blob_packed(ctypes.Structure):
+
+	_pack_ = 1
+	_fields_ = [
+		('a', ctypes.c_ubyte),
+		('b', ctypes.c_double)
+		]
+
+
+class blob_bitfield(ctypes.Structure):
+
+	_fields_ = [
+		('a', ctypes.c_int, 4),
+		('b', ctypes.c_int, 4)
+		]
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def test_struct_blob_distance():
+
+	distance = ctypes.windll.LoadLibrary('tests/demo_dll.dll').cookbook_distance
+	distance.argtypes = (ctypes.POINTER(blob_point), ctypes.POINTER(blob_point))
+	distance.restype = ctypes.c_double
+
+	p1, p2 = blob_point(1.0, 2.0), blob_point(4.0, 6.0)
+	assert distance(ctypes.pointer(p1), ctypes.pointer(p2)) == pytest.approx(5.0)
+
+	# Raw memory instead of lists of fields
+	arg_message_list = distance.__arg_list_pack__((ctypes.pointer(p1), ctypes.pointer(p2)))
+	assert [message for _, message in arg_message_list] == [bytes(p1), bytes(p2)]
+
+
+@pytest.mark.parametrize('struct_type, is_blob', [
+	(blob_point, True),
+	(blob_line, True),
+	(blob_pointer, False),
+	(blob_long, False),
+	(blob_packed, False),
+	(blob_bitfield, False)
+	])
+def test_struct_blob_definition(struct_type, is_blob):
+
+	assert ctypes.current_session.data.pack_definition_argtypes((struct_type,))[0]['b'] == is_blob
+
+
+def test_struct_blob_roundtrip():
+
+	data = ctypes.current_session.data
+	argtypes_d = data.pack_definition_argtypes((ctypes.POINTER(blob_line),))
+	line = blob_line(blob_point(1.0, 2.0), blob_point(3.0, 4.0), (ctypes.c_ubyte * 4)(1, 2, 3, 4))
+
+	# Pack, unpack and sync back into a new struct
+	args_package_list = data.compile_arg_list_pack(argtypes_d)((ctypes.pointer(line),))
+	line_copy = blob_line()
+	data.compile_arg_list_sync(argtypes_d)(
+		(ctypes.pointer(line_copy),), data.compile_arg_list_unpack(argtypes_d)(args_package_list)
+		)
+	assert (line_copy.a.x, line_copy.b.y, line_copy.tag[:]) == (1.0, 4.0, [1, 2, 3, 4])
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_threads.py: Tests routine calls from several threads at once
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from multiprocessing import Pipe
+from threading import Barrier, Thread
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+	from zugbruecke.core.rpc import mp_client_class
+elif platform.startswith('win'):
+	import ctypes
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES AND ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def run_threads(target, thread_count):
+
+	error_list = []
+	barrier = Barrier(thread_count)
+
+	def run(index):
+		try:
+			barrier.wait()
+			target(index)
+		except Exception as e:
+			error_list.append(e)
+
+	thread_list = [Thread(target = run, args = (index,)) for index in range(thread_count)]
+	for thread in thread_list:
+		thread.start()
+	for thread in thread_list:
+		thread.join()
+
+	if len(error_list) > 0:
+		raise error_list[0]
+
+
+def get_gcd(dll):
+
+	# int gcd(int, int)
+	gcd = dll.cookbook_gcd
+	gcd.argtypes = (ctypes.c_int, ctypes.c_int)
+	gcd.restype = ctypes.c_int
+
+	return gcd
+
+
+def get_divide(dll):
+
+	# int divide(int, int, int *)
+	divide = dll.cookbook_divide
+	divide.argtypes = (ctypes.c_int, ctypes.c_int, ctypes.POINTER(ctypes.c_int))
+	divide.restype = ctypes.c_int
+
+	return divide
+
+
+def get_bubblesort(dll):
+
+	# void bubblesort(float *, int)
+	bubblesort = dll.bubblesort
+	bubblesort.memsync = [
+		{
+			'p': [0],
+			'l': [1],
+			't': 'c_float'
+			}
+		]
+	bubblesort.argtypes = (ctypes.POINTER(ctypes.c_float), ctypes.c_int)
+
+	return bubblesort
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+pytestmark = pytest.mark.skipif(platform.startswith('win'), reason = 'sessions are specific to zugbruecke')
+
+
+@pytest.mark.parametrize('rpc_workers', [1, 4])
+def test_threads_calls(rpc_workers):
+
+	session = ctypes.session({'rpc_workers': rpc_workers})
+	dll = session.load_library('tests/demo_dll.dll', 'windll')
+	gcd, divide, bubblesort = get_gcd(dll), get_divide(dll), get_bubblesort(dll)
+
+	def target(index):
+		for x in range(1, 51):
+			assert gcd(x * (index + 1), 42) == gcd(x * (index + 1), 42)
+			rem = ctypes.c_int()
+			assert (x + index) // 3 == divide(x + index, 3, rem)
+			assert (x + index) % 3 == rem.value
+			values = [float((x * 7 + y * 3 + index) % 11) for y in range(10)]
+			array = (ctypes.c_float * len(values))(*values)
+			bubblesort(ctypes.cast(ctypes.pointer(array), ctypes.POINTER(ctypes.c_float)), len(array))
+			assert sorted(values) == array[:]
+
+	run_threads(target, 8)
+
+	session.terminate()
+
+
+def test_threads_first_access():
+
+	session = ctypes.session()
+	dll_list = []
+
+	def load(index):
+		dll_list.append(session.load_library('tests/demo_dll.dll', 'windll'))
+
+	# Several threads start stage 2 and attach to the DLL at the same time
+	run_threads(load, 8)
+	assert all(dll is dll_list[0] for dll in dll_list)
+
+	gcd_list = []
+
+	def attach(index):
+		gcd_list.append(dll_list[0].cookbook_gcd)
+
+	# Several threads attach to the same routine at the same time
+	run_threads(attach, 8)
+	assert all(gcd is gcd_list[0] for gcd in gcd_list)
+	get_gcd(dll_list[0])
+
+	def call(index):
+		assert 7 == gcd_list[0](35, 42)
+
+	# Several threads configure the routine on first call
+	run_threads(call, 8)
+
+	session.terminate()
+
+
+def test_threads_connection_lost():
+
+	server, connection = Pipe()
+	client = mp_client_class(None, None, connection = connection)
+	routine = client.get_function('routine')
+
+	# Reader thread is running, synchronous calls of all threads go through it
+	client.get_function_async('routine')()
+
+	error_list = []
+
+	def call():
+		try:
+			routine()
+		except (EOFError, OSError) as e: # OSError if request is sent after server is gone
+			error_list.append(e)
+
+	thread_list = [Thread(target = call, daemon = True) for _ in range(8)]
+	for thread in thread_list:
+		thread.start()
+
+	# Server goes away while threads are waiting (or about to send)
+	server.recv_bytes()
+	server.close()
+
+	for thread in thread_list:
+		thread.join(timeout = 10)
+	assert not any(thread.is_alive() for thread in thread_list)
+	assert len(error_list) == len(thread_list)
+
+	# Later calls fail right away
+	with pytest.raises(EOFError):
+		routine()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_transport.py: Tests transports of the ctypes bridge
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import os
+import pickle
+from threading import Thread
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+	from zugbruecke.core.rpc import (
+		mp_client_pipe_connect,
+		mp_pipe_connection_class,
+		RPC_REQUEST_ID
+		)
+elif platform.startswith('win'):
+	import ctypes
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+@pytest.mark.skipif(platform.startswith('win'), reason = 'transports are specific to zugbruecke')
+@pytest.mark.parametrize('transport', ['tcp', 'pipe'])
+def test_transport(transport):
+
+	session = ctypes.session({'transport': transport})
+
+	gcd = session.load_library('tests/demo_dll.dll', 'windll').cookbook_gcd
+	gcd.argtypes = (ctypes.c_int, ctypes.c_int)
+	gcd.restype = ctypes.c_int
+
+	assert 7 == gcd(35, 42)
+	assert 1 == gcd(17, 4)
+
+	session.terminate()
+
+
+@pytest.mark.skipif(platform.startswith('win'), reason = 'transports are specific to zugbruecke')
+def test_transport_pipe_not_ready():
+
+	client_read, server_write = os.pipe()
+	server_read, client_write = os.pipe()
+	server = mp_pipe_connection_class(server_read, server_write)
+
+	# Server announces itself, but reports a bad status
+	def serve():
+		server.announce()
+		request_id = RPC_REQUEST_ID.unpack_from(server.recv_bytes())[0]
+		server.send_bytes(RPC_REQUEST_ID.pack(request_id) + pickle.dumps(False))
+	t = Thread(target = serve)
+	t.start()
+
+	with pytest.raises(ConnectionError):
+		mp_client_pipe_connect(client_read, client_write, timeout_after_seconds = 10)
+
+	t.join()
+	server.close()
+
+
+@pytest.mark.skipif(platform.startswith('win'), reason = 'transports are specific to zugbruecke')
+def test_transport_unknown():
+
+	session = ctypes.session({'transport': 'carrier_pigeon'})
+
+	with pytest.raises(ValueError):
+		session.load_library('tests/demo_dll.dll', 'windll')
+
+	session.terminate()
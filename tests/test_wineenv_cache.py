@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_wineenv_cache.py: Tests offline cache of Wine Python environment
+
+	Required to run on platform / side: [UNIX]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import pytest
+
+import hashlib
+from io import BytesIO
+import os
+import zipfile
+
+from sys import platform
+if platform.startswith('win'):
+	pytestmark = pytest.mark.skipif(True, reason = 'wineenv is not used on Windows')
+else:
+	from zugbruecke.core.wineenv import setup_wine_python
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# HELPER(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def make_embed_zip(cache_dir, version = '3.6.5', arch = 'win32'):
+
+	# Python library, zipped inside embedded distribution
+	library_zip = BytesIO()
+	with zipfile.ZipFile(library_zip, 'w') as f:
+		f.writestr('os.py', '# os\n')
+		f.writestr('json/__init__.py', '# json\n')
+
+	# Fake embedded distribution
+	archive_path = os.path.join(cache_dir, 'python-%s-embed-%s.zip' % (version, arch))
+	with zipfile.ZipFile(archive_path, 'w') as f:
+		f.writestr('python.exe', b'MZ')
+		f.writestr('python36._pth', 'python36.zip\n.\n')
+		f.writestr('python36.zip', library_zip.getvalue())
+
+	with open(archive_path, 'rb') as f:
+		return archive_path, hashlib.sha256(f.read()).hexdigest()
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def test_wineenv_cache_offline(tmpdir):
+
+	cache_dir = str(tmpdir.mkdir('cache'))
+	archive_path, archive_sha256 = make_embed_zip(cache_dir)
+	with open(os.path.join(cache_dir, 'SHA256SUMS'), 'w') as f:
+		f.write('%s  %s\n' % (archive_sha256, os.path.basename(archive_path)))
+
+	for name in ('a', 'b'):
+		directory = str(tmpdir.join(name))
+		setup_wine_python('win32', '3.6.5', directory, cache_dir = cache_dir)
+		python_dir = os.path.join(directory, 'win32-python3.6.5')
+		assert os.path.isfile(os.path.join(python_dir, 'python.exe'))
+		assert os.path.isfile(os.path.join(python_dir, 'Lib', 'json', '__init__.py'))
+		assert not os.path.exists(os.path.join(python_dir, 'python36.zip'))
+		assert not os.path.exists(os.path.join(python_dir, 'python36._pth'))
+
+	# Both directories are populated from one unpacked copy, content-addressed by checksum
+	assert os.listdir(os.path.join(cache_dir, 'sha256')) == [archive_sha256]
+
+	# Files are not shared, modifying one install leaves cache and other installs alone
+	os_path_a = str(tmpdir.join('a', 'win32-python3.6.5', 'Lib', 'os.py'))
+	os_path_b = str(tmpdir.join('b', 'win32-python3.6.5', 'Lib', 'os.py'))
+	assert not os.path.samefile(os_path_a, os_path_b)
+	with open(os_path_a, 'w') as f:
+		f.write('# modified\n')
+	with open(os_path_b, 'r') as f:
+		assert f.read() == '# os\n'
+	with open(os.path.join(cache_dir, 'sha256', archive_sha256, 'Lib', 'os.py'), 'r') as f:
+		assert f.read() == '# os\n'
+
+
+def test_wineenv_cache_records_checksum(tmpdir):
+
+	cache_dir = str(tmpdir.mkdir('cache'))
+	archive_path, archive_sha256 = make_embed_zip(cache_dir)
+
+	setup_wine_python('win32', '3.6.5', str(tmpdir.join('a')), cache_dir = cache_dir, trust_on_first_use = True)
+
+	with open(os.path.join(cache_dir, 'SHA256SUMS'), 'r') as f:
+		assert f.read() == '%s  %s\n' % (archive_sha256, os.path.basename(archive_path))
+
+
+def test_wineenv_cache_unknown_checksum(tmpdir):
+
+	cache_dir = str(tmpdir.mkdir('cache'))
+	make_embed_zip(cache_dir)
+
+	# Unverified archive is used, but its checksum is not recorded
+	with pytest.warns(RuntimeWarning):
+		setup_wine_python('win32', '3.6.5', str(tmpdir.join('a')), cache_dir = cache_dir)
+
+	assert os.path.isfile(str(tmpdir.join('a', 'win32-python3.6.5', 'python.exe')))
+	assert not os.path.exists(os.path.join(cache_dir, 'SHA256SUMS'))
+
+
+def test_wineenv_cache_checksum_mismatch(tmpdir):
+
+	cache_dir = str(tmpdir.mkdir('cache'))
+	archive_path, _ = make_embed_zip(cache_dir)
+	with open(os.path.join(cache_dir, 'SHA256SUMS'), 'w') as f:
+		f.write('%s  %s\n' % ('0' * 64, os.path.basename(archive_path)))
+
+	with pytest.raises(ValueError):
+		setup_wine_python('win32', '3.6.5', str(tmpdir.join('a')), cache_dir = cache_dir)
+
+	assert not os.path.exists(str(tmpdir.join('a', 'win32-python3.6.5')))
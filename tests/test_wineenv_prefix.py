@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_wineenv_prefix.py: Tests cloning of Wine prefixes from a template
+
+	Required to run on platform / side: [UNIX]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import pytest
+
+import os
+from threading import Thread
+
+from sys import platform
+if platform.startswith('win'):
+	pytestmark = pytest.mark.skipif(True, reason = 'wineenv is not used on Windows')
+else:
+	from zugbruecke.core.wineenv import create_wine_prefix
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# HELPER(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def make_template(cache_dir, arch = 'win32'):
+
+	# Looks like a prefix initialized by wineboot
+	dir_template = os.path.join(cache_dir, 'prefix', arch + '-wine')
+	os.makedirs(os.path.join(dir_template, 'drive_c', 'windows', 'system32'))
+	os.makedirs(os.path.join(dir_template, 'dosdevices'))
+	os.symlink('../drive_c', os.path.join(dir_template, 'dosdevices', 'c:'))
+	os.symlink('/', os.path.join(dir_template, 'dosdevices', 'z:'))
+	with open(os.path.join(dir_template, 'drive_c', 'windows', 'system32', 'kernel32.dll'), 'wb') as f:
+		f.write(b'MZ')
+	with open(os.path.join(dir_template, 'system.reg'), 'w') as f:
+		f.write('WINE REGISTRY Version 2\n')
+
+	return dir_template
+
+
+def check_prefix(dir_wineprefix):
+
+	assert os.readlink(os.path.join(dir_wineprefix, 'dosdevices', 'c:')) == '../drive_c'
+	assert os.readlink(os.path.join(dir_wineprefix, 'dosdevices', 'z:')) == '/'
+	with open(os.path.join(dir_wineprefix, 'dosdevices', 'c:', 'windows', 'system32', 'kernel32.dll'), 'rb') as f:
+		assert f.read() == b'MZ'
+	with open(os.path.join(dir_wineprefix, 'system.reg'), 'r') as f:
+		assert f.read() == 'WINE REGISTRY Version 2\n'
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+@pytest.mark.parametrize('clone', ['auto', 'copy'])
+def test_wineenv_prefix_clone(tmpdir, clone):
+
+	cache_dir = str(tmpdir.mkdir('cache'))
+	dir_template = make_template(cache_dir)
+	dir_wineprefix = str(tmpdir.join('win32-wine'))
+
+	create_wine_prefix(dir_wineprefix, 'win32', cache_dir = cache_dir, clone = clone)
+	check_prefix(dir_wineprefix)
+
+	# No file is shared with the template, Wine modifies them in place
+	dll_path = os.path.join('drive_c', 'windows', 'system32', 'kernel32.dll')
+	assert not os.path.samefile(
+		os.path.join(dir_template, dll_path), os.path.join(dir_wineprefix, dll_path)
+		)
+	assert not os.path.samefile(
+		os.path.join(dir_template, 'system.reg'), os.path.join(dir_wineprefix, 'system.reg')
+		)
+
+
+def test_wineenv_prefix_concurrent(tmpdir):
+
+	cache_dir = str(tmpdir.mkdir('cache'))
+	make_template(cache_dir)
+	dir_wineprefix = str(tmpdir.join('win32-wine'))
+
+	error_list = []
+	def create():
+		try:
+			create_wine_prefix(dir_wineprefix, 'win32', cache_dir = cache_dir)
+		except Exception as e:
+			error_list.append(e)
+
+	thread_list = [Thread(target = create) for _ in range(4)]
+	for thread in thread_list:
+		thread.start()
+	for thread in thread_list:
+		thread.join()
+
+	assert error_list == []
+	check_prefix(dir_wineprefix)
+	assert not any(name.endswith(('.tmp', '.lock')) for name in os.listdir(str(tmpdir)))
+
+
+@pytest.mark.parametrize('clone', ['overlay', 'hardlink'])
+def test_wineenv_prefix_invalid(tmpdir, clone):
+
+	cache_dir = str(tmpdir.mkdir('cache'))
+	make_template(cache_dir)
+
+	with pytest.raises(ValueError):
+		create_wine_prefix(str(tmpdir.join('win32-wine')), 'win32', cache_dir = cache_dir, clone = clone)
+	assert not os.path.exists(str(tmpdir.join('win32-wine')))
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_wire.py: Test binary wire format for routine calls
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+	import zugbruecke.core.session_client
+	from zugbruecke.core.const import (
+		GROUP_FUNDAMENTAL,
+		GROUP_STRUCT,
+		GROUP_VOID
+		)
+	from zugbruecke.core.wire import (
+		decode_wire_id,
+		get_wire_codec,
+		is_wire_frame,
+		WIRE_VERSION
+		)
+elif platform.startswith('win'):
+	import ctypes
+
+# Wire format is specific to zugbruecke
+pytestmark = pytest.mark.skipif(platform.startswith('win'), reason = 'zugbruecke only')
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def fundamental(type_name):
+
+	return {'f': [], 'g': GROUP_FUNDAMENTAL, 's': False, 't': type_name}
+
+
+def memsync_pointer():
+
+	return {'f': ['p'], 'g': GROUP_VOID, 's': True, 't': 'c_void_p'}
+
+
+VOID = {'f': [], 'g': GROUP_VOID, 's': False, 't': None}
+
+MEMORY_LIST = [
+	{'d': b'\x01\x02\x03\x04', 'l': 4, 'a': 0x1000, '_a': None, 'w': None},
+	{'d': b'', 'l': 8, 'a': None, '_a': 0x2000, 'w': 2, 'o': 64},
+	{'d': b'\x05', 'l': 16, 'a': 0x3000, '_a': 0x4000, 'w': None, 'p': True},
+	{'d': b'', 'l': 32, 'a': None, '_a': 0x5000, 'w': None, 'r': True}
+	]
+
+
+def get_gcd(dll):
+
+	gcd = dll.cookbook_gcd
+	gcd.argtypes = (ctypes.c_int, ctypes.c_int)
+	gcd.restype = ctypes.c_int
+
+	return gcd
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+def test_wire_request_roundtrip():
+
+	codec = get_wire_codec([fundamental('c_int'), memsync_pointer(), fundamental('c_double')], fundamental('c_int'))
+
+	frame = codec.encode_request(7, (ctypes.c_int(-3), None, 2.5), MEMORY_LIST)
+
+	assert is_wire_frame(frame)
+	assert decode_wire_id(frame) == 7
+
+	args_message, mem_package_list = codec.decode_request(frame)
+	assert args_message == [(None, -3), (None, None), (None, 2.5)]
+	assert mem_package_list == MEMORY_LIST
+
+
+@pytest.mark.parametrize('return_type, return_msg', [
+	('c_int', -42),
+	('c_int', None),
+	('c_double', 0.5),
+	(None, None)
+	])
+def test_wire_response_roundtrip(return_type, return_msg):
+
+	codec = get_wire_codec([fundamental('c_int')], fundamental(return_type) if return_type is not None else VOID)
+
+	frame = codec.encode_response(3, return_msg, MEMORY_LIST[:1])
+
+	assert decode_wire_id(frame) == 3
+	assert codec.decode_response(frame) == (return_msg, [
+		{'d': b'\x01\x02\x03\x04', 'l': 4, 'a': 0x1000, '_a': None, 'w': None}
+		])
+
+
+def test_wire_unsupported_signature():
+
+	# Structures, arrays and platform-dependent types go through pickle
+	assert get_wire_codec([{'f': [], 'g': GROUP_STRUCT, 's': False, 't': 'point'}], VOID) is None
+	assert get_wire_codec([{'f': ['a'], 'g': GROUP_FUNDAMENTAL, 's': False, 't': 'c_int'}], VOID) is None
+	assert get_wire_codec([fundamental('c_int')], {'f': ['p'], 'g': GROUP_FUNDAMENTAL, 's': False, 't': 'c_int'}) is None
+	assert get_wire_codec([fundamental('c_unknown')], VOID) is None
+
+
+def test_wire_unsupported_values():
+
+	codec = get_wire_codec([fundamental('c_ubyte')], fundamental('c_ubyte'))
+
+	# Caller falls back to pickle
+	assert codec.encode_request(1, (1, 2), []) is None
+	assert codec.encode_request(1, (256,), []) is None
+	assert codec.encode_request(1, ('a',), []) is None
+	assert codec.encode_response(1, 256, []) is None
+
+
+@pytest.mark.parametrize('wire, wire_version, wire_binary', [
+	('binary', None, True),
+	('binary', -1, False),
+	('pickle', None, False)
+	])
+def test_wire_negotiation(monkeypatch, wire, wire_version, wire_binary):
+
+	# Unix side speaking another version than the Wine side
+	if wire_version is not None:
+		monkeypatch.setattr(zugbruecke.core.session_client, 'WIRE_VERSION', wire_version)
+
+	session = ctypes.session({'wire': wire})
+	dll = session.load_library('tests/demo_dll.dll', 'windll')
+	gcd = get_gcd(dll)
+
+	assert gcd(35, 42) == 7
+	assert session.wire_binary == wire_binary
+	assert (gcd.wire_codec is not None) == wire_binary
+
+	session.terminate()
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+	tests/test_workers.py: Tests sessions with several Wine-Python processes
+
+	Required to run on platform / side: [UNIX, WINE]
+
+	Copyright (C) 2017-2019 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from threading import Thread
+
+import pytest
+
+from sys import platform
+if any([platform.startswith(os_name) for os_name in ['linux', 'darwin', 'freebsd']]):
+	import zugbruecke as ctypes
+elif platform.startswith('win'):
+	import ctypes
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES AND ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+class sample_class:
+
+
+	def __init__(self, session):
+
+		self.__dll__ = session.load_library('tests/demo_dll.dll', 'windll')
+
+		# int gcd(int, int)
+		self.gcd = self.__dll__.cookbook_gcd
+		self.gcd.argtypes = (ctypes.c_int, ctypes.c_int)
+		self.gcd.restype = ctypes.c_int
+
+		# void bubblesort(float *, int)
+		self.bubblesort = self.__dll__.bubblesort
+		self.bubblesort.memsync = [
+			{
+				'p': [0],
+				'l': [1],
+				't': 'c_float'
+				}
+			]
+		self.bubblesort.argtypes = (ctypes.POINTER(ctypes.c_float), ctypes.c_int)
+
+
+	def sort(self, values):
+
+		array = (ctypes.c_float * len(values))(*values)
+		self.bubblesort(ctypes.cast(ctypes.pointer(array), ctypes.POINTER(ctypes.c_float)), len(array))
+		return array[:]
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+pytestmark = pytest.mark.skipif(platform.startswith('win'), reason = 'workers are specific to zugbruecke')
+
+
+@pytest.mark.parametrize('transport', ['pipe', 'tcp'])
+@pytest.mark.parametrize('workers_dispatch', ['least_loaded', 'round_robin'])
+def test_workers(transport, workers_dispatch):
+
+	session = ctypes.session({'workers': 3, 'workers_dispatch': workers_dispatch, 'transport': transport})
+	sample = sample_class(session)
+
+	assert 3 == len(session.interpreter_session_list)
+
+	# Synchronous calls
+	assert [sample.gcd(x, 42) for x in range(1, 101)] == [sample.gcd(42, x) for x in range(1, 101)]
+
+	# Asynchronous calls, spread across workers
+	future_list = [sample.gcd.call_async(x, 42) for x in range(1, 101)]
+	assert [sample.gcd(x, 42) for x in range(1, 101)] == [future.result() for future in future_list]
+
+	# Calls from several threads, with memsync
+	error_list = []
+	def target(index):
+		try:
+			for x in range(20):
+				values = [float((x * 7 + y * 3 + index) % 11) for y in range(10)]
+				assert sorted(values) == sample.sort(values)
+		except Exception as e:
+			error_list.append(e)
+	thread_list = [Thread(target = target, args = (index,)) for index in range(6)]
+	for thread in thread_list:
+		thread.start()
+	for thread in thread_list:
+		thread.join()
+	assert error_list == []
+
+	session.terminate()
+
+
+def test_workers_pinned():
+
+	session = ctypes.session({'workers': 2, 'workers_pinned': ['DEMO_DLL.DLL']})
+	sample = sample_class(session)
+
+	assert [sample.gcd(x, 42) for x in range(1, 51)] == [sample.gcd(42, x) for x in range(1, 51)]
+	assert [sample.gcd(x, 42) for x in range(1, 51)] == [
+		future.result() for future in [sample.gcd.call_async(x, 42) for x in range(1, 51)]
+		]
+
+	session.terminate()
+
+
+def test_workers_last_error():
+
+	session = ctypes.session({'workers': 2, 'workers_dispatch': 'round_robin'})
+	sample = sample_class(session)
+
+	# Last error is asked for on the worker, which served the last call of this thread
+	for x in range(1, 5):
+		assert 7 == sample.gcd(35, 42)
+		assert isinstance(session.ctypes_get_last_error(), int)
+
+	session.terminate()
+
+
+def test_workers_invalid():
+
+	with pytest.raises(ValueError):
+		ctypes.session({'workers': 0})